@@ -1,13 +1,12 @@
 import json
-import time
-import psutil
-import subprocess
 from sklearn.feature_extraction.text import CountVectorizer
 from sklearn.decomposition import LatentDirichletAllocation
+from monitoring import StageMetrics
+from topic_artifacts import save_lda
 
-# Start monitoring
-start_time = time.time()
-process = psutil.Process()
+# Start monitoring (per-stage wall time, CPU time, peak RSS, threads)
+metrics = StageMetrics()
+metrics.begin('load')
 
 # Load speeches
 with open("presidential_speeches_texts_cleaned.json", "r", encoding="utf-8") as f:
@@ -35,12 +34,16 @@ print(f"Nombre de paragraphes : {nb_paragraphs}")
 
 # LDA Analysis
 MY_RS = 42
+metrics.begin('vectorize')
 vectorizer = CountVectorizer(max_features=2000, min_df=2, max_df=0.8)
 doc_term_matrix = vectorizer.fit_transform(paragraphs)
 
+metrics.begin('fit')
 lda = LatentDirichletAllocation(n_components=15, random_state=MY_RS)
 lda.fit(doc_term_matrix)
 
+metrics.begin('report')
+
 # Get top words per topic
 vocab = vectorizer.get_feature_names_out()
 topics_data = []
@@ -63,28 +66,18 @@ topic_counts = {}
 for topic_idx in dominant_topics:
     topic_counts[topic_idx] = topic_counts.get(topic_idx, 0) + 1
 
-# End monitoring
-end_time = time.time()
-execution_time = end_time - start_time
-
-# Get CPU and memory usage
-cpu_percent = process.cpu_percent(interval=0.1)
-memory_info = process.memory_info()
-memory_percent = process.memory_percent()
+# Save the trained model (vocabulary, topic-word weights) for scoring new speeches
+artifact_dir = save_lda("lda_analysis_15topics", vectorizer, lda,
+                        params={'source': "presidential_speeches_texts_cleaned.json", 'nb_paragraphs': nb_paragraphs})
+print(f"✓ Modèle sauvegardé dans {artifact_dir}")
 
-# Try to get GPU usage
-gpu_usage = 0
-gpu_power = 0
-try:
-    result = subprocess.run(['nvidia-smi', '--query-gpu=utilization.gpu,power.draw', 
-                           '--format=csv,noheader,nounits'], 
-                          capture_output=True, text=True, timeout=2)
-    if result.returncode == 0:
-        gpu_data = result.stdout.strip().split(',')
-        gpu_usage = float(gpu_data[0].strip())
-        gpu_power = float(gpu_data[1].strip())
-except:
-    pass
+# End monitoring
+metrics.stop()
+totals = metrics.totals()
+execution_time = totals['wall_seconds']
+cpu_percent = totals['cpu_percent']
+gpu_usage = totals['avg_gpu_percent']
+gpu_power = totals['avg_power_watts']
 
 # Save results to TSV
 tsv_filename = "lda_analysis_15topics_results.tsv"
@@ -95,11 +88,7 @@ with open(tsv_filename, 'w', encoding='utf-8') as f:
     f.write(f"Nb_Presidents\t{nb_presidents}\n")
     f.write(f"Nb_Paragraphs\t{nb_paragraphs}\n")
     f.write(f"Nb_Topics\t15\n")
-    f.write(f"Execution_Time_Sec\t{execution_time:.2f}\n")
-    f.write(f"CPU_Usage_Percent\t{cpu_percent:.2f}\n")
-    f.write(f"Memory_Usage_Percent\t{memory_percent:.2f}\n")
-    f.write(f"GPU_Usage_Percent\t{gpu_usage:.2f}\n")
-    f.write(f"GPU_Power_Watts\t{gpu_power:.2f}\n")
+    metrics.write_tsv(f)
     f.write("\n")
     
     # Topics
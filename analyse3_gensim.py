@@ -1,55 +1,36 @@
-import json
-import time
-import psutil
-import subprocess
-from gensim import corpora
+import numpy as np
 from gensim.models import LdaMulticore
-from sklearn.feature_extraction.text import CountVectorizer
+from gensim_pipeline import build_corpus, gensim_cache_path, infer_doc_topics, is_cached, load_corpus
+from monitoring import StageMetrics
 
-# Start monitoring
-start_time = time.time()
-process = psutil.Process()
+# Start monitoring (per-stage wall time, CPU time, peak RSS, threads)
+metrics = StageMetrics()
+metrics.begin('load')
 
 print("=== Gensim LDA Analysis (Multicore) ===\n")
 
-# Load speeches
-with open("presidential_speeches_texts_cleaned.json", "r", encoding="utf-8") as f:
-    speeches = json.load(f)
+SOURCE = "presidential_speeches_texts_cleaned.json"
 
-# Extract unique presidents
-presidents = set()
-for speech in speeches:
-    if "president" in speech:
-        presidents.add(speech["president"])
-    elif "url" in speech:
-        url_parts = speech["url"].split("/")
-        if len(url_parts) > 4:
-            presidents.add(url_parts[4])
+# Dictionary filtré + corpus Matrix Market en cache : tokenisation seulement au premier run
+cache_dir = gensim_cache_path(SOURCE)
+if not is_cached(cache_dir):
+    metrics.begin('vectorize')
+    print("Tokenizing text and serializing corpus...")
+    build_corpus(SOURCE, cache_dir)
+else:
+    print(f"Corpus en cache : {cache_dir}")
 
-nb_speeches = len(speeches)
-nb_presidents = len(presidents) if presidents else "Unknown"
-paragraphs = [p for article in speeches for p in article["paragraphs"]]
-nb_paragraphs = len(paragraphs)
+# Corpus lu en streaming depuis le disque (mémoire indépendante de sa taille)
+corpus, dictionary, meta = load_corpus(cache_dir)
+nb_speeches = meta['nb_speeches']
+nb_presidents = meta['nb_presidents']
+nb_paragraphs = meta['nb_paragraphs']
 
 print(f"Nombre de discours : {nb_speeches}")
 print(f"Nombre de présidents : {nb_presidents}")
 print(f"Nombre de paragraphes : {nb_paragraphs}\n")
 
-# Prepare data for Gensim
-print("Tokenizing text...")
-# Simple tokenization (split by whitespace)
-texts = [p.split() for p in paragraphs]
-
-# Create dictionary and corpus
-print("Creating dictionary and corpus...")
-dictionary = corpora.Dictionary(texts)
-
-# Filter extremes (similar to min_df and max_df in sklearn)
-dictionary.filter_extremes(no_below=2, no_above=0.8, keep_n=2000)
-
-# Create bag-of-words corpus
-corpus = [dictionary.doc2bow(text) for text in texts]
-
+metrics.begin('fit')
 # LDA Analysis with multicore
 print("Running Gensim LDA (multicore)...")
 import multiprocessing
@@ -62,10 +43,10 @@ lda = LdaMulticore(
     num_topics=5,
     random_state=42,
     passes=10,
-    workers=n_cores,
-    per_word_topics=True
+    workers=n_cores
 )
 
+metrics.begin('report')
 # Get top words per topic
 topics_data = []
 print("\n=== LDA Topics ===")
@@ -79,43 +60,21 @@ for idx in range(5):
     })
     print(f"Thème {idx+1} : {topic_str}")
 
-# Get topic distributions
+# Get topic distributions (E-step par chunks en parallèle -> matrice dense)
 print("\nCalculating topic distributions...")
-dominant_topics = []
-for doc in corpus:
-    topic_dist = lda.get_document_topics(doc)
-    if topic_dist:
-        dominant_topic = max(topic_dist, key=lambda x: x[1])[0]
-    else:
-        dominant_topic = 0
-    dominant_topics.append(dominant_topic)
+doc_topics = infer_doc_topics(lda, corpus, chunksize=2000, workers=n_cores)
+dominant_topics = doc_topics.argmax(axis=1)
 
 # Count paragraphs per topic
-topic_counts = {}
-for topic_idx in dominant_topics:
-    topic_counts[topic_idx] = topic_counts.get(topic_idx, 0) + 1
+topic_counts = np.bincount(dominant_topics, minlength=5)
 
 # End monitoring
-end_time = time.time()
-execution_time = end_time - start_time
-
-# Get CPU and memory usage
-cpu_percent = process.cpu_percent(interval=0.1)
-memory_percent = process.memory_percent()
-
-# Get GPU usage
-gpu_usage = 0
-gpu_power = 0
-try:
-    result = subprocess.run(['nvidia-smi', '--query-gpu=utilization.gpu,power.draw', 
-                           '--format=csv,noheader,nounits'], 
-                          capture_output=True, text=True, timeout=2)
-    if result.returncode == 0:
-        gpu_data = result.stdout.strip().split(',')
-        gpu_usage = float(gpu_data[0].strip())
-        gpu_power = float(gpu_data[1].strip())
-except:
-    pass
+metrics.stop()
+totals = metrics.totals()
+execution_time = totals['wall_seconds']
+cpu_percent = totals['cpu_percent']
+gpu_usage = totals['avg_gpu_percent']
+gpu_power = totals['avg_power_watts']
 
 # Save results to TSV
 tsv_filename = "lda_gensim_results.tsv"
@@ -127,16 +86,12 @@ with open(tsv_filename, 'w', encoding='utf-8') as f:
     f.write(f"Nb_Paragraphs\t{nb_paragraphs}\n")
     f.write(f"Nb_Topics\t5\n")
     f.write(f"Nb_CPU_Cores\t{n_cores}\n")
-    f.write(f"Execution_Time_Sec\t{execution_time:.2f}\n")
-    f.write(f"CPU_Usage_Percent\t{cpu_percent:.2f}\n")
-    f.write(f"Memory_Usage_Percent\t{memory_percent:.2f}\n")
-    f.write(f"GPU_Usage_Percent\t{gpu_usage:.2f}\n")
-    f.write(f"GPU_Power_Watts\t{gpu_power:.2f}\n")
+    metrics.write_tsv(f)
     f.write("\n")
     
     f.write("Topic_ID\tNb_Paragraphs\tTop_Words\n")
     for topic_id, topic_info in enumerate(topics_data, 1):
-        count = topic_counts.get(topic_id - 1, 0)
+        count = topic_counts[topic_id - 1]
         f.write(f"{topic_id}\t{count}\t{topic_info['top_words']}\n")
 
 print(f"\n✓ Résultats sauvegardés dans {tsv_filename}")
@@ -1,11 +1,11 @@
 import json
-import time
-import psutil
-import subprocess
 import torch
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
-from googletrans import Translator
+from cluster_summary import ClusterSummary
+from monitoring import StageMetrics
+from topic_artifacts import save_lsa
+from translation_cache import annotate_tsv, make_translator
 
 print("=== LSA + K-means Analysis (GPU) ===\n")
 print(f"GPU Available: {torch.cuda.is_available()}")
@@ -13,9 +13,9 @@ if torch.cuda.is_available():
     print(f"GPU Device: {torch.cuda.get_device_name(0)}")
     print(f"GPU Memory: {torch.cuda.get_device_properties(0).total_memory / 1024**3:.1f} GB\n")
 
-# Start monitoring
-start_time = time.time()
-process = psutil.Process()
+# Start monitoring (per-stage wall time, CPU time, peak RSS, threads)
+metrics = StageMetrics()
+metrics.begin('load')
 
 # Load speeches
 with open("presidential_speeches_texts_cleaned_complete.json", "r", encoding="utf-8") as f:
@@ -38,11 +38,13 @@ print(f"Nombre de discours : {nb_speeches}")
 print(f"Nombre de présidents : {nb_presidents}")
 print(f"Nombre de paragraphes : {nb_paragraphs}\n")
 
+metrics.begin('vectorize')
 # Vectorize with TF-IDF (CPU)
 print("Vectorizing text with TF-IDF...")
 vectorizer = TfidfVectorizer(max_features=2000, min_df=2, max_df=0.8)
 tfidf_matrix = vectorizer.fit_transform(paragraphs)
 
+metrics.begin('fit')
 # Convert to dense tensor and move to GPU
 print("Moving data to GPU...")
 tfidf_dense = torch.tensor(tfidf_matrix.toarray(), dtype=torch.float32).cuda()
@@ -97,51 +99,40 @@ for iteration in range(max_iter):
 
 clusters = clusters.cpu().numpy()
 
-# Get top words per cluster
+metrics.begin('report')
+# Cluster sizes, mean TF-IDF, c-TF-IDF and representative paragraphs (a few sparse products)
 vocab = vectorizer.get_feature_names_out()
+summary = ClusterSummary(tfidf_matrix, clusters, 15, vocab,
+                         embedding=lsa_matrix.cpu().numpy(), centroids=centroids.cpu().numpy())
 topics_data = []
 
 print("\n=== LSA Topics (via K-means clustering on GPU) ===")
-for cluster_id in range(15):
-    cluster_docs = [i for i, c in enumerate(clusters) if c == cluster_id]
-    
-    if len(cluster_docs) == 0:
-        continue
-    
-    # Get average TF-IDF for this cluster
-    cluster_tfidf = tfidf_matrix[cluster_docs].mean(axis=0).A1
-    top_indices = cluster_tfidf.argsort()[-10:][::-1]
-    top_words = [vocab[i] for i in top_indices]
-    topic_str = ' | '.join(top_words)
-    
+for cluster in summary.clusters():
+    topic_str = ' | '.join(cluster['top_words'])
     topics_data.append({
-        'topic_id': cluster_id + 1,
+        'topic_id': cluster['topic_id'],
         'top_words': topic_str,
-        'nb_paragraphs': len(cluster_docs)
+        'nb_paragraphs': cluster['nb_paragraphs']
     })
-    print(f"Thème {cluster_id+1} ({len(cluster_docs)} paragraphes) : {topic_str}")
+    print(f"Thème {cluster['topic_id']} ({cluster['nb_paragraphs']} paragraphes) : {topic_str}")
+    print(f"  c-TF-IDF : {' | '.join(cluster['ctfidf_words'])}")
+
+# Save the trained model (TF-IDF vocabulary, SVD basis, k-means centroids) for scoring new speeches
+# U S = X Vt^T : new TF-IDF rows are projected onto the rows of Vt
+artifact_dir = save_lsa("lsa_gpu_15topics", vectorizer, Vt[:n_components].cpu().numpy(),
+                        S[:n_components].cpu().numpy(), centroids.cpu().numpy(),
+                        [{'topic_id': t['topic_id'], 'top_words': t['top_words'].split(' | ')} for t in topics_data],
+                        params={'source': "presidential_speeches_texts_cleaned_complete.json", 'nb_paragraphs': nb_paragraphs},
+                        cluster_sizes=summary.sizes)
+print(f"✓ Modèle sauvegardé dans {artifact_dir}")
 
 # End monitoring
-end_time = time.time()
-execution_time = end_time - start_time
-
-# Get CPU and memory usage
-cpu_percent = process.cpu_percent(interval=0.1)
-memory_percent = process.memory_percent()
-
-# Get GPU usage
-gpu_usage = 0
-gpu_power = 0
-try:
-    result = subprocess.run(['nvidia-smi', '--query-gpu=utilization.gpu,power.draw', 
-                           '--format=csv,noheader,nounits'], 
-                          capture_output=True, text=True, timeout=2)
-    if result.returncode == 0:
-        gpu_data = result.stdout.strip().split(',')
-        gpu_usage = float(gpu_data[0].strip())
-        gpu_power = float(gpu_data[1].strip())
-except:
-    pass
+metrics.stop()
+totals = metrics.totals()
+execution_time = totals['wall_seconds']
+cpu_percent = totals['cpu_percent']
+gpu_usage = totals['avg_gpu_percent']
+gpu_power = totals['avg_power_watts']
 
 # Save results to TSV
 tsv_filename = "lsa_gpu_15topics_results.tsv"
@@ -152,11 +143,7 @@ with open(tsv_filename, 'w', encoding='utf-8') as f:
     f.write(f"Nb_Presidents\t{nb_presidents}\n")
     f.write(f"Nb_Paragraphs\t{nb_paragraphs}\n")
     f.write(f"Nb_Topics\t15\n")
-    f.write(f"Execution_Time_Sec\t{execution_time:.2f}\n")
-    f.write(f"CPU_Usage_Percent\t{cpu_percent:.2f}\n")
-    f.write(f"Memory_Usage_Percent\t{memory_percent:.2f}\n")
-    f.write(f"GPU_Usage_Percent\t{gpu_usage:.2f}\n")
-    f.write(f"GPU_Power_Watts\t{gpu_power:.2f}\n")
+    metrics.write_tsv(f)
     f.write("\n")
     
     f.write("Topic_ID\tNb_Paragraphs\tTop_Words\n")
@@ -165,45 +152,18 @@ with open(tsv_filename, 'w', encoding='utf-8') as f:
 
 print(f"\n✓ Résultats sauvegardés dans {tsv_filename}")
 
-# Add translations
-print("\nAjout des traductions françaises...")
-translator = Translator()
-
-def translate_korean_words(text):
-    words = text.split(' | ')
-    translated = []
-    for word in words:
-        try:
-            translation = translator.translate(word, src='ko', dest='fr')
-            translated.append(f"{word} ({translation.text})")
-        except:
-            translated.append(f"{word} (?)")
-    return ' | '.join(translated)
-
-with open(tsv_filename, 'r', encoding='utf-8') as f:
-    lines = f.readlines()
-
-output_lines = []
-in_topics = False
-for line in lines:
-    if line.strip().startswith('Topic_ID'):
-        in_topics = True
-        output_lines.append(line)
-    elif in_topics and '\t' in line:
-        parts = line.strip().split('\t')
-        if len(parts) == 3:
-            topic_id, nb_para, top_words = parts
-            print(f"  Translating Topic {topic_id}...")
-            translated = translate_korean_words(top_words)
-            output_lines.append(f"{topic_id}\t{nb_para}\t{translated}\n")
-        else:
-            output_lines.append(line)
-    else:
-        output_lines.append(line)
+# Cluster details: c-TF-IDF keywords and most representative paragraphs
+clusters_filename = "lsa_gpu_15topics_clusters.json"
+with open(clusters_filename, 'w', encoding='utf-8') as f:
+    json.dump(summary.clusters(paragraphs), f, ensure_ascii=False, indent=2)
+print(f"✓ Détail des clusters sauvegardé dans {clusters_filename}")
 
+# Add translations (glossaire local d'abord, un seul appel groupé pour les mots manquants)
+print("\nAjout des traductions françaises...")
 tsv_translated = "lsa_gpu_15topics_results_translated.tsv"
-with open(tsv_translated, 'w', encoding='utf-8') as f:
-    f.writelines(output_lines)
+unresolved = annotate_tsv(tsv_filename, tsv_translated, translator=make_translator())
+if unresolved:
+    print(f"  {unresolved} mots sans traduction (mode hors ligne ou erreur réseau)")
 
 print(f"✓ Traductions sauvegardées dans {tsv_translated}")
 print(f"✓ Temps d'exécution : {execution_time:.2f}s")
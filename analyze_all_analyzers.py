@@ -1,35 +1,25 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 """
-Analyse NLP Complète - Comparaison des 3 Analyseurs
+Analyse NLP Complète - Comparaison des Analyseurs
 Tous les discours de Lee Seung Man (1021 discours)
-Hannanum, Kkma, Komoran avec filtrage
+Hannanum, Kkma, Komoran, Mecab, Kiwi et spaCy avec filtrage
 """
 
+import argparse
 import json
 import time
-from collections import Counter
-from konlpy.tag import Hannanum, Kkma, Komoran
-
-# Liste de stop words coréens
-KOREAN_STOPWORDS = {
-    # Particules
-    '이', '가', '을', '를', '은', '는', '에', '에서', '의', '와', '과', '로', '으로',
-    '도', '만', '부터', '까지', '에게', '한테', '께', '보다', '처럼', '같이',
-    # Pronoms
-    '나', '너', '저', '우리', '그', '이', '저', '여기', '거기', '저기',
-    '이것', '그것', '저것', '누구', '무엇', '어디', '언제', '어떻게',
-    # Verbes auxiliaires
-    '하다', '되다', '있다', '없다', '이다', '아니다',
-    # Adverbes temporels
-    '지금', '오늘', '어제', '내일', '여기', '거기', '저기',
-    # Conjonctions
-    '그리고', '그러나', '하지만', '또', '또한', '및',
-    # Nombres
-    '일', '이', '삼', '사', '오', '육', '칠', '팔', '구', '십',
-    # Autres mots fonctionnels
-    '등', '것', '수', '때', '년', '월', '일', '중', '간', '말', '점', '바'
-}
+import numpy as np
+from korean_analyzers import ANALYZERS, load_analyzers
+from korean_stopwords import STOPWORDS_VERSION, get_filter
+from vocabulary import TokenStream, Vocabulary, most_common
+
+# Stop words communs (sans les métadonnées des recueils)
+stop_filter = get_filter()
+
+# Vocabulaire global : les noms sont stockés en ids int32
+vocab = Vocabulary()
+
 
 def analyze_with_analyzer(analyzer_name, analyzer, speeches):
     """Analyse tous les discours avec un analyseur donné"""
@@ -37,35 +27,35 @@ def analyze_with_analyzer(analyzer_name, analyzer, speeches):
     print(f"🔍 ANALYSE AVEC {analyzer_name.upper()}")
     print(f"{'='*80}")
     
+    # Combiner tous les paragraphes
+    texts = [" ".join(speech["paragraphs"]) for speech in speeches]
+    
     start_time = time.time()
-    all_nouns = []
+    stream = TokenStream()
     
-    for idx, speech in enumerate(speeches, 1):
+    # Extraire les noms (par lots pour les analyseurs qui le supportent)
+    for idx, nouns in enumerate(analyzer.iter_nouns(texts), 1):
         if idx % 100 == 0:
             elapsed = time.time() - start_time
             print(f"  Progression: {idx}/{len(speeches)} discours ({elapsed:.1f}s)")
         
-        # Combiner tous les paragraphes
-        text = " ".join(speech["paragraphs"])
-        
-        # Extraire les noms
-        nouns = analyzer.nouns(text)
-        
-        # Filtrer les stop words et mots courts
-        nouns_filtered = [word for word in nouns if word not in KOREAN_STOPWORDS and len(word) > 1]
-        
-        all_nouns.extend(nouns_filtered)
+        stream.append(vocab.encode(nouns))
+    
+    # Filtrer les stop words et mots courts (masque sur les ids)
+    stream = stream.filtered(stop_filter.mask(vocab.tokens))
     
     total_time = time.time() - start_time
     
     # Calculer les statistiques
-    word_freq = Counter(all_nouns)
-    top_50 = word_freq.most_common(50)
+    word_freq = stream.counts(len(vocab))
+    total_nouns = len(stream.ids)
+    unique_nouns = int(np.count_nonzero(word_freq))
+    top_50 = most_common(word_freq, vocab, 50, stream.ids)
     
     print(f"\n✅ Analyse terminée en {total_time:.2f} secondes")
     print(f"   Vitesse: {len(speeches)/total_time:.1f} discours/seconde")
-    print(f"   Total de noms extraits: {len(all_nouns):,}")
-    print(f"   Noms uniques: {len(word_freq):,}")
+    print(f"   Total de noms extraits: {total_nouns:,}")
+    print(f"   Noms uniques: {unique_nouns:,}")
     
     print(f"\n🏆 TOP 10 MOTS LES PLUS FRÉQUENTS:")
     for rank, (word, count) in enumerate(top_50[:10], 1):
@@ -75,20 +65,25 @@ def analyze_with_analyzer(analyzer_name, analyzer, speeches):
         "analyzer": analyzer_name,
         "execution_time_seconds": round(total_time, 2),
         "speeches_per_second": round(len(speeches)/total_time, 2),
-        "total_nouns_extracted": len(all_nouns),
-        "unique_nouns": len(word_freq),
-        "average_nouns_per_speech": round(len(all_nouns)/len(speeches), 1),
+        "total_nouns_extracted": total_nouns,
+        "unique_nouns": unique_nouns,
+        "average_nouns_per_speech": round(total_nouns/len(speeches), 1),
         "top_50_words": [
             {
                 "rank": rank,
                 "word": word,
                 "frequency": count,
-                "percentage": round(100 * count / len(all_nouns), 2)
+                "percentage": round(100 * count / total_nouns, 2)
             }
             for rank, (word, count) in enumerate(top_50, 1)
         ]
     }
 
+parser = argparse.ArgumentParser(description="Comparaison des analyseurs morphologiques coréens")
+parser.add_argument("--analyzers", nargs="+", default=list(ANALYZERS),
+                    choices=sorted(ANALYZERS), help="Analyseurs à comparer")
+args = parser.parse_args()
+
 # Charger les discours
 print("="*80)
 print("📖 ANALYSE NLP COMPARATIVE - LEE SEUNG MAN (이승만)")
@@ -100,27 +95,16 @@ with open("president_texts_Lee_Seung_Man.json", "r", encoding="utf-8") as f:
 total_speeches = len(speeches)
 print(f"   ✓ {total_speeches:,} discours chargés\n")
 
-# Initialiser les analyseurs
+# Initialiser les analyseurs (ceux dont la dépendance manque sont ignorés)
 print("🔧 Initialisation des analyseurs...")
-hannanum = Hannanum()
-kkma = Kkma()
-komoran = Komoran()
-print("   ✓ Tous les analyseurs prêts\n")
+analyzers = load_analyzers(args.analyzers, skip_unavailable=True)
+print(f"   ✓ Analyseurs prêts: {', '.join(analyzers)}\n")
 
 # Analyser avec chaque analyseur
 all_results = []
 
-# HANNANUM
-result_hannanum = analyze_with_analyzer("Hannanum", hannanum, speeches)
-all_results.append(result_hannanum)
-
-# KKMA
-result_kkma = analyze_with_analyzer("Kkma", kkma, speeches)
-all_results.append(result_kkma)
-
-# KOMORAN
-result_komoran = analyze_with_analyzer("Komoran", komoran, speeches)
-all_results.append(result_komoran)
+for analyzer_name, analyzer in analyzers.items():
+    all_results.append(analyze_with_analyzer(analyzer_name, analyzer, speeches))
 
 # RÉSUMÉ COMPARATIF
 print("\n" + "="*80)
@@ -150,7 +134,8 @@ output = {
         "president": "Lee Seung Man (이승만)",
         "total_speeches": total_speeches,
         "stopwords_filtering": True,
-        "stopwords_count": len(KOREAN_STOPWORDS),
+        "stopwords_count": len(stop_filter.stopwords),
+        "stopwords_version": STOPWORDS_VERSION,
         "analysis_date": "2025-12-09"
     },
     "results": all_results
@@ -165,7 +150,7 @@ print("💾 RÉSULTATS SAUVEGARDÉS")
 print("="*80)
 print(f"  Fichier: {output_file}")
 print("\nContenu:")
-print("  • Résultats des 3 analyseurs (Hannanum, Kkma, Komoran)")
+print(f"  • Résultats des {len(all_results)} analyseurs ({', '.join(r['analyzer'] for r in all_results)})")
 print("  • Temps d'exécution pour chaque analyseur")
 print("  • Top 50 mots pour chaque analyseur")
 print("  • Statistiques comparatives")
@@ -2,53 +2,93 @@
 # -*- coding: utf-8 -*-
 """
 Analyse NLP Complète - TOUS LES PRÉSIDENTS
-3 Analyseurs (Hannanum, Kkma, Komoran) avec monitoring CPU/GPU/Watts
+Analyseurs du registre korean_analyzers (Hannanum, Kkma, Komoran par défaut)
+avec monitoring CPU/GPU/Watts
 """
 
+import argparse
 import json
 import time
-import psutil
-import subprocess
-from collections import Counter
-from konlpy.tag import Hannanum, Kkma, Komoran
-
-# Stop words enrichis
-KOREAN_STOPWORDS = {
-    '이', '가', '을', '를', '은', '는', '에', '에서', '의', '와', '과', '로', '으로',
-    '도', '만', '부터', '까지', '에게', '한테', '께', '보다', '처럼', '같이',
-    '나', '너', '저', '우리', '그', '이', '저', '여기', '거기', '저기',
-    '이것', '그것', '저것', '누구', '무엇', '어디', '언제', '어떻게',
-    '하다', '되다', '있다', '없다', '이다', '아니다',
-    '지금', '오늘', '어제', '내일', '여기', '거기', '저기',
-    '그리고', '그러나', '하지만', '또', '또한', '및',
-    '일', '이', '삼', '사', '오', '육', '칠', '팔', '구', '십',
-    '등', '것', '수', '때', '년', '월', '일', '중', '간', '말', '점', '바',
-    # Métadonnées
-    '담화', '박사', '대통령이승만', '대통령이승만박사', '대통령이승만박사담화',
-    '공보처', '공보실', '편', '집', '훈화록', '이대통령', '중앙문화협회'
-}
-
-def get_gpu_stats():
-    """Récupère les stats GPU via nvidia-smi"""
-    try:
-        result = subprocess.run(
-            ['nvidia-smi', '--query-gpu=utilization.gpu,memory.used,power.draw', 
-             '--format=csv,noheader,nounits'],
-            capture_output=True, text=True, timeout=2
-        )
-        if result.returncode == 0:
-            gpu_util, mem_used, power = result.stdout.strip().split(',')
-            return {
-                'gpu_utilization': float(gpu_util),
-                'memory_used_mb': float(mem_used),
-                'power_watts': float(power)
-            }
-    except:
-        pass
-    return {'gpu_utilization': 0, 'memory_used_mb': 0, 'power_watts': 0}
+import numpy as np
+from korean_analyzers import ANALYZERS, DEFAULT_ANALYZERS, load_analyzers
+from heavy_hitters import SpaceSaving
+from noun_cache import (CHECKPOINT_DIR, NOUN_CACHE_DIR, NounCache, checkpoint_dir,
+                        chunk_path, clear_checkpoints, content_hash, noun_cache_path,
+                        speech_key, speech_text)
+from freq_tables import FREQ_DIR, speech_year, write_shards
+from korean_stopwords import STOPWORDS_VERSION, get_filter
+from monitoring import ResourceSampler
+from vocabulary import TokenStream, Vocabulary, most_common
+
+
+def analyze_in_chunks(analyzer, texts, keys, hashes, todo, documents, local_vocab, chunk_size,
+                      checkpoints=None, resume=False):
+    """Analyse les discours d'indices `todo` par chunks, avec un checkpoint par chunk
+
+    Remplit documents[i] avec les ids (int32, dans `local_vocab`) des noms
+    bruts du discours i. Chaque chunk
+    terminé est sauvegardé dans `checkpoints` ; avec `resume`, un chunk dont
+    le checkpoint contient exactement les mêmes discours (clés et hashes)
+    est relu au lieu d'être réanalysé. Renvoie (temps d'analyse relu,
+    nombre de discours relus).
+    """
+    if checkpoints and not resume:
+        clear_checkpoints(checkpoints)
+    chunk_size = chunk_size or max(len(todo), 1)
+    recovered_time = 0.0
+    recovered = 0
+    start_time = time.time()
+    done = 0
+    for index, start in enumerate(range(0, len(todo), chunk_size)):
+        chunk = todo[start:start + chunk_size]
+        path = chunk_path(checkpoints, index) if checkpoints else None
+        
+        if resume and path:
+            checkpoint = NounCache.load(path)
+            encoded = [checkpoint.encoded(keys[i], hashes[i], local_vocab) for i in chunk]
+            if len(checkpoint) == len(chunk) and all(ids is not None for ids in encoded):
+                for i, ids in zip(chunk, encoded):
+                    documents[i] = ids
+                recovered_time += checkpoint.analysis_seconds
+                recovered += len(chunk)
+                done += len(chunk)
+                print(f"  chunk {index} repris du checkpoint ({done}/{len(todo)} discours)")
+                continue
+        
+        chunk_start = time.time()
+        for i, nouns in zip(chunk, analyzer.iter_nouns([texts[i] for i in chunk])):
+            documents[i] = local_vocab.encode(nouns)
+            done += 1
+            if done % 100 == 0:
+                elapsed = time.time() - start_time
+                print(f"  {done}/{len(todo)} discours ({elapsed:.1f}s)")
+        if path:
+            NounCache.from_ids([keys[i] for i in chunk], [hashes[i] for i in chunk],
+                               [documents[i] for i in chunk], local_vocab.tokens,
+                               time.time() - chunk_start).save(path)
+    return recovered_time, recovered
+
+
+def analyze_president(president_name, file_id, analyzers, sampler, stop_filter, vocab,
+                      freq_dir=FREQ_DIR, topk_epsilon=None, cache_dir=NOUN_CACHE_DIR,
+                      incremental=False, chunk_size=200, checkpoint_root=CHECKPOINT_DIR,
+                      resume=False):
+    """Analyse un président avec chacun des analyseurs sélectionnés
 
-def analyze_president(president_name, file_path, analyzers):
-    """Analyse un président avec les 3 analyseurs"""
+    Le monitoring CPU/GPU est fait par `sampler` en arrière-plan : chaque
+    analyseur correspond à une phase nommée '<fichier>/<analyseur>'.
+    Les noms sont encodés en ids du vocabulaire global `vocab`, et les
+    comptes par année sont sauvegardés dans `freq_dir` (voir freq_tables.py).
+    Avec `topk_epsilon`, le top 50 est suivi en mémoire constante par
+    Space-Saving (erreur <= epsilon * N) et aucun flux d'ids n'est conservé.
+    Les noms bruts de chaque discours sont mis en cache dans `cache_dir` ;
+    avec `incremental`, seuls les discours nouveaux ou modifiés (url / hash
+    du contenu) sont analysés, les autres sont relus depuis le cache.
+    L'analyse se fait par chunks de `chunk_size` discours, chacun
+    sauvegardé dans `checkpoint_root` ; `resume` reprend après un crash
+    au dernier chunk terminé.
+    """
+    file_path = f"president_texts_{file_id}.json"
     print(f"\n{'='*80}")
     print(f"📖 PRÉSIDENT: {president_name}")
     print(f"{'='*80}")
@@ -61,67 +101,121 @@ def analyze_president(president_name, file_path, analyzers):
     print(f"   ✓ {total_speeches:,} discours chargés\n")
     
     # Préparer les textes
-    texts = [" ".join(speech["paragraphs"]) for speech in speeches]
+    texts = [speech_text(speech) for speech in speeches]
+    years = [speech_year(speech) for speech in speeches]
+    hashes = [content_hash(text) for text in texts]
+    keys = [speech_key(speech, digest) for speech, digest in zip(speeches, hashes)]
     
     results = []
     
     for analyzer_name, analyzer in analyzers.items():
         print(f"\n🔍 Analyse avec {analyzer_name}...")
-        
-        # Monitoring initial
-        cpu_samples = []
-        gpu_samples = []
-        process = psutil.Process()
+        phase = f"{file_path}/{analyzer_name}"
         
         start_time = time.time()
-        all_nouns = []
+        stream = TokenStream()
+        tracker = SpaceSaving(topk_epsilon) if topk_epsilon else None
         
-        for idx, text in enumerate(texts, 1):
-            if idx % 100 == 0:
-                # Échantillonner CPU/GPU
-                cpu_samples.append(process.cpu_percent(interval=0.1))
-                gpu_samples.append(get_gpu_stats())
-                
-                elapsed = time.time() - start_time
-                print(f"  {idx}/{total_speeches} discours ({elapsed:.1f}s)")
-            
-            nouns = analyzer.nouns(text)
-            nouns_filtered = [w for w in nouns if w not in KOREAN_STOPWORDS 
-                            and len(w) > 1 and not w.isdigit()]
-            all_nouns.extend(nouns_filtered)
+        # Discours déjà analysés (mode incrémental) : noms relus depuis le cache,
+        # gardés en ids int32 d'un vocabulaire local à (analyseur, président)
+        cache_path = noun_cache_path(analyzer_name, file_id, cache_dir) if cache_dir else None
+        cache = NounCache.load(cache_path) if incremental and cache_path and tracker is None \
+            else NounCache()
+        local_vocab = Vocabulary()
+        documents = [cache.encoded(key, digest, local_vocab) for key, digest in zip(keys, hashes)]
+        todo = [i for i, ids in enumerate(documents) if ids is None]
+        if incremental:
+            print(f"  {len(todo)} discours nouveaux ou modifiés, "
+                  f"{total_speeches - len(todo)} repris du cache")
+        
+        with sampler.phase(phase):
+            if tracker is not None:
+                for idx, nouns in enumerate(analyzer.iter_nouns(texts), 1):
+                    if idx % 100 == 0:
+                        elapsed = time.time() - start_time
+                        print(f"  {idx}/{total_speeches} discours ({elapsed:.1f}s)")
+                    # Sans cache de décisions : mémoire constante, comme Space-Saving
+                    tracker.update(stop_filter.filter(nouns, cache=False))
+                recovered_time, recovered = 0.0, 0
+            else:
+                checkpoints = checkpoint_dir(analyzer_name, file_id, checkpoint_root) \
+                    if checkpoint_root and chunk_size else None
+                recovered_time, recovered = analyze_in_chunks(analyzer, texts, keys, hashes, todo,
+                                                              documents, local_vocab, chunk_size,
+                                                              checkpoints, resume)
+                # Ids globaux attribués dans l'ordre des discours : identiques avec ou sans reprise
+                for ids in documents:
+                    stream.append(ids)
+                stream = TokenStream(vocab.translate(stream.ids, local_vocab.tokens), stream.offsets)
+                # Filtrage des stop words : masque vectorisé sur les ids
+                stream = stream.filtered(stop_filter.mask(vocab.tokens))
         
         total_time = time.time() - start_time
+        # Discours réellement analysés : ni relus du cache, ni repris d'un checkpoint
+        analyzed = len(todo) - recovered
+        cumulative_time = cache.analysis_seconds + recovered_time + total_time
+        if cache_path and tracker is None:
+            NounCache.from_ids(keys, hashes, documents, local_vocab.tokens,
+                               cumulative_time).save(cache_path)
+            if checkpoints:
+                clear_checkpoints(checkpoints)
         
         # Stats finales
-        word_freq = Counter(all_nouns)
-        top_50 = word_freq.most_common(50)
+        if tracker is not None:
+            top_50 = tracker.most_common(50)
+            total_nouns = tracker.total
+            unique_nouns = None  # inconnu en mémoire constante
+        else:
+            word_freq = stream.counts(len(vocab))
+            top_50 = most_common(word_freq, vocab, 50, stream.ids)
+            total_nouns = len(stream.ids)
+            unique_nouns = int(np.count_nonzero(word_freq))
+            if freq_dir:
+                write_shards(stream, vocab, years, analyzer_name, file_id, freq_dir)
         
-        # Moyennes CPU/GPU
-        avg_cpu = sum(cpu_samples) / len(cpu_samples) if cpu_samples else 0
-        avg_gpu_util = sum(s['gpu_utilization'] for s in gpu_samples) / len(gpu_samples) if gpu_samples else 0
-        avg_power = sum(s['power_watts'] for s in gpu_samples) / len(gpu_samples) if gpu_samples else 0
+        # Moyennes CPU/GPU de la phase (échantillonnées en arrière-plan)
+        stats = sampler.summary(phase)
+        avg_cpu = stats['avg_cpu_percent']
+        avg_gpu_util = stats['avg_gpu_percent']
+        avg_power = stats['avg_power_watts']
         
         print(f"   ✓ Terminé en {total_time:.2f}s")
         print(f"   CPU moyen: {avg_cpu:.1f}%")
         print(f"   GPU moyen: {avg_gpu_util:.1f}%")
         print(f"   Puissance: {avg_power:.1f}W")
+        print(f"   Mémoire max: {stats['peak_rss_mb']:.0f} Mo ({stats['n_samples']} échantillons)")
         
-        results.append({
+        result = {
             'analyzer': analyzer_name,
             'execution_time_seconds': round(total_time, 2),
-            'speeches_per_second': round(total_speeches/total_time, 2),
-            'total_nouns': len(all_nouns),
-            'unique_nouns': len(word_freq),
+            'speeches_per_second': round(analyzed / total_time, 2) if total_time > 0 else 0,
+            'analyzed_speeches': analyzed,
+            'cumulative_execution_time_seconds': round(cumulative_time, 2),
+            'total_nouns': total_nouns,
+            'unique_nouns': unique_nouns,
             'avg_cpu_percent': round(avg_cpu, 1),
             'avg_gpu_percent': round(avg_gpu_util, 1),
             'avg_power_watts': round(avg_power, 1),
+            'peak_rss_mb': round(stats['peak_rss_mb'], 1),
             'top_50_words': [{'rank': i+1, 'word': w, 'frequency': c} 
                            for i, (w, c) in enumerate(top_50)]
-        })
+        }
+        if tracker is not None:
+            guaranteed = {w for w, _ in tracker.guaranteed(50)}
+            result['streaming_topk'] = {
+                'epsilon': tracker.epsilon,
+                'counters': tracker.capacity,
+                'max_frequency_error': round(tracker.error_bound(), 1),
+                'guaranteed_top_words': sum(w in guaranteed for w, _ in top_50),
+            }
+            for item in result['top_50_words']:
+                item['max_overestimate'] = tracker.errors[item['word']]
+        results.append(result)
     
     return {
         'president': president_name,
         'total_speeches': total_speeches,
+        'stopwords_version': STOPWORDS_VERSION,
         'results': results
     }
 
@@ -141,63 +235,122 @@ PRESIDENTS = [
     ('Yun_Bo_Seon', 'Yun Bo Seon (윤보선)')
 ]
 
-print("="*80, flush=True)
-print("🇰🇷 ANALYSE NLP - TOUS LES PRÉSIDENTS CORÉENS", flush=True)
-print("="*80, flush=True)
-print(f"\nNombre de présidents: {len(PRESIDENTS)}", flush=True)
-print("Analyseurs: Hannanum, Kkma, Komoran", flush=True)
-print("Monitoring: CPU, GPU, Watts\n", flush=True)
-
-# Initialiser les analyseurs
-print("🔧 Initialisation des analyseurs...", flush=True)
-analyzers = {
-    'Hannanum': Hannanum(),
-    'Kkma': Kkma(),
-    'Komoran': Komoran()
-}
-print("   ✓ Tous prêts\n", flush=True)
-
-# Analyser chaque président
-all_results = []
-
-for file_id, president_name in PRESIDENTS:
-    file_path = f"president_texts_{file_id}.json"
-    
-    try:
-        result = analyze_president(president_name, file_path, analyzers)
-        all_results.append(result)
-        
-        # Sauvegarder individuellement
-        output_file = f"nlp_analysis_{file_id}.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
-        print(f"\n💾 Sauvegardé: {output_file}")
-        
-    except FileNotFoundError:
-        print(f"⚠️  Fichier non trouvé: {file_path}")
-    except Exception as e:
-        print(f"❌ Erreur: {e}")
-
-# Résumé global
-print("\n" + "="*80)
-print("📊 RÉSUMÉ GLOBAL")
-print("="*80)
-
-for result in all_results:
-    print(f"\n{result['president']} ({result['total_speeches']} discours):")
-    for r in result['results']:
-        print(f"  {r['analyzer']:10s}: {r['execution_time_seconds']:6.1f}s | "
-              f"CPU {r['avg_cpu_percent']:4.1f}% | "
-              f"GPU {r['avg_gpu_percent']:4.1f}% | "
-              f"{r['avg_power_watts']:5.1f}W")
-
-# Sauvegarder résumé global
-with open('all_presidents_summary.json', 'w', encoding='utf-8') as f:
-    json.dump(all_results, f, ensure_ascii=False, indent=2)
-
-print("\n" + "="*80)
-print("✅ ANALYSE COMPLÈTE TERMINÉE")
-print("="*80)
-print(f"\nFichiers créés:")
-print(f"  • nlp_analysis_[president].json (12 fichiers)")
-print(f"  • all_presidents_summary.json (résumé global)")
+
+def main():
+    """Point d'entrée : protégé par __main__ pour nlp.pipe(n_process=...) (processus spawn)"""
+    parser = argparse.ArgumentParser(description="Analyse NLP de tous les présidents")
+    parser.add_argument("--analyzers", nargs="+", default=DEFAULT_ANALYZERS,
+                        choices=sorted(ANALYZERS), help="Analyseurs morphologiques à utiliser")
+    parser.add_argument("--spacy", action="store_true",
+                        help="Mode spaCy : extraction par lots avec nlp.pipe à la place des analyseurs JVM")
+    parser.add_argument("--spacy-batch-size", type=int, default=64,
+                        help="Nombre de discours par lot pour nlp.pipe")
+    parser.add_argument("--spacy-n-process", type=int, default=1,
+                        help="Nombre de processus pour nlp.pipe (-1 = tous les cœurs)")
+    parser.add_argument("--freq-dir", default=FREQ_DIR,
+                        help="Répertoire des tables de fréquences par année ('' pour désactiver)")
+    parser.add_argument("--streaming-topk", action="store_true",
+                        help="Top 50 approximatif en mémoire constante (Space-Saving), sans tables de fréquences")
+    parser.add_argument("--topk-epsilon", type=float, default=1e-4,
+                        help="Erreur relative maximale du mode --streaming-topk (1/epsilon compteurs)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="N'analyser que les discours nouveaux ou modifiés depuis la dernière exécution")
+    parser.add_argument("--noun-cache", default=NOUN_CACHE_DIR,
+                        help="Répertoire du cache des noms par discours ('' pour désactiver)")
+    parser.add_argument("--chunk-size", type=int, default=200,
+                        help="Discours par chunk checkpointé (0 = pas de checkpoint)")
+    parser.add_argument("--checkpoint-dir", default=CHECKPOINT_DIR,
+                        help="Répertoire des checkpoints par (analyseur, président, chunk)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Reprendre une analyse interrompue (implique --incremental)")
+    parser.add_argument("--sample-interval", type=float, default=0.5,
+                        help="Intervalle d'échantillonnage CPU/GPU en secondes (thread d'arrière-plan)")
+    args = parser.parse_args()
+    if args.resume:
+        args.incremental = True
+    if args.incremental and args.streaming_topk:
+        parser.error("--incremental/--resume ne sont pas compatibles avec --streaming-topk")
+    if args.spacy:
+        args.analyzers = ['spaCy']
+
+    print("="*80, flush=True)
+    print("🇰🇷 ANALYSE NLP - TOUS LES PRÉSIDENTS CORÉENS", flush=True)
+    print("="*80, flush=True)
+    print(f"\nNombre de présidents: {len(PRESIDENTS)}", flush=True)
+    print(f"Analyseurs: {', '.join(args.analyzers)}", flush=True)
+    print("Monitoring: CPU, GPU, Watts\n", flush=True)
+
+    # Initialiser les analyseurs
+    print("🔧 Initialisation des analyseurs...", flush=True)
+    analyzers = load_analyzers(args.analyzers, options={
+        'spaCy': {'batch_size': args.spacy_batch_size, 'n_process': args.spacy_n_process}
+    })
+    print("   ✓ Tous prêts\n", flush=True)
+
+    # Monitoring CPU/GPU en arrière-plan (aucun travail dans les boucles mesurées)
+    sampler = ResourceSampler(interval=args.sample_interval)
+    sampler.start()
+
+    # Vocabulaire global (ids int32) partagé par tous les analyseurs et présidents
+    vocab = Vocabulary()
+
+    # Analyser chaque président
+    all_results = []
+
+    for file_id, president_name in PRESIDENTS:
+        file_path = f"president_texts_{file_id}.json"
+
+        try:
+            result = analyze_president(
+                president_name, file_id, analyzers, sampler, get_filter(file_id), vocab,
+                freq_dir=args.freq_dir,
+                topk_epsilon=args.topk_epsilon if args.streaming_topk else None,
+                cache_dir=args.noun_cache, incremental=args.incremental,
+                chunk_size=args.chunk_size, checkpoint_root=args.checkpoint_dir,
+                resume=args.resume)
+            all_results.append(result)
+
+            # Sauvegarder individuellement
+            output_file = f"nlp_analysis_{file_id}.json"
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
+            print(f"\n💾 Sauvegardé: {output_file}")
+
+        except FileNotFoundError:
+            print(f"⚠️  Fichier non trouvé: {file_path}")
+        except Exception as e:
+            print(f"❌ Erreur: {e}")
+
+    sampler.stop()
+    sampler.save('resource_samples.json')
+
+    # Résumé global
+    print("\n" + "="*80)
+    print("📊 RÉSUMÉ GLOBAL")
+    print("="*80)
+
+    for result in all_results:
+        print(f"\n{result['president']} ({result['total_speeches']} discours):")
+        for r in result['results']:
+            print(f"  {r['analyzer']:10s}: {r['execution_time_seconds']:6.1f}s | "
+                  f"CPU {r['avg_cpu_percent']:4.1f}% | "
+                  f"GPU {r['avg_gpu_percent']:4.1f}% | "
+                  f"{r['avg_power_watts']:5.1f}W")
+
+    # Sauvegarder résumé global
+    with open('all_presidents_summary.json', 'w', encoding='utf-8') as f:
+        json.dump(all_results, f, ensure_ascii=False, indent=2)
+
+    print("\n" + "="*80)
+    print("✅ ANALYSE COMPLÈTE TERMINÉE")
+    print("="*80)
+    print(f"\nFichiers créés:")
+    print(f"  • nlp_analysis_[president].json (12 fichiers)")
+    print(f"  • all_presidents_summary.json (résumé global)")
+    print(f"  • resource_samples.json (série temporelle CPU/RSS/GPU par phase)")
+    if args.freq_dir and not args.streaming_topk:
+        print(f"  • {args.freq_dir}/<analyseur>/<president>/<année>.npz (tables fusionnables, voir freq_tables.py)")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,37 +9,12 @@ import json
 import time
 from collections import Counter
 from konlpy.tag import Kkma
+from korean_stopwords import STOPWORDS_VERSION, get_filter
+
+# Stop words coréens ENRICHIS (avec les métadonnées des recueils de Lee Seung Man)
+stop_filter = get_filter('Lee_Seung_Man')
+KOREAN_STOPWORDS_ENRICHED = stop_filter.stopwords
 
-# Stop words coréens ENRICHIS (avec métadonnées)
-KOREAN_STOPWORDS_ENRICHED = {
-    # Particules
-    '이', '가', '을', '를', '은', '는', '에', '에서', '의', '와', '과', '로', '으로',
-    '도', '만', '부터', '까지', '에게', '한테', '께', '보다', '처럼', '같이',
-    # Pronoms
-    '나', '너', '저', '우리', '그', '이', '저', '여기', '거기', '저기',
-    '이것', '그것', '저것', '누구', '무엇', '어디', '언제', '어떻게',
-    # Verbes auxiliaires
-    '하다', '되다', '있다', '없다', '이다', '아니다',
-    # Adverbes temporels
-    '지금', '오늘', '어제', '내일', '여기', '거기', '저기',
-    # Conjonctions
-    '그리고', '그러나', '하지만', '또', '또한', '및',
-    # Nombres
-    '일', '이', '삼', '사', '오', '육', '칠', '팔', '구', '십',
-    # Autres mots fonctionnels
-    '등', '것', '수', '때', '년', '월', '일', '중', '간', '말', '점', '바',
-    
-    # ========== MÉTADONNÉES À FILTRER ==========
-    # Titres et sources
-    '담화', '박사', '이승만', '대통령이승만', '대통령이승만박사',
-    '대통령이승만박사담화', '대통령이승만박사담화집', '공보처', '공보실',
-    '편', '집', '훈화록', '이대통령', '이대통령훈화록',
-    # Années
-    '1948', '1949', '1950', '1951', '1952', '1953', '1954', '1955',
-    '1956', '1957', '1958', '1959', '1960',
-    # Autres métadonnées courantes
-    '중앙문화협회', '施政月報', '월보', '시정'
-}
 
 print("="*80)
 print("📖 ANALYSE KKMA - SANS MÉTADONNÉES")
@@ -82,13 +57,8 @@ for idx, speech in enumerate(speeches, 1):
     # Extraire les noms
     nouns = kkma.nouns(text)
     
-    # Filtrer les stop words ET métadonnées
-    nouns_filtered = [
-        word for word in nouns 
-        if word not in KOREAN_STOPWORDS_ENRICHED 
-        and len(word) > 1
-        and not word.isdigit()  # Exclure les nombres purs
-    ]
+    # Filtrer les stop words ET métadonnées (et les nombres purs)
+    nouns_filtered = stop_filter.filter(nouns)
     
     all_nouns.extend(nouns_filtered)
 
@@ -131,7 +101,8 @@ results = {
         "total_nouns_extracted": len(all_nouns),
         "unique_nouns": len(word_freq),
         "average_nouns_per_speech": round(len(all_nouns)/total_speeches, 1),
-        "stopwords_count": len(KOREAN_STOPWORDS_ENRICHED)
+        "stopwords_count": len(KOREAN_STOPWORDS_ENRICHED),
+        "stopwords_version": STOPWORDS_VERSION
     },
     "top_50_words": [
         {
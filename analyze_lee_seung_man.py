@@ -9,26 +9,12 @@ import json
 import time
 from collections import Counter
 from konlpy.tag import Komoran
+from korean_stopwords import STOPWORDS_VERSION, get_filter
+
+# Stop words coréens communs (lexique partagé korean_stopwords)
+stop_filter = get_filter()
+KOREAN_STOPWORDS = stop_filter.stopwords
 
-# Liste de stop words coréens
-KOREAN_STOPWORDS = {
-    # Particules
-    '이', '가', '을', '를', '은', '는', '에', '에서', '의', '와', '과', '로', '으로',
-    '도', '만', '부터', '까지', '에게', '한테', '께', '보다', '처럼', '같이',
-    # Pronoms
-    '나', '너', '저', '우리', '그', '이', '저', '여기', '거기', '저기',
-    '이것', '그것', '저것', '누구', '무엇', '어디', '언제', '어떻게',
-    # Verbes auxiliaires
-    '하다', '되다', '있다', '없다', '이다', '아니다',
-    # Adverbes temporels
-    '지금', '오늘', '어제', '내일', '여기', '거기', '저기',
-    # Conjonctions
-    '그리고', '그러나', '하지만', '또', '또한', '및',
-    # Nombres
-    '일', '이', '삼', '사', '오', '육', '칠', '팔', '구', '십',
-    # Autres mots fonctionnels
-    '등', '것', '수', '때', '년', '월', '일', '중', '간', '말', '점', '바'
-}
 
 print("="*80)
 print("📖 ANALYSE NLP - LEE SEUNG MAN (이승만)")
@@ -73,7 +59,7 @@ for idx, speech in enumerate(speeches, 1):
     nouns = komoran.nouns(text)
     
     # Filtrer les stop words et mots courts
-    nouns_filtered = [word for word in nouns if word not in KOREAN_STOPWORDS and len(word) > 1]
+    nouns_filtered = stop_filter.filter(nouns)
     
     # Stocker les détails du discours
     speech_details.append({
@@ -123,7 +109,8 @@ results = {
         "total_nouns_extracted": len(all_nouns),
         "unique_nouns": len(word_freq),
         "average_nouns_per_speech": round(len(all_nouns)/total_speeches, 1),
-        "stopwords_count": len(KOREAN_STOPWORDS)
+        "stopwords_count": len(KOREAN_STOPWORDS),
+        "stopwords_version": STOPWORDS_VERSION
     },
     "top_50_words": [
         {
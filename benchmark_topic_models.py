@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark unifié des modèles de topics
+LDA sklearn, LDA PyTorch, LDA Gensim, LSA + K-means (sklearn et PyTorch)
+sur la même matrice document-terme en cache, avec balayage de la taille du
+corpus et du nombre de topics, répétitions, et une table de comparaison unique
+"""
+
+import argparse
+import multiprocessing
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cluster_summary import indicator_matrix
+from coherence import top_word_ids, topic_coherence
+from corpus_cache import DEFAULT_SOURCE, dtm_cache_dir, load_dtm
+from hashing_vectorize import hashed_dtm_cache_dir
+from monitoring import StageMetrics
+
+# Paramètres des modèles : analyse_lda_15topics.py (max_iter=20, analyse1.py garde le
+# défaut sklearn de 10), analyse2_pytorch.py, analyse3_gensim.py et analyse_lsa_cpu.py
+SKLEARN_LDA_MAX_ITER = 20
+TORCH_LDA_N_ITER = 100
+GENSIM_PASSES = 10
+KMEANS_PARAMS = {'n_init': 10, 'max_iter': 300}
+
+# Chaque backend calcule sa propre perplexité (sur le corpus d'entraînement) :
+# les valeurs ne sont comparables qu'entre lignes d'un même type
+PERPLEXITY_KINDS = {
+    'sklearn_lda': 'sklearn_variational_bound',  # exp(-borne variationnelle / nb de mots)
+    'pytorch_lda': 'pytorch_point_estimate',     # exp(-log-vraisemblance de theta.phi / nb de mots)
+    'gensim_lda': 'gensim_bound_base2',          # 2 ** -(borne par mot de log_perplexity)
+}
+
+
+def fit_sklearn_lda(X, n_topics, seed):
+    from sklearn.decomposition import LatentDirichletAllocation
+    lda = LatentDirichletAllocation(n_components=n_topics, random_state=seed,
+                                    max_iter=SKLEARN_LDA_MAX_ITER, n_jobs=-1)
+    lda.fit(X)
+    return lda.components_, lambda: lda.perplexity(X)
+
+
+def fit_pytorch_lda(X, n_topics, seed):
+    from torch_lda import PyTorchLDA
+    lda = PyTorchLDA(n_topics=n_topics, n_iter=TORCH_LDA_N_ITER, random_state=seed)
+    lda.fit(X)
+    return lda.components_, lambda: lda.perplexity(X)
+
+
+def fit_gensim_lda(X, n_topics, seed):
+    from gensim.matutils import Sparse2Corpus
+    from gensim.models import LdaMulticore
+    corpus = Sparse2Corpus(X, documents_columns=False)
+    id2word = {i: str(i) for i in range(X.shape[1])}
+    lda = LdaMulticore(corpus=corpus, id2word=id2word, num_topics=n_topics,
+                       random_state=seed, passes=GENSIM_PASSES,
+                       workers=multiprocessing.cpu_count())
+    # log_perplexity renvoie la borne par mot (base 2)
+    return lda.get_topics(), lambda: float(2 ** -lda.log_perplexity(corpus))
+
+
+def _cluster_topics(tfidf, clusters, n_clusters):
+    """Moyenne TF-IDF de chaque cluster, comme dans analyse_lsa_*.py"""
+    sizes = np.bincount(clusters, minlength=n_clusters)
+    sums = indicator_matrix(clusters, n_clusters) @ tfidf
+    return np.asarray(sums.todense()) / np.maximum(sizes, 1)[:, np.newaxis]
+
+
+def fit_lsa_kmeans(X, n_topics, seed):
+    from sklearn.cluster import KMeans
+    from sklearn.decomposition import TruncatedSVD
+    from sklearn.feature_extraction.text import TfidfTransformer
+    from sklearn.preprocessing import Normalizer
+    tfidf = TfidfTransformer().fit_transform(X)
+    lsa = TruncatedSVD(n_components=n_topics, random_state=seed).fit_transform(tfidf)
+    lsa = Normalizer(copy=False).fit_transform(lsa)
+    clusters = KMeans(n_clusters=n_topics, random_state=seed, **KMEANS_PARAMS).fit_predict(lsa)
+    return _cluster_topics(tfidf, clusters, n_topics), lambda: float('nan')
+
+
+def fit_lsa_torch(X, n_topics, seed):
+    import torch
+    from sklearn.feature_extraction.text import TfidfTransformer
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    tfidf = TfidfTransformer().fit_transform(X)
+    dense = torch.tensor(tfidf.toarray(), dtype=torch.float32, device=device)
+    U, S, _ = torch.linalg.svd(dense, full_matrices=False)
+    lsa = U[:, :n_topics] @ torch.diag(S[:n_topics])
+    lsa = lsa / (torch.norm(lsa, dim=1, keepdim=True) + 1e-10)
+    torch.manual_seed(seed)
+    centroids = lsa[torch.randperm(lsa.shape[0], device=device)[:n_topics]].clone()
+    for _ in range(KMEANS_PARAMS['max_iter']):
+        clusters = torch.cdist(lsa, centroids).argmin(dim=1)
+        new_centroids = centroids.clone()
+        for k in range(n_topics):
+            mask = clusters == k
+            if mask.any():
+                new_centroids[k] = lsa[mask].mean(dim=0)
+        if torch.allclose(centroids, new_centroids, atol=1e-4):
+            break
+        centroids = new_centroids
+    clusters = clusters.cpu().numpy()
+    return _cluster_topics(tfidf, clusters, n_topics), lambda: float('nan')
+
+
+BACKENDS = {
+    'sklearn_lda': fit_sklearn_lda,
+    'pytorch_lda': fit_pytorch_lda,
+    'gensim_lda': fit_gensim_lda,
+    'lsa_kmeans': fit_lsa_kmeans,
+    'lsa_torch': fit_lsa_torch,
+}
+
+
+def run_once(task):
+    """Un entraînement mesuré, exécuté dans un processus neuf (pic mémoire propre)"""
+    cache, backend, n_docs, n_topics, seed = task
+    X, _ = load_dtm(cache)
+    X = X[:n_docs]
+    metrics = StageMetrics()
+    try:
+        metrics.begin('fit')
+        topic_word, perplexity = BACKENDS[backend](X, n_topics, seed)
+        metrics.begin('score')
+        perplexity = perplexity()
+        coherence = topic_coherence(X, top_word_ids(topic_word))
+    except Exception as e:
+        # Backend absent (ImportError), mémoire insuffisante, échec numérique... : run suivant
+        metrics.stop()
+        return {'backend': backend, 'n_docs': n_docs, 'n_topics': n_topics, 'seed': seed,
+                'error': f"{type(e).__name__}: {e}"}
+    metrics.stop()
+    fit = metrics.stages['fit']
+    return {
+        'backend': backend,
+        'n_docs': X.shape[0],
+        'n_topics': n_topics,
+        'seed': seed,
+        'fit_seconds': fit['wall_seconds'],
+        'cpu_seconds': fit['cpu_seconds'],
+        'peak_rss_mb': metrics.totals()['peak_rss_mb'],
+        'perplexity': perplexity,
+        'coherence_umass': float(np.mean(coherence['umass'])),
+        'coherence_npmi': float(np.mean(coherence['npmi'])),
+        'docs_per_second': X.shape[0] / fit['wall_seconds'] if fit['wall_seconds'] > 0 else 0,
+    }
+
+
+def summarize(runs):
+    """Agrège les répétitions par (backend, taille, n_topics)"""
+    groups = {}
+    for run in runs:
+        groups.setdefault((run['backend'], run['n_docs'], run['n_topics']), []).append(run)
+    rows = []
+    for (backend, n_docs, n_topics), group in groups.items():
+        times = [r['fit_seconds'] for r in group]
+        rows.append({
+            'backend': backend,
+            'n_docs': n_docs,
+            'n_topics': n_topics,
+            'repeats': len(group),
+            'fit_seconds': statistics.mean(times),
+            'fit_seconds_std': statistics.stdev(times) if len(times) > 1 else 0.0,
+            'cpu_seconds': statistics.mean(r['cpu_seconds'] for r in group),
+            'peak_rss_mb': max(r['peak_rss_mb'] for r in group),
+            'perplexity': statistics.mean(r['perplexity'] for r in group),
+            'coherence_umass': statistics.mean(r['coherence_umass'] for r in group),
+            'coherence_npmi': statistics.mean(r['coherence_npmi'] for r in group),
+            'docs_per_second': statistics.mean(r['docs_per_second'] for r in group),
+        })
+    return rows
+
+
+def write_table(rows, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("Backend\tNb_Paragraphs\tNb_Topics\tRepeats\tFit_Time_Sec\tFit_Time_Std\t"
+                "CPU_Time_Sec\tPeak_RSS_MB\tPerplexity\tPerplexity_Kind\tCoherence_UMass\t"
+                "Coherence_NPMI\tParagraphs_Per_Sec\n")
+        for r in rows:
+            f.write(f"{r['backend']}\t{r['n_docs']}\t{r['n_topics']}\t{r['repeats']}\t"
+                    f"{r['fit_seconds']:.2f}\t{r['fit_seconds_std']:.2f}\t{r['cpu_seconds']:.2f}\t"
+                    f"{r['peak_rss_mb']:.1f}\t{r['perplexity']:.2f}\t"
+                    f"{PERPLEXITY_KINDS.get(r['backend'], '-')}\t{r['coherence_umass']:.4f}\t"
+                    f"{r['coherence_npmi']:.4f}\t{r['docs_per_second']:.1f}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark unifié des modèles de topics")
+    parser.add_argument("--source", nargs="+", default=[DEFAULT_SOURCE], help="Fichiers JSON de discours")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[0],
+                        help="Nombres de paragraphes à utiliser (0 = tout le corpus)")
+    parser.add_argument("--topics", nargs="+", type=int, default=[5, 10, 15])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", default="topic_model_benchmark.tsv")
+    parser.add_argument("--hashing", action="store_true",
+                        help="Vectorisation parallèle par hachage (voir hashing_vectorize.py)")
+    args = parser.parse_args()
+
+    cache = hashed_dtm_cache_dir(args.source) if args.hashing else dtm_cache_dir(args.source)
+    X, _ = load_dtm(cache, mmap_mode='r')
+    n_total = X.shape[0]
+    sizes = [n_total if size <= 0 else min(size, n_total) for size in args.sizes]
+    print(f"Matrice document-terme : {n_total} paragraphes x {X.shape[1]} mots ({cache})")
+
+    tasks = [(cache, backend, n_docs, n_topics, 42 + repeat)
+             for n_docs in sizes
+             for n_topics in args.topics
+             for backend in args.backends
+             for repeat in range(args.repeats)]
+
+    # Un processus neuf par run : pas d'interférence mémoire/threads entre runs
+    runs = []
+    context = multiprocessing.get_context('spawn')
+    try:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context, max_tasks_per_child=1) as pool:
+            futures = [pool.submit(run_once, task) for task in tasks]
+            for task, future in zip(tasks, futures):
+                try:
+                    run = future.result()
+                except Exception as e:
+                    # Processus worker tué (OOM killer...) : le pool est inutilisable
+                    print(f"❌ {task[1]} n={task[2]} k={task[3]} : {type(e).__name__}: {e}")
+                    break
+                if 'error' in run:
+                    print(f"⚠️  {run['backend']} n={run['n_docs']} k={run['n_topics']} "
+                          f"seed={run['seed']} en échec : {run['error']}")
+                    continue
+                print(f"  {run['backend']:12s} n={run['n_docs']:6d} k={run['n_topics']:2d} "
+                      f"seed={run['seed']} : {run['fit_seconds']:7.2f}s | "
+                      f"{run['peak_rss_mb']:7.1f} Mo | UMass {run['coherence_umass']:.3f} | "
+                      f"NPMI {run['coherence_npmi']:.3f}")
+                runs.append(run)
+    finally:
+        # Table écrite même si la boucle s'arrête en route (Ctrl-C, worker tué)
+        write_table(summarize(runs), args.output)
+        print(f"\n✓ Table de comparaison sauvegardée dans {args.output} ({len(runs)}/{len(tasks)} runs)")
+
+
+if __name__ == "__main__":
+    main()
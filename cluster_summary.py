@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Résumé des clusters (LSA + k-means) en quelques produits creux
+Matrice indicatrice cluster x paragraphe : tailles, centroïdes TF-IDF et
+comptes par cluster en un seul produit, mots-clés c-TF-IDF (TF-IDF par
+classe) et paragraphes les plus représentatifs de chaque cluster
+"""
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+def indicator_matrix(labels, n_clusters):
+    """Matrice creuse (n_clusters x n_docs) : 1 en (c, d) si le document d est dans c"""
+    labels = np.asarray(labels)
+    return csr_matrix((np.ones(len(labels)), (labels, np.arange(len(labels)))),
+                      shape=(n_clusters, len(labels)))
+
+
+def top_terms(weights, vocab, topn=10):
+    """Mots de plus fort poids de chaque ligne, ordre décroissant (tri des scripts LSA)"""
+    top = np.argsort(weights, axis=1)[:, -topn:][:, ::-1]
+    return [[vocab[i] for i in row] for row in top]
+
+
+def class_tfidf(cluster_counts):
+    """c-TF-IDF : fréquence du mot dans la classe x log(1 + mots moyens par classe / fréquence totale)"""
+    cluster_counts = np.asarray(cluster_counts, dtype=np.float64)
+    totals = cluster_counts.sum(axis=1, keepdims=True)
+    tf = cluster_counts / np.where(totals > 0, totals, 1)
+    term_totals = cluster_counts.sum(axis=0)
+    idf = np.log(1 + totals.mean() / np.where(term_totals > 0, term_totals, 1))
+    return tf * idf
+
+
+class ClusterSummary:
+    """Tailles, centroïdes TF-IDF, mots-clés et paragraphes représentatifs des clusters
+
+    `tfidf` : matrice TF-IDF (n_docs x mots) ; `labels` : cluster de chaque
+    paragraphe ; `embedding` / `centroids` : coordonnées LSA normalisées et
+    centroïdes k-means (sinon la représentativité est mesurée dans
+    l'espace TF-IDF) ; `counts` : matrice de comptes pour le c-TF-IDF
+    (par défaut les poids TF-IDF eux-mêmes).
+    """
+
+    def __init__(self, tfidf, labels, n_clusters, vocab, embedding=None, centroids=None,
+                 counts=None, topn=10, n_representatives=3):
+        labels = np.asarray(labels)
+        self.labels = labels
+        self.vocab = vocab
+        indicator = indicator_matrix(labels, n_clusters)
+        self.sizes = np.bincount(labels, minlength=n_clusters)
+        # Somme des lignes de chaque cluster : un seul produit creux
+        sums = np.asarray((indicator @ tfidf).todense())
+        self.centroids = sums / np.maximum(self.sizes, 1)[:, np.newaxis]
+        cluster_counts = sums if counts is None else np.asarray((indicator @ counts).todense())
+        self.ctfidf = class_tfidf(cluster_counts)
+        self.top_words = top_terms(self.centroids, vocab, topn)
+        self.ctfidf_words = top_terms(self.ctfidf, vocab, topn)
+        self.representatives = self._representatives(tfidf, embedding, centroids, n_representatives)
+
+    def _representatives(self, tfidf, embedding, centroids, n):
+        """Indices des `n` paragraphes les plus proches du centroïde de leur cluster"""
+        if embedding is not None and centroids is not None:
+            embedding = np.asarray(embedding)
+            scores = -np.linalg.norm(embedding - np.asarray(centroids)[self.labels], axis=1)
+        else:
+            scores = np.asarray(tfidf.multiply(self.centroids[self.labels]).sum(axis=1)).ravel()
+        # Tri par cluster puis par score décroissant ; les n premiers de chaque groupe
+        order = np.lexsort((-scores, self.labels))
+        starts = np.concatenate([[0], np.cumsum(self.sizes)[:-1]])
+        return [order[start:start + min(n, size)] for start, size in zip(starts, self.sizes)]
+
+    def clusters(self, paragraphs=None):
+        """Un dict par cluster non vide (topic_id à partir de 1), pour le rapport JSON"""
+        summary = []
+        for cluster_id, size in enumerate(self.sizes):
+            if not size:
+                continue
+            item = {
+                'topic_id': cluster_id + 1,
+                'nb_paragraphs': int(size),
+                'top_words': self.top_words[cluster_id],
+                'ctfidf_words': self.ctfidf_words[cluster_id],
+                'representative_paragraphs': [int(i) for i in self.representatives[cluster_id]],
+            }
+            if paragraphs is not None:
+                item['representative_texts'] = [paragraphs[i] for i in self.representatives[cluster_id]]
+            summary.append(item)
+        return summary
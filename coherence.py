@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Cohérence des topics (UMass, NPMI) calculée sur la matrice document-terme
+Matrice binaire document-mot construite une fois, co-occurrences de l'union
+des mots-clés de tous les topics (de tous les modèles) en un seul produit
+creux, puis scores de toutes les paires de tous les topics en une passe
+
+Usage :
+    python coherence.py lda_15topics_results.tsv lda_gensim_results.tsv lsa_cpu_15topics_results.tsv
+"""
+
+import argparse
+import os
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from corpus_cache import DEFAULT_SOURCE, dtm_cache_dir, load_dtm
+
+
+def top_word_ids(topic_word, topn=10):
+    """Indices des `topn` mots les plus lourds de chaque topic (ordre décroissant)"""
+    topic_word = np.asarray(topic_word)
+    return np.argsort(-topic_word, axis=1)[:, :topn]
+
+
+def binary_dtm(dtm):
+    """Présence / absence de chaque mot dans chaque document (CSR, float64)"""
+    dtm = csr_matrix(dtm)
+    return csr_matrix(((dtm.data > 0).astype(np.float64), dtm.indices, dtm.indptr), shape=dtm.shape)
+
+
+def _pad_topics(topics):
+    """Topics (listes d'indices de longueurs variables) -> tableau complété par -1"""
+    topics = [list(words) for words in topics]
+    width = max((len(words) for words in topics), default=0)
+    padded = np.full((len(topics), width), -1, dtype=np.int64)
+    for row, words in enumerate(topics):
+        padded[row, :len(words)] = words
+    return padded
+
+
+def topic_coherence(dtm, topics, binary=None):
+    """Scores UMass et NPMI de chaque topic : {'umass': array, 'npmi': array}
+
+    `topics` : liste d'indices de colonnes triés par importance décroissante
+    (longueurs variables acceptées). Paires (i > j) de mots d'un topic :
+      UMass = moyenne de log((D(wi, wj) + 1) / D(wj))
+      NPMI  = moyenne de log(P(wi, wj) / (P(wi) P(wj))) / -log P(wi, wj),
+              -1 pour une paire qui n'apparaît jamais ensemble.
+    `binary` : matrice binary_dtm(dtm) déjà construite, à réutiliser.
+    """
+    binary = binary_dtm(dtm) if binary is None else binary
+    n_docs = binary.shape[0]
+    padded = _pad_topics(topics)
+    if not padded.size:
+        return {'umass': np.zeros(len(padded)), 'npmi': np.zeros(len(padded))}
+
+    # Co-occurrences de l'union des mots-clés : un seul produit creux
+    union, positions = np.unique(padded[padded >= 0], return_inverse=True)
+    pos = np.full(padded.shape, -1, dtype=np.int64)
+    pos[padded >= 0] = positions
+    columns = binary[:, union]
+    co = (columns.T @ columns).toarray()
+    doc_freq = np.diag(co)
+
+    i, j = np.tril_indices(padded.shape[1], k=-1)
+    wi, wj = pos[:, i], pos[:, j]  # (topics x paires)
+    valid = (wi >= 0) & (wj >= 0)
+    wi, wj = np.where(valid, wi, 0), np.where(valid, wj, 0)
+    joint = co[wi, wj]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        umass = np.log((joint + 1) / np.maximum(doc_freq[wj], 1))
+        p_joint = joint / n_docs
+        pmi = np.log(p_joint * n_docs * n_docs / (doc_freq[wi] * doc_freq[wj]))
+        npmi = np.where(joint == 0, -1.0,
+                        np.where(joint == n_docs, 1.0, pmi / -np.log(p_joint)))
+
+    n_pairs = valid.sum(axis=1)
+    denominator = np.maximum(n_pairs, 1)
+    return {
+        'umass': np.where(n_pairs > 0, np.where(valid, umass, 0).sum(axis=1) / denominator, 0.0),
+        'npmi': np.where(n_pairs > 0, np.where(valid, npmi, 0).sum(axis=1) / denominator, 0.0),
+    }
+
+
+def model_coherence(dtm, models):
+    """Cohérence de tous les topics de plusieurs modèles en une seule passe
+
+    `models` : {nom: liste de topics (indices de colonnes)}.
+    Renvoie {nom: {'umass': array, 'npmi': array}}.
+    """
+    names = list(models)
+    counts = [len(models[name]) for name in names]
+    scores = topic_coherence(dtm, [words for name in names for words in models[name]])
+    bounds = np.cumsum([0] + counts)
+    return {name: {measure: values[start:stop] for measure, values in scores.items()}
+            for name, start, stop in zip(names, bounds[:-1], bounds[1:])}
+
+
+def umass_coherence(dtm, topics):
+    """Cohérence UMass de chaque topic (liste de float)"""
+    return [float(score) for score in topic_coherence(dtm, topics)['umass']]
+
+
+def read_topics_tsv(path):
+    """Mots-clés de chaque topic d'un TSV de résultats (section Topic_ID)"""
+    topics = []
+    in_topics = False
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip().startswith('Topic_ID'):
+                in_topics = True
+                continue
+            parts = line.rstrip('\n').split('\t')
+            if in_topics and len(parts) >= 3:
+                topics.append(parts[-1].split(' | '))
+    return topics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cohérence UMass / NPMI des topics de fichiers de résultats")
+    parser.add_argument("results", nargs="+", help="TSV de résultats (section Topic_ID)")
+    parser.add_argument("--source", nargs="+", default=[DEFAULT_SOURCE], help="Fichiers JSON de discours")
+    parser.add_argument("--output", help="TSV des scores par topic")
+    args = parser.parse_args()
+
+    X, vocab = load_dtm(dtm_cache_dir(args.source), mmap_mode='r')
+    token_to_id = {token: i for i, token in enumerate(vocab)}
+
+    models, missing = {}, {}
+    for path in args.results:
+        name = os.path.splitext(os.path.basename(path))[0]
+        topics = read_topics_tsv(path)
+        models[name] = [[token_to_id[w] for w in words if w in token_to_id] for words in topics]
+        missing[name] = sum(w not in token_to_id for words in topics for w in words)
+    scores = model_coherence(X, models)
+
+    print(f"{'Modèle':40s} {'Topics':>6s} {'UMass':>8s} {'NPMI':>8s}  Mots hors vocabulaire")
+    for name, values in scores.items():
+        print(f"{name:40s} {len(models[name]):6d} {values['umass'].mean():8.3f} "
+              f"{values['npmi'].mean():8.3f}  {missing[name]}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write("Model\tTopic_ID\tCoherence_UMass\tCoherence_NPMI\n")
+            for name, values in scores.items():
+                for topic_id, (umass, npmi) in enumerate(zip(values['umass'], values['npmi']), 1):
+                    f.write(f"{name}\t{topic_id}\t{umass:.4f}\t{npmi:.4f}\n")
+        print(f"\n✓ Scores sauvegardés dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
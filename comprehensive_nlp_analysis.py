@@ -9,26 +9,11 @@ import json
 import time
 from collections import Counter
 from konlpy.tag import Hannanum, Kkma, Komoran
+from korean_stopwords import STOPWORDS_VERSION, get_filter
+
+# Stop words communs (sans les métadonnées des recueils)
+stop_filter = get_filter()
 
-# Liste de stop words coréens
-KOREAN_STOPWORDS = {
-    # Particules
-    '이', '가', '을', '를', '은', '는', '에', '에서', '의', '와', '과', '로', '으로',
-    '도', '만', '부터', '까지', '에게', '한테', '께', '보다', '처럼', '같이',
-    # Pronoms
-    '나', '너', '저', '우리', '그', '이', '저', '여기', '거기', '저기',
-    '이것', '그것', '저것', '누구', '무엇', '어디', '언제', '어떻게',
-    # Verbes auxiliaires
-    '하다', '되다', '있다', '없다', '이다', '아니다',
-    # Adverbes temporels
-    '지금', '오늘', '어제', '내일', '여기', '거기', '저기',
-    # Conjonctions
-    '그리고', '그러나', '하지만', '또', '또한', '및',
-    # Nombres
-    '일', '이', '삼', '사', '오', '육', '칠', '팔', '구', '십',
-    # Autres mots fonctionnels
-    '등', '것', '수', '때', '년', '월', '일', '중', '간', '말', '점'
-}
 
 def analyze_with_analyzer(analyzer_name, analyzer, texts, use_stopwords=False):
     """Analyse les textes avec un analyseur donné"""
@@ -48,7 +33,7 @@ def analyze_with_analyzer(analyzer_name, analyzer, texts, use_stopwords=False):
         
         # Filtrer si nécessaire
         if use_stopwords:
-            nouns = [word for word in nouns if word not in KOREAN_STOPWORDS and len(word) > 1]
+            nouns = stop_filter.filter(nouns)
         
         all_nouns.extend(nouns)
     
@@ -148,7 +133,8 @@ for result in all_results:
 output = {
     "metadata": {
         "total_speeches_analyzed": len(speeches_100),
-        "stopwords_count": len(KOREAN_STOPWORDS),
+        "stopwords_count": len(stop_filter.stopwords),
+        "stopwords_version": STOPWORDS_VERSION,
         "analysis_date": "2025-12-09"
     },
     "results": all_results
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Cache de la matrice document-terme des paragraphes
+Une seule tokenisation (CountVectorizer, paramètres des scripts analyse*.py)
+partagée par tous les modèles de topics, stockée en .npy (mmap possible)
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+DEFAULT_SOURCE = "presidential_speeches_texts_cleaned_complete.json"
+CACHE_DIR = ".cache"
+
+# Paramètres de vectorisation communs à analyse1/2, analyse_lda_15topics et LSA
+VECTORIZER_PARAMS = {'max_features': 2000, 'min_df': 2, 'max_df': 0.8}
+# Comptes stockés en float64 : LatentDirichletAllocation et les autres modèles
+# les lisent en mmap sans conversion, donc sans copie par processus
+DTM_DTYPE = 'float64'
+
+
+def load_speeches(sources):
+    """Charge et concatène les discours d'un ou plusieurs fichiers JSON"""
+    if isinstance(sources, str):
+        sources = [sources]
+    speeches = []
+    for source in sources:
+        with open(source, "r", encoding="utf-8") as f:
+            speeches.extend(json.load(f))
+    return speeches
+
+
+def load_paragraphs(sources):
+    """Liste à plat des paragraphes de tous les discours"""
+    return [p for article in load_speeches(sources) for p in article["paragraphs"]]
+
+
+def cache_key(sources, **params):
+    """Clé de cache : chemins, tailles et dates des sources + paramètres"""
+    if isinstance(sources, str):
+        sources = [sources]
+    h = hashlib.sha1()
+    for source in sources:
+        stat = os.stat(source)
+        h.update(f"{os.path.abspath(source)}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    h.update(json.dumps(params, sort_keys=True).encode())
+    return h.hexdigest()[:16]
+
+
+def save_csr(directory, matrix):
+    """Sauvegarde une matrice CSR en tableaux .npy séparés (chargeables en mmap)"""
+    os.makedirs(directory, exist_ok=True)
+    matrix.sum_duplicates()  # indices triés, sans doublons : rien à réécrire au chargement
+    np.save(os.path.join(directory, "data.npy"), matrix.data)
+    np.save(os.path.join(directory, "indices.npy"), matrix.indices)
+    np.save(os.path.join(directory, "indptr.npy"), matrix.indptr)
+    np.save(os.path.join(directory, "shape.npy"), np.array(matrix.shape))
+
+
+def load_csr(directory, mmap_mode=None):
+    """Recharge une matrice CSR ; avec mmap_mode='r' les tableaux ne sont pas copiés"""
+    arrays = [np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+              for name in ("data", "indices", "indptr")]
+    shape = tuple(np.load(os.path.join(directory, "shape.npy")))
+    matrix = csr_matrix(tuple(arrays), shape=shape, copy=False)
+    # Forme canonique garantie par save_csr : scipy n'essaie pas de trier des tableaux en lecture seule
+    matrix.has_canonical_format = True
+    return matrix
+
+
+def row_slice(matrix, start, stop):
+    """Lignes start:stop d'une matrice CSR sans copie de data/indices (vues, mmap compris)
+
+    Le découpage scipy `matrix[start:stop]` recopie les tableaux (ici, scipy
+    ne recopie qu'une tranche de moins de la moitié des non-zéros).
+    """
+    indptr = matrix.indptr[start:stop + 1]
+    begin, end = indptr[0], indptr[-1]
+    sliced = csr_matrix((matrix.data[begin:end], matrix.indices[begin:end], indptr - begin),
+                        shape=(stop - start, matrix.shape[1]), copy=False)
+    sliced.has_canonical_format = matrix.has_canonical_format
+    return sliced
+
+
+def dtm_cache_dir(sources=DEFAULT_SOURCE, cache_dir=CACHE_DIR, **params):
+    """Construit (si besoin) la matrice document-terme et renvoie son répertoire de cache"""
+    params = {**VECTORIZER_PARAMS, **params}
+    directory = os.path.join(cache_dir, f"dtm_{cache_key(sources, dtype=DTM_DTYPE, **params)}")
+    if not os.path.exists(os.path.join(directory, "vocab.json")):
+        from sklearn.feature_extraction.text import CountVectorizer
+        print(f"Vectorisation des paragraphes (cache: {directory})...")
+        vectorizer = CountVectorizer(**params)
+        matrix = vectorizer.fit_transform(load_paragraphs(sources))
+        save_csr(directory, matrix.astype(DTM_DTYPE))
+        # vocab.json est écrit en dernier : sa présence marque un cache complet
+        with open(os.path.join(directory, "vocab.json"), "w", encoding="utf-8") as f:
+            json.dump(vectorizer.get_feature_names_out().tolist(), f, ensure_ascii=False)
+    return directory
+
+
+def load_dtm(directory, mmap_mode=None):
+    """Charge (matrice document-terme, vocabulaire) depuis un répertoire de cache"""
+    with open(os.path.join(directory, "vocab.json"), "r", encoding="utf-8") as f:
+        vocab = json.load(f)
+    return load_csr(directory, mmap_mode=mmap_mode), vocab
@@ -8,32 +8,12 @@ Comparaison avec et sans stop words sur les discours présidentiels
 import json
 from konlpy.tag import Komoran
 from collections import Counter
+from korean_stopwords import STOPWORDS_VERSION, get_filter
+
+# Stop words coréens communs (lexique partagé korean_stopwords)
+stop_filter = get_filter()
+KOREAN_STOPWORDS = stop_filter.stopwords
 
-# Liste de stop words coréens couramment utilisés
-KOREAN_STOPWORDS = {
-    # Particules (조사)
-    '이', '가', '을', '를', '은', '는', '에', '에서', '의', '와', '과', '로', '으로',
-    '도', '만', '부터', '까지', '에게', '한테', '께', '보다', '처럼', '같이',
-    
-    # Pronoms (대명사)
-    '나', '너', '저', '우리', '그', '이', '저', '여기', '거기', '저기',
-    '이것', '그것', '저것', '누구', '무엇', '어디', '언제', '어떻게',
-    
-    # Verbes auxiliaires et terminaisons courantes
-    '하다', '되다', '있다', '없다', '이다', '아니다',
-    
-    # Adverbes temporels/locatifs fréquents
-    '지금', '오늘', '어제', '내일', '여기', '거기', '저기',
-    
-    # Conjonctions
-    '그리고', '그러나', '하지만', '또', '또한', '및',
-    
-    # Nombres
-    '일', '이', '삼', '사', '오', '육', '칠', '팔', '구', '십',
-    
-    # Autres mots fonctionnels
-    '등', '것', '수', '때', '년', '월', '일'
-}
 
 # Charger les discours
 print("📖 Chargement des discours de Lee Seung Man...")
@@ -63,7 +43,7 @@ for word, count in noun_freq_no_filter.most_common(20):
     print(f"  {word:15s} : {count:3d} fois")
 
 # Filtrer les stop words
-nouns_filtered = [word for word in nouns if word not in KOREAN_STOPWORDS and len(word) > 1]
+nouns_filtered = stop_filter.filter(nouns)
 
 print("\n" + "=" * 80)
 print("📊 TOP 20 NOMS LES PLUS FRÉQUENTS (AVEC FILTRAGE)")
@@ -91,7 +71,8 @@ results = {
     "stopwords_removed": len(nouns) - len(nouns_filtered),
     "top_20_no_filter": noun_freq_no_filter.most_common(20),
     "top_20_filtered": noun_freq_filtered.most_common(20),
-    "stopwords_used": list(KOREAN_STOPWORDS)
+    "stopwords_version": STOPWORDS_VERSION,
+    "stopwords_used": sorted(KOREAN_STOPWORDS)
 }
 
 with open("stopwords_analysis.json", "w", encoding="utf-8") as f:
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tables de fréquences par shard (analyseur / président / année)
+Chaque shard est un .npz autonome (mots triés + comptes int64) ; la fusion
+est associative et commutative, donc les top-k par président, par décennie
+ou sur tout le corpus se calculent en fusionnant les tables, sans réanalyse
+
+Usage :
+    python freq_tables.py --analyzer Komoran --top 20
+    python freq_tables.py --analyzer Komoran --president Park_Chung_Hee
+    python freq_tables.py --analyzer Kkma --decade 1960 1970
+"""
+
+import argparse
+import glob
+import os
+import time
+
+import numpy as np
+
+from vocabulary import Vocabulary, most_common
+
+# Sous .cache/ (ignoré par git), comme le cache des noms
+FREQ_DIR = os.path.join(".cache", "freq_tables")
+UNKNOWN_YEAR = "unknown"
+
+
+class FrequencyTable:
+    """Comptes de mots d'un shard : tokens triés (str) et comptes alignés (int64)"""
+
+    def __init__(self, tokens=(), counts=None, documents=0):
+        self.tokens = np.asarray(tokens, dtype=str)
+        self.counts = np.zeros(len(self.tokens), dtype=np.int64) if counts is None \
+            else np.asarray(counts, dtype=np.int64)
+        self.documents = int(documents)
+
+    @classmethod
+    def from_counts(cls, counts, vocab, documents=0):
+        """Table depuis un tableau de comptes indexé par les ids de `vocab`"""
+        ids = np.flatnonzero(counts)
+        tokens = np.asarray(vocab.decode(ids), dtype=str)
+        order = np.argsort(tokens, kind="stable")
+        return cls(tokens[order], counts[ids][order], documents)
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def total(self):
+        return int(self.counts.sum())
+
+    def most_common(self, n):
+        return most_common(self.counts, self.tokens, n)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(path, tokens=self.tokens, counts=self.counts,
+                            documents=np.int64(self.documents))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data["tokens"], data["counts"], data["documents"])
+
+
+def merge(tables):
+    """Fusionne des tables (somme des comptes) ; le résultat ne dépend pas de l'ordre"""
+    tables = list(tables)
+    if not tables:
+        return FrequencyTable()
+    vocab = Vocabulary()
+    ids = np.concatenate([vocab.encode(t.tokens.tolist()) for t in tables])
+    weights = np.concatenate([t.counts for t in tables])
+    counts = np.bincount(ids, weights=weights, minlength=len(vocab)).astype(np.int64)
+    return FrequencyTable.from_counts(counts, vocab, sum(t.documents for t in tables))
+
+
+def speech_year(speech):
+    """Année d'un discours ('YYYY.MM.DD'), UNKNOWN_YEAR si la date est absente"""
+    year = str(speech.get("date", ""))[:4]
+    return year if year.isdigit() else UNKNOWN_YEAR
+
+
+def shard_path(root, analyzer, president_id, year):
+    return os.path.join(root, analyzer, president_id, f"{year}.npz")
+
+
+def write_shards(stream, vocab, years, analyzer, president_id, root=FREQ_DIR):
+    """Écrit une table par année depuis un TokenStream (un document par discours)
+
+    `years[i]` est l'année du document i. Renvoie la liste des fichiers écrits.
+    """
+    years = np.asarray(years)
+    token_years = np.repeat(years, np.diff(stream.offsets))
+    ids = stream.ids
+    paths = []
+    for year in np.unique(years):
+        counts = np.bincount(ids[token_years == year], minlength=len(vocab))
+        table = FrequencyTable.from_counts(counts, vocab, np.count_nonzero(years == year))
+        path = shard_path(root, analyzer, president_id, year)
+        table.save(path)
+        paths.append(path)
+    return paths
+
+
+def find_shards(root, analyzer, presidents=None, decades=None, years=None):
+    """Chemins des shards correspondant aux filtres (président, décennie, intervalle d'années)"""
+    paths = []
+    for path in sorted(glob.glob(os.path.join(root, analyzer, "*", "*.npz"))):
+        president_id = os.path.basename(os.path.dirname(path))
+        year = os.path.splitext(os.path.basename(path))[0]
+        if presidents and president_id not in presidents:
+            continue
+        if decades or years:
+            if year == UNKNOWN_YEAR:
+                continue
+            if decades and int(year) // 10 * 10 not in decades:
+                continue
+            if years and not years[0] <= int(year) <= years[1]:
+                continue
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Top-k par fusion des tables de fréquences")
+    parser.add_argument("--analyzer", required=True, help="Analyseur (sous-répertoire des tables)")
+    parser.add_argument("--president", nargs="+", help="Identifiants des présidents (ex: Lee_Seung_Man)")
+    parser.add_argument("--decade", nargs="+", type=int, help="Décennies (ex: 1950 1960)")
+    parser.add_argument("--years", nargs=2, type=int, metavar=("DEBUT", "FIN"),
+                        help="Intervalle d'années inclusif")
+    parser.add_argument("--top", type=int, default=50)
+    parser.add_argument("--root", default=FREQ_DIR)
+    args = parser.parse_args()
+
+    paths = find_shards(args.root, args.analyzer, args.president, args.decade, args.years)
+    if not paths:
+        print(f"⚠️  Aucune table trouvée dans {os.path.join(args.root, args.analyzer)}")
+        return
+
+    start = time.perf_counter()
+    table = merge(FrequencyTable.load(path) for path in paths)
+    top = table.most_common(args.top)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    print(f"{len(paths)} tables fusionnées en {elapsed:.1f} ms : {table.documents:,} discours, "
+          f"{table.total():,} noms, {len(table):,} noms uniques\n")
+    for rank, (word, count) in enumerate(top, 1):
+        print(f"  {rank:2d}. {word:20s} : {count:8,d}")
+
+
+if __name__ == "__main__":
+    main()
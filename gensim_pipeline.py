@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Ingestion Gensim en cache et inférence groupée
+Dictionary filtré (.dict) et corpus bag-of-words sérialisé en Matrix Market
+(MmCorpus, lu en streaming depuis le disque) : les exécutions suivantes ne
+retokenisent pas et l'entraînement ne garde pas le corpus en mémoire.
+Distribution des topics de tous les documents par E-step sur des chunks,
+en parallèle, renvoyée en matrice NumPy dense
+"""
+
+import json
+import multiprocessing
+import os
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from gensim import corpora, utils
+
+from corpus_cache import CACHE_DIR, cache_key, load_speeches
+
+# Équivalents de min_df=2, max_df=0.8, max_features=2000 des scripts sklearn
+DICTIONARY_PARAMS = {'no_below': 2, 'no_above': 0.8, 'keep_n': 2000}
+
+
+def count_presidents(speeches):
+    """Nombre de présidents distincts (champ 'president' ou segment de l'url)"""
+    presidents = set()
+    for speech in speeches:
+        if "president" in speech:
+            presidents.add(speech["president"])
+        elif "url" in speech:
+            url_parts = speech["url"].split("/")
+            if len(url_parts) > 4:
+                presidents.add(url_parts[4])
+    return len(presidents) if presidents else "Unknown"
+
+
+def iter_tokens(speeches):
+    """Paragraphes tokenisés (découpage sur les espaces), un par un"""
+    for article in speeches:
+        for p in article["paragraphs"]:
+            yield p.split()
+
+
+def gensim_cache_path(sources, cache_dir=CACHE_DIR, **params):
+    """Répertoire de cache pour ces sources et paramètres de filtrage"""
+    params = {**DICTIONARY_PARAMS, **params}
+    return os.path.join(cache_dir, f"gensim_{cache_key(sources, **params)}")
+
+
+def is_cached(directory):
+    # meta.json est écrit en dernier : sa présence marque un cache complet
+    return os.path.exists(os.path.join(directory, "meta.json"))
+
+
+def build_corpus(sources, directory, **params):
+    """Tokenise les paragraphes, filtre le Dictionary et sérialise le corpus en MmCorpus"""
+    params = {**DICTIONARY_PARAMS, **params}
+    os.makedirs(directory, exist_ok=True)
+    speeches = load_speeches(sources)
+
+    dictionary = corpora.Dictionary(iter_tokens(speeches))
+    dictionary.filter_extremes(**params)
+    dictionary.save(os.path.join(directory, "dictionary.dict"))
+
+    # Deuxième passage : bag-of-words écrits au fil de l'eau dans corpus.mm
+    corpora.MmCorpus.serialize(
+        os.path.join(directory, "corpus.mm"),
+        (dictionary.doc2bow(tokens) for tokens in iter_tokens(speeches)),
+        id2word=dictionary)
+
+    meta = {
+        'nb_speeches': len(speeches),
+        'nb_presidents': count_presidents(speeches),
+        'nb_paragraphs': sum(len(article["paragraphs"]) for article in speeches),
+        'params': params,
+    }
+    with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+
+def gensim_cache_dir(sources, cache_dir=CACHE_DIR, **params):
+    """Construit (si besoin) Dictionary + MmCorpus et renvoie le répertoire de cache"""
+    directory = gensim_cache_path(sources, cache_dir, **params)
+    if not is_cached(directory):
+        print(f"Tokenisation et sérialisation du corpus (cache: {directory})...")
+        build_corpus(sources, directory, **params)
+    return directory
+
+
+def load_corpus(directory):
+    """(MmCorpus en streaming, Dictionary, métadonnées) depuis un répertoire de cache"""
+    with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    dictionary = corpora.Dictionary.load(os.path.join(directory, "dictionary.dict"))
+    corpus = corpora.MmCorpus(os.path.join(directory, "corpus.mm"))
+    return corpus, dictionary, meta
+
+
+# Modèle de chaque worker d'inférence
+_lda = None
+
+
+def _init_inference_worker(lda, model_path):
+    global _lda
+    if lda is None:
+        from gensim.models import LdaModel
+        lda = LdaModel.load(model_path, mmap='r')
+    _lda = lda
+
+
+def _infer_chunk(chunk, chunk_index, seed, lda=None):
+    """E-step sur un chunk : distributions de topics normalisées (une ligne par document)
+
+    L'initialisation aléatoire de gamma est réensemencée par chunk : le
+    résultat ne dépend ni du nombre de workers ni de l'ordre d'exécution.
+    """
+    lda = lda or _lda
+    random_state = lda.random_state
+    lda.random_state = np.random.RandomState(seed + chunk_index)
+    try:
+        gamma, _ = lda.inference(chunk)
+    finally:
+        lda.random_state = random_state
+    return gamma / gamma.sum(axis=1, keepdims=True)
+
+
+def infer_doc_topics(lda, corpus, chunksize=2000, workers=1, seed=42):
+    """Matrice document-topic dense (n_docs x num_topics) par inférence groupée
+
+    Le corpus est parcouru en streaming par chunks de `chunksize` documents ;
+    avec `workers` > 1, les chunks sont répartis sur un pool de processus
+    (au plus 2 chunks en attente par worker). Les workers héritent du modèle
+    par fork quand c'est possible (comme LdaMulticore, ce qui permet l'appel
+    depuis un script sans garde __main__) ; sinon le modèle est sauvegardé
+    puis rechargé en mmap par chaque worker. Le chunk i est initialisé avec
+    la graine `seed + i`, quel que soit le worker qui le traite.
+    """
+    doc_topics = np.empty((len(corpus), lda.num_topics))
+    chunks = utils.grouper(corpus, chunksize)
+    row = 0
+
+    def store(theta):
+        nonlocal row
+        doc_topics[row:row + len(theta)] = theta
+        row += len(theta)
+
+    if workers <= 1:
+        for chunk_index, chunk in enumerate(chunks):
+            store(_infer_chunk(chunk, chunk_index, seed, lda))
+        return doc_topics
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if 'fork' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('fork')
+            initargs = (lda, None)
+        else:
+            context = multiprocessing.get_context('spawn')
+            model_path = os.path.join(tmp, "lda.model")
+            lda.save(model_path)
+            initargs = (None, model_path)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_inference_worker,
+                                 initargs=initargs) as pool:
+            pending = deque()
+            for chunk_index, chunk in enumerate(chunks):
+                pending.append(pool.submit(_infer_chunk, chunk, chunk_index, seed))
+                if len(pending) >= 2 * workers:
+                    store(pending.popleft().result())
+            while pending:
+                store(pending.popleft().result())
+    return doc_topics
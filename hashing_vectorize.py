@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Vectorisation parallèle des paragraphes par hachage
+HashingVectorizer (sans état, donc sans dictionnaire partagé) appliqué par
+des processus workers à des tranches du corpus ; les matrices CSR sont
+empilées puis filtrées par fréquence documentaire (min_df / max_df /
+max_features, comme CountVectorizer). Chaque colonne gardée est nommée par
+le mot le plus fréquent qui y tombe, pour l'affichage des mots-clés.
+Le résultat est mis en cache au format de corpus_cache (load_dtm)
+
+Usage :
+    python hashing_vectorize.py --source president_texts_*.json --workers 8
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+
+import numpy as np
+from scipy.sparse import vstack
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.utils import murmurhash3_32
+
+from corpus_cache import (CACHE_DIR, DEFAULT_SOURCE, DTM_DTYPE, VECTORIZER_PARAMS, cache_key,
+                          load_paragraphs, save_csr)
+from sparse_dtm import select_features
+
+N_FEATURES = 2**20
+
+
+def identity(tokens):
+    """Analyseur des documents déjà découpés en mots (picklable, contrairement à une lambda)"""
+    return tokens
+
+
+def make_vectorizer(n_features=N_FEATURES, analyzer='word'):
+    # Comptes bruts, comme CountVectorizer (pas de signe alterné ni de normalisation)
+    return HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None, dtype=np.int64,
+                             analyzer=analyzer)
+
+
+def make_tokenizer():
+    """Découpage en mots de CountVectorizer / HashingVectorizer (minuscules, token_pattern)"""
+    return make_vectorizer().build_analyzer()
+
+
+def word_columns(words, n_features=N_FEATURES):
+    """Colonne de chaque mot : même hachage que HashingVectorizer (murmurhash3, graine 0)"""
+    hashes = np.fromiter((abs(murmurhash3_32(word, seed=0)) for word in words),
+                         dtype=np.int64, count=len(words))
+    return hashes % n_features
+
+
+def vectorize_shard(paragraphs, n_features=N_FEATURES):
+    """Matrice de comptes d'une tranche + (mots, colonnes, occurrences) pour la table inverse
+
+    Chaque paragraphe est découpé une seule fois ; les listes de mots
+    servent au hachage et aux comptes par mot.
+    """
+    tokenize = make_tokenizer()
+    documents = [tokenize(paragraph) for paragraph in paragraphs]
+    vectorizer = make_vectorizer(n_features, analyzer=identity)
+    X = vectorizer.transform(documents)
+    tokens = Counter(chain.from_iterable(documents))
+    words = list(tokens)
+    counts = np.fromiter(tokens.values(), dtype=np.int64, count=len(words))
+    return X, words, word_columns(words, n_features), counts
+
+
+def column_names(shards, n_features):
+    """Nom de chaque colonne : le mot le plus fréquent parmi ceux hachés vers elle
+
+    Renvoie (noms, nombre de colonnes partagées par plusieurs mots).
+    """
+    totals = Counter()
+    column_of = {}
+    for words, columns, counts in shards:
+        for word, column, count in zip(words, columns, counts):
+            totals[word] += int(count)
+            column_of[word] = int(column)
+    names = [''] * n_features
+    best = np.zeros(n_features, dtype=np.int64)
+    n_words = np.zeros(n_features, dtype=np.int64)
+    for word, count in totals.items():
+        column = column_of[word]
+        n_words[column] += 1
+        if count > best[column] or (count == best[column] and word < names[column]):
+            best[column] = count
+            names[column] = word
+    return names, int((n_words > 1).sum())
+
+
+def hashed_dtm(paragraphs, n_features=N_FEATURES, workers=None, shard_size=20000,
+               max_features=2000, min_df=2, max_df=0.8):
+    """Matrice document-terme filtrée (CSR), noms des colonnes, statistiques"""
+    shards = [paragraphs[i:i + shard_size] for i in range(0, len(paragraphs), shard_size)]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(shards)))
+    if workers == 1:
+        results = [vectorize_shard(shard, n_features) for shard in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(vectorize_shard, shards, [n_features] * len(shards)))
+
+    X = vstack([result[0] for result in results], format='csr')
+    names, collisions = column_names([result[1:] for result in results], n_features)
+    X, tokens = select_features(X, names, min_df=min_df, max_df=max_df, max_features=max_features)
+    stats = {'n_features': n_features, 'shards': len(shards), 'workers': workers,
+             'collided_columns': collisions}
+    return X, tokens, stats
+
+
+def hashed_dtm_cache_dir(sources=DEFAULT_SOURCE, cache_dir=CACHE_DIR, workers=None,
+                         n_features=N_FEATURES, **params):
+    """Comme corpus_cache.dtm_cache_dir, vectorisation par hachage en parallèle"""
+    params = {**VECTORIZER_PARAMS, **params}
+    key = cache_key(sources, n_features=n_features, dtype=DTM_DTYPE, **params)
+    directory = os.path.join(cache_dir, f"hdtm_{key}")
+    if not os.path.exists(os.path.join(directory, "vocab.json")):
+        print(f"Vectorisation par hachage des paragraphes (cache: {directory})...")
+        matrix, tokens, stats = hashed_dtm(load_paragraphs(sources), n_features, workers, **params)
+        save_csr(directory, matrix.astype(DTM_DTYPE))
+        with open(os.path.join(directory, "stats.json"), "w", encoding="utf-8") as f:
+            json.dump(stats, f, indent=2)
+        # vocab.json est écrit en dernier : sa présence marque un cache complet
+        with open(os.path.join(directory, "vocab.json"), "w", encoding="utf-8") as f:
+            json.dump(tokens, f, ensure_ascii=False)
+    return directory
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorisation parallèle par hachage")
+    parser.add_argument("--source", nargs="+", default=[DEFAULT_SOURCE], help="Fichiers JSON de discours")
+    parser.add_argument("--workers", type=int, default=0, help="Processus (0 = un par cœur)")
+    parser.add_argument("--n-features", type=int, default=N_FEATURES, help="Colonnes de hachage")
+    parser.add_argument("--shard-size", type=int, default=20000, help="Paragraphes par tranche")
+    args = parser.parse_args()
+
+    start = time.time()
+    paragraphs = load_paragraphs(args.source)
+    loaded = time.time()
+    X, tokens, stats = hashed_dtm(paragraphs, args.n_features, args.workers or None, args.shard_size,
+                                  **VECTORIZER_PARAMS)
+    print(f"✓ {X.shape[0]} paragraphes x {X.shape[1]} mots en {time.time() - loaded:.2f}s "
+          f"({stats['shards']} tranches, {stats['workers']} processus, chargement {loaded - start:.2f}s)")
+    print(f"✓ {stats['collided_columns']} colonnes de hachage partagées par plusieurs mots")
+    top = np.argsort(-np.asarray(X.sum(axis=0)).ravel())[:20]
+    print("Mots les plus fréquents : " + " | ".join(tokens[i] for i in top))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Top-k approximatif en mémoire constante (algorithme Space-Saving)
+Pour le mode streaming : les noms sont comptés au fil de l'analyse sans
+conserver le Counter complet. Avec capacity = ceil(1/epsilon) compteurs,
+l'erreur sur chaque fréquence est au plus epsilon * N (N = noms vus), et
+tout mot de fréquence > epsilon * N est garanti d'être suivi
+"""
+
+import heapq
+import math
+
+
+class SpaceSaving:
+    """Compteurs Space-Saving (Metwally et al., 2005)
+
+    Chaque mot suivi a un compte (surestimé) et une erreur maximale ; le
+    compte réel est dans [count - error, count]. Quand la table est pleine,
+    le mot de plus petit compte est remplacé (tas à suppression paresseuse).
+    """
+
+    def __init__(self, epsilon=1e-4, capacity=None):
+        self.capacity = capacity or math.ceil(1 / epsilon)
+        self.counts = {}
+        self.errors = {}
+        self.total = 0
+        self._heap = []  # (compte, mot), entrées périmées ignorées au dépilage
+
+    @property
+    def epsilon(self):
+        return 1 / self.capacity
+
+    def __len__(self):
+        return len(self.counts)
+
+    def add(self, word, count=1):
+        self.total += count
+        if word in self.counts:
+            self.counts[word] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[word] = count
+            self.errors[word] = 0
+        else:
+            min_count, victim = self._pop_min()
+            del self.counts[victim]
+            del self.errors[victim]
+            self.counts[word] = min_count + count
+            self.errors[word] = min_count
+        heapq.heappush(self._heap, (self.counts[word], word))
+        if len(self._heap) > 4 * self.capacity:
+            self._compact()
+
+    def update(self, words):
+        for word in words:
+            self.add(word)
+
+    def _pop_min(self):
+        while True:
+            count, word = heapq.heappop(self._heap)
+            if self.counts.get(word) == count:
+                return count, word
+
+    def _compact(self):
+        self._heap = [(count, word) for word, count in self.counts.items()]
+        heapq.heapify(self._heap)
+
+    def most_common(self, n):
+        """Les n mots de plus grand compte estimé, comme Counter.most_common"""
+        return heapq.nlargest(n, self.counts.items(), key=lambda item: item[1])
+
+    def guaranteed(self, n):
+        """Mots du top-n dont l'appartenance au vrai top-n est garantie
+
+        Un mot est garanti si sa borne inférieure (count - error) atteint le
+        compte estimé du (n+1)-ième mot.
+        """
+        top = self.most_common(n + 1)
+        threshold = top[n][1] if len(top) > n else 0
+        return [(word, count) for word, count in top[:n] if count - self.errors[word] >= threshold]
+
+    def error_bound(self):
+        """Erreur maximale sur un compte : epsilon * N"""
+        return self.total / self.capacity
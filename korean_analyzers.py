@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Registre des analyseurs morphologiques coréens
+Interface commune nouns/pos pour KoNLPy (Hannanum, Kkma, Komoran),
+Mecab-ko, Kiwi et spaCy (ko_core_news_sm)
+"""
+
+from abc import ABC, abstractmethod
+
+# Analyseurs utilisés par défaut (ceux des analyses existantes)
+DEFAULT_ANALYZERS = ['Hannanum', 'Kkma', 'Komoran']
+
+
+class Tokenizer(ABC):
+    """Interface commune : nouns(text), pos(text) et iter_nouns(texts)"""
+
+    name = None
+
+    @abstractmethod
+    def nouns(self, text):
+        """Noms du texte"""
+
+    @abstractmethod
+    def pos(self, text):
+        """Couples (forme, étiquette) du texte"""
+
+    def iter_nouns(self, texts):
+        """Renvoie les noms de chaque texte, dans l'ordre, un texte à la fois"""
+        for text in texts:
+            yield self.nouns(text)
+
+
+class TaggerTokenizer(Tokenizer):
+    """Adaptateur pour les analyseurs qui exposent déjà nouns/pos (KoNLPy, Mecab)"""
+
+    def __init__(self, name, tagger):
+        self.name = name
+        self.tagger = tagger
+
+    def nouns(self, text):
+        return self.tagger.nouns(text)
+
+    def pos(self, text):
+        return self.tagger.pos(text)
+
+
+class KiwiTokenizer(Tokenizer):
+    """Kiwi (C++) : les lots de textes sont analysés en parallèle par des threads natifs"""
+
+    # Noms communs et noms propres, comme Komoran.nouns()
+    NOUN_TAGS = ('NNG', 'NNP')
+
+    def __init__(self, num_workers=-1):
+        from kiwipiepy import Kiwi
+        self.name = 'Kiwi'
+        self.kiwi = Kiwi(num_workers=num_workers)
+
+    def nouns(self, text):
+        return [t.form for t in self.kiwi.tokenize(text) if t.tag in self.NOUN_TAGS]
+
+    def pos(self, text):
+        return [(t.form, t.tag) for t in self.kiwi.tokenize(text)]
+
+    def iter_nouns(self, texts):
+        for tokens in self.kiwi.tokenize(texts):
+            yield [t.form for t in tokens if t.tag in self.NOUN_TAGS]
+
+
+class SpacyTokenizer(Tokenizer):
+    """spaCy ko_core_news_sm : traitement par lots (et multiprocessus) avec nlp.pipe"""
+
+    # Étiquettes KAIST des noms communs et propres (ex: 'ncn+jco')
+    NOUN_TAGS = ('ncn', 'ncpa', 'ncps', 'nq')
+
+    # Composants inutiles pour l'extraction des noms (seuls tok2vec, tagger
+    # et lemmatizer sont nécessaires) : ni chargés ni exécutés
+    EXCLUDED_COMPONENTS = ('parser', 'ner', 'senter', 'morphologizer', 'attribute_ruler')
+
+    def __init__(self, model='ko_core_news_sm', batch_size=64, n_process=1):
+        import spacy
+        self.name = 'spaCy'
+        self.nlp = spacy.load(model, exclude=list(self.EXCLUDED_COMPONENTS))
+        self.batch_size = batch_size
+        self.n_process = n_process
+
+    def _doc_nouns(self, doc):
+        """Extrait les morphèmes nominaux de chaque eojeol (lemme 'a+b' aligné sur l'étiquette)"""
+        nouns = []
+        for token in doc:
+            tags = token.tag_.split('+')
+            lemmas = token.lemma_.split('+')
+            if len(tags) == len(lemmas):
+                nouns.extend(m for m, t in zip(lemmas, tags) if t in self.NOUN_TAGS and m)
+            elif tags[0] in self.NOUN_TAGS:
+                nouns.append(lemmas[0])
+        return nouns
+
+    def nouns(self, text):
+        return self._doc_nouns(self.nlp(text))
+
+    def pos(self, text):
+        return [(token.text, token.tag_) for token in self.nlp(text)]
+
+    def iter_nouns(self, texts):
+        docs = self.nlp.pipe(texts, batch_size=self.batch_size, n_process=self.n_process)
+        for doc in docs:
+            yield self._doc_nouns(doc)
+
+
+def _konlpy(class_name):
+    def factory(**options):
+        from konlpy import tag
+        return TaggerTokenizer(class_name, getattr(tag, class_name)(**options))
+    return factory
+
+
+def _mecab(**options):
+    """Mecab-ko : python-mecab-ko (dictionnaire inclus) sinon konlpy.tag.Mecab"""
+    try:
+        from mecab import MeCab
+        return TaggerTokenizer('Mecab', MeCab(**options))
+    except ImportError:
+        from konlpy.tag import Mecab
+        return TaggerTokenizer('Mecab', Mecab(**options))
+
+
+# Nom -> fabrique ; les dépendances sont importées à la création seulement
+ANALYZERS = {
+    'Hannanum': _konlpy('Hannanum'),
+    'Kkma': _konlpy('Kkma'),
+    'Komoran': _konlpy('Komoran'),
+    'Mecab': _mecab,
+    'Kiwi': KiwiTokenizer,
+    'spaCy': SpacyTokenizer,
+}
+
+
+def get_analyzer(name, **options):
+    """Instancie l'analyseur `name` du registre"""
+    if name not in ANALYZERS:
+        raise ValueError(f"Analyseur inconnu: {name} (disponibles: {', '.join(ANALYZERS)})")
+    return ANALYZERS[name](**options)
+
+
+def load_analyzers(names, skip_unavailable=False, options=None):
+    """Instancie plusieurs analyseurs ; ignore ceux dont la dépendance manque si demandé
+
+    `options` associe à un nom d'analyseur les paramètres de sa fabrique,
+    ex: {'spaCy': {'batch_size': 128, 'n_process': 4}}
+    """
+    options = options or {}
+    analyzers = {}
+    for name in names:
+        try:
+            analyzers[name] = get_analyzer(name, **options.get(name, {}))
+        except Exception as e:
+            if not skip_unavailable:
+                raise
+            print(f"⚠️  Analyseur {name} indisponible: {e}")
+    return analyzers
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Lexique unique et versionné des stop words coréens
+Mots fonctionnels communs + métadonnées propres à chaque président,
+compilés en frozenset et en masque sur les ids du vocabulaire
+"""
+
+import numpy as np
+
+# À incrémenter à chaque modification des listes ci-dessous
+STOPWORDS_VERSION = "1.0"
+
+BASE_STOPWORDS = frozenset({
+    # Particules
+    '이', '가', '을', '를', '은', '는', '에', '에서', '의', '와', '과', '로', '으로',
+    '도', '만', '부터', '까지', '에게', '한테', '께', '보다', '처럼', '같이',
+    # Pronoms
+    '나', '너', '저', '우리', '그', '여기', '거기', '저기',
+    '이것', '그것', '저것', '누구', '무엇', '어디', '언제', '어떻게',
+    # Verbes auxiliaires
+    '하다', '되다', '있다', '없다', '이다', '아니다',
+    # Adverbes temporels
+    '지금', '오늘', '어제', '내일',
+    # Conjonctions
+    '그리고', '그러나', '하지만', '또', '또한', '및',
+    # Nombres
+    '일', '삼', '사', '오', '육', '칠', '팔', '구', '십',
+    # Autres mots fonctionnels
+    '등', '것', '수', '때', '년', '월', '중', '간', '말', '점', '바',
+})
+
+# Métadonnées des recueils (titres, sources) à exclure pour chaque président
+PRESIDENT_STOPWORDS = {
+    'Lee_Seung_Man': frozenset({
+        '담화', '박사', '이승만', '대통령이승만', '대통령이승만박사',
+        '대통령이승만박사담화', '대통령이승만박사담화집', '공보처', '공보실',
+        '편', '집', '훈화록', '이대통령', '이대통령훈화록',
+        '중앙문화협회', '施政月報', '월보', '시정',
+    }),
+}
+
+
+def get_stopwords(president_id=None):
+    """Stop words communs, plus les métadonnées du président `president_id` s'il est donné"""
+    return BASE_STOPWORDS | PRESIDENT_STOPWORDS.get(president_id, frozenset())
+
+
+class StopwordFilter:
+    """Filtre compilé : un mot est gardé s'il n'est pas un stop word,
+    fait plus d'un caractère et n'est pas un nombre
+
+    La décision est calculée une seule fois par mot distinct. Sur des ids
+    entiers, `mask(vocab)` donne un masque booléen indexé par id, appliqué
+    de façon vectorisée avec `apply(ids, vocab)`. `filter(words, cache=False)`
+    ne mémorise rien (mémoire constante, pour le mode streaming).
+    """
+
+    def __init__(self, stopwords):
+        self.stopwords = frozenset(stopwords)
+        self._decisions = {}
+        self._mask = np.zeros(0, dtype=bool)
+
+    def decide(self, word):
+        """Décision sans cache"""
+        return word not in self.stopwords and len(word) > 1 and not word.isdigit()
+
+    def keep(self, word):
+        decision = self._decisions.get(word)
+        if decision is None:
+            decision = self.decide(word)
+            self._decisions[word] = decision
+        return decision
+
+    def filter(self, words, cache=True):
+        """Version chaînes de caractères : liste des mots gardés
+
+        Avec `cache=False`, les décisions ne sont pas mémorisées : la mémoire
+        ne grandit pas avec le nombre de mots distincts.
+        """
+        keep = self.keep if cache else self.decide
+        return [w for w in words if keep(w)]
+
+    def mask(self, vocab):
+        """Masque booléen des ids à garder pour `vocab` (séquence id -> mot)
+
+        Le vocabulaire ne faisant que grandir, seuls les nouveaux ids sont évalués.
+        """
+        n = len(vocab)
+        if n > len(self._mask):
+            new = np.fromiter((self.keep(vocab[i]) for i in range(len(self._mask), n)),
+                              dtype=bool, count=n - len(self._mask))
+            self._mask = np.concatenate([self._mask, new])
+        return self._mask[:n]
+
+    def apply(self, ids, vocab):
+        """Ids gardés parmi `ids` (tableau d'entiers), sans boucle Python par mot"""
+        return ids[self.mask(vocab)[ids]]
+
+
+def get_filter(president_id=None):
+    """Filtre compilé pour un président (ou stop words communs seulement)"""
+    return StopwordFilter(get_stopwords(president_id))
@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+LDA hors mémoire par apprentissage en ligne (partial_fit)
+Les paragraphes sont lus fichier par fichier et envoyés par minibatchs de
+taille fixe à LatentDirichletAllocation.partial_fit, via un vocabulaire
+appris en streaming (mêmes filtres que CountVectorizer) ou un
+HashingVectorizer sans état. Le modèle est sauvegardé tous les N batchs
+et un entraînement interrompu reprend au batch suivant (--resume)
+
+Usage :
+    python lda_online.py --source president_texts_*.json --topics 15 --batch-size 2000
+    python lda_online.py --source president_texts_*.json --topics 15 --resume
+"""
+
+import argparse
+import json
+import os
+import pickle
+from collections import Counter
+from itertools import chain, islice
+
+import numpy as np
+from sklearn.decomposition import LatentDirichletAllocation
+from sklearn.feature_extraction.text import CountVectorizer
+
+from corpus_cache import DEFAULT_SOURCE, VECTORIZER_PARAMS
+from hashing_vectorize import column_names, identity, make_tokenizer, make_vectorizer, word_columns
+from monitoring import StageMetrics
+from noun_cache import CHECKPOINT_DIR
+from topic_artifacts import save_lda
+from translation_cache import annotate_tsv, make_translator
+
+
+def iter_paragraphs(sources):
+    """Paragraphes de tous les discours, un fichier JSON chargé à la fois"""
+    for source in sources:
+        with open(source, "r", encoding="utf-8") as f:
+            speeches = json.load(f)
+        for article in speeches:
+            yield from article["paragraphs"]
+        del speeches
+
+
+def iter_batches(paragraphs, batch_size):
+    paragraphs = iter(paragraphs)
+    while True:
+        batch = list(islice(paragraphs, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def fit_vocabulary(sources, max_features=2000, min_df=2, max_df=0.8):
+    """Vocabulaire de CountVectorizer(max_features, min_df, max_df) appris en un passage
+
+    Seuls les compteurs par mot (fréquence documentaire et totale) sont
+    gardés en mémoire. Renvoie (vocabulaire trié, nombre de paragraphes).
+    """
+    analyzer = CountVectorizer().build_analyzer()
+    doc_freq, term_freq = Counter(), Counter()
+    n_docs = 0
+    for paragraph in iter_paragraphs(sources):
+        tokens = Counter(analyzer(paragraph))
+        doc_freq.update(tokens.keys())
+        term_freq.update(tokens)
+        n_docs += 1
+    min_count = min_df if isinstance(min_df, int) else min_df * n_docs
+    max_count = max_df if isinstance(max_df, int) else max_df * n_docs
+    kept = sorted(token for token, df in doc_freq.items() if min_count <= df <= max_count)
+    if max_features is not None and len(kept) > max_features:
+        # Même tri que CountVectorizer._limit_features (y compris pour les ex aequo)
+        term_freqs = np.array([term_freq[token] for token in kept], dtype=np.int64)
+        kept = sorted(kept[i] for i in (-term_freqs).argsort()[:max_features])
+    return kept, n_docs
+
+
+class HashedFeatureNames:
+    """Noms lisibles des colonnes d'un HashingVectorizer : mot le plus fréquent de chaque colonne
+
+    `transform` découpe chaque paragraphe une seule fois : les listes de mots
+    sont hachées (analyseur identité) et, avec `update`, comptées. Les
+    comptes par mot sont cumulés sur tous les batchs, le nom d'une colonne
+    est donc le mot le plus fréquent du corpus parmi ceux qui y tombent.
+    """
+
+    def __init__(self, n_features):
+        self.n_features = n_features
+        self.vectorizer = make_vectorizer(n_features, analyzer=identity)
+        self.tokenize = make_tokenizer()
+        self.totals = Counter()
+        self._names = None
+
+    def transform(self, paragraphs, update=False):
+        documents = [self.tokenize(p) for p in paragraphs]
+        if update:
+            self.totals.update(chain.from_iterable(documents))
+            self._names = None
+        return self.vectorizer.transform(documents)
+
+    def name(self, column):
+        if self._names is None:
+            words = list(self.totals)
+            counts = np.fromiter(self.totals.values(), dtype=np.int64, count=len(words))
+            self._names, _ = column_names([(words, word_columns(words, self.n_features), counts)],
+                                          self.n_features)
+        return self._names[column] or f"#{column}"
+
+
+def checkpoint_path(n_topics, root=CHECKPOINT_DIR):
+    return os.path.join(root, f"lda_online_{n_topics}topics.pkl")
+
+
+def save_checkpoint(path, state):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path, config):
+    """État sauvegardé si la configuration est identique, sinon None"""
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        state = pickle.load(f)
+    if state['config'] != config:
+        print(f"⚠️  Checkpoint {path} ignoré : configuration différente")
+        return None
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LDA en ligne (partial_fit) sur minibatchs de paragraphes")
+    parser.add_argument("--source", nargs="+", default=[DEFAULT_SOURCE], help="Fichiers JSON de discours")
+    parser.add_argument("--topics", type=int, default=15)
+    parser.add_argument("--batch-size", type=int, default=2000, help="Paragraphes par minibatch")
+    parser.add_argument("--passes", type=int, default=1, help="Passages sur le corpus")
+    parser.add_argument("--vectorizer", choices=["vocabulary", "hashing"], default="vocabulary",
+                        help="Vocabulaire appris en streaming ou HashingVectorizer sans état")
+    parser.add_argument("--n-features", type=int, default=2**18, help="Colonnes du HashingVectorizer")
+    parser.add_argument("--checkpoint-every", type=int, default=10, help="Sauvegarde tous les N batchs")
+    parser.add_argument("--checkpoint-dir", default=CHECKPOINT_DIR)
+    parser.add_argument("--resume", action="store_true", help="Reprendre depuis le dernier checkpoint")
+    parser.add_argument("--output", default=None, help="TSV de résultats")
+    args = parser.parse_args()
+
+    sources = sorted(args.source)
+    config = {
+        'sources': [os.path.abspath(s) for s in sources],
+        'n_topics': args.topics,
+        'batch_size': args.batch_size,
+        'passes': args.passes,
+        'vectorizer': args.vectorizer,
+        'n_features': args.n_features if args.vectorizer == "hashing" else None,
+    }
+    path = checkpoint_path(args.topics, args.checkpoint_dir)
+    state = load_checkpoint(path, config) if args.resume else None
+
+    metrics = StageMetrics()
+    metrics.begin('vocabulary')
+    print("=== LDA en ligne (partial_fit) ===\n")
+    if state is not None:
+        vectorizer, names, n_docs = state['vectorizer'], state['names'], state['n_docs']
+        lda, batches_done = state['lda'], state['batches_done']
+        print(f"Reprise depuis {path} : {batches_done} batchs déjà appris")
+    else:
+        if args.vectorizer == "hashing":
+            names = HashedFeatureNames(args.n_features)
+            vectorizer = names.vectorizer
+            n_docs = sum(1 for _ in iter_paragraphs(sources))
+        else:
+            vocabulary, n_docs = fit_vocabulary(sources, **VECTORIZER_PARAMS)
+            vectorizer = CountVectorizer(vocabulary=vocabulary)
+            names = None
+            print(f"Vocabulaire : {len(vocabulary)} mots")
+        lda = LatentDirichletAllocation(n_components=args.topics, random_state=42,
+                                        learning_method='online', total_samples=n_docs)
+        batches_done = 0
+    n_batches = -(-n_docs // args.batch_size)
+    print(f"Nombre de paragraphes : {n_docs} ({n_batches} batchs de {args.batch_size} par passage)\n")
+
+    metrics.begin('fit')
+    batch_index = 0
+    for epoch in range(args.passes):
+        for batch in iter_batches(iter_paragraphs(sources), args.batch_size):
+            batch_index += 1
+            if batch_index <= batches_done:
+                continue  # déjà appris avant l'interruption
+            if names is None:
+                lda.partial_fit(vectorizer.transform(batch))
+            else:
+                lda.partial_fit(names.transform(batch, update=True))
+            batches_done = batch_index
+            if batches_done % args.checkpoint_every == 0:
+                save_checkpoint(path, {'config': config, 'vectorizer': vectorizer, 'names': names,
+                                       'n_docs': n_docs, 'lda': lda, 'batches_done': batches_done})
+                print(f"  Passage {epoch + 1}, batch {batches_done}/{n_batches * args.passes} "
+                      f"(checkpoint)")
+    save_checkpoint(path, {'config': config, 'vectorizer': vectorizer, 'names': names,
+                           'n_docs': n_docs, 'lda': lda, 'batches_done': batches_done})
+
+    metrics.begin('report')
+    # Topic dominant de chaque paragraphe, batch par batch
+    topic_counts = np.zeros(args.topics, dtype=np.int64)
+    for batch in iter_batches(iter_paragraphs(sources), args.batch_size):
+        X = vectorizer.transform(batch) if names is None else names.transform(batch)
+        theta = lda.transform(X)
+        topic_counts += np.bincount(theta.argmax(axis=1), minlength=args.topics)
+
+    vocab = vectorizer.get_feature_names_out() if names is None else None
+    topics_data = []
+    print("\n=== LDA Topics ===")
+    for topic_idx, topic in enumerate(lda.components_):
+        top_indices = topic.argsort()[-10:][::-1]
+        top_words = [vocab[i] if names is None else names.name(i) for i in top_indices]
+        topic_str = ' | '.join(top_words)
+        topics_data.append({'topic_id': topic_idx + 1, 'top_words': topic_str,
+                            'nb_paragraphs': int(topic_counts[topic_idx])})
+        print(f"Thème {topic_idx+1} ({topic_counts[topic_idx]} paragraphes) : {topic_str}")
+
+    if names is None:
+        artifact_dir = save_lda(f"lda_online_{args.topics}topics", vectorizer, lda,
+                                params={'source': sources, 'nb_paragraphs': n_docs,
+                                        'batch_size': args.batch_size, 'passes': args.passes})
+        print(f"✓ Modèle sauvegardé dans {artifact_dir}")
+
+    metrics.stop()
+    totals = metrics.totals()
+
+    tsv_filename = args.output or f"lda_online_{args.topics}topics_results.tsv"
+    with open(tsv_filename, 'w', encoding='utf-8') as f:
+        f.write("Metric\tValue\n")
+        f.write("Method\tLDA_online\n")
+        f.write(f"Vectorizer\t{args.vectorizer}\n")
+        f.write(f"Nb_Paragraphs\t{n_docs}\n")
+        f.write(f"Nb_Topics\t{args.topics}\n")
+        f.write(f"Batch_Size\t{args.batch_size}\n")
+        f.write(f"Nb_Batches\t{batches_done}\n")
+        metrics.write_tsv(f)
+        f.write("\n")
+
+        f.write("Topic_ID\tNb_Paragraphs\tTop_Words\n")
+        for topic_info in topics_data:
+            f.write(f"{topic_info['topic_id']}\t{topic_info['nb_paragraphs']}\t{topic_info['top_words']}\n")
+
+    print(f"\n✓ Résultats sauvegardés dans {tsv_filename}")
+    tsv_translated = tsv_filename.replace('.tsv', '_translated.tsv')
+    unresolved = annotate_tsv(tsv_filename, tsv_translated, translator=make_translator())
+    if unresolved:
+        print(f"  {unresolved} mots sans traduction (mode hors ligne ou erreur réseau)")
+    print(f"✓ Traductions sauvegardées dans {tsv_translated}")
+    print(f"✓ Temps d'exécution : {totals['wall_seconds']:.2f}s | Pic RSS : {totals['peak_rss_mb']:.1f} Mo")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Balayage du nombre de topics LDA pour la sélection de modèle
+Un entraînement par valeur de n_topics, en parallèle dans un pool de
+processus ; chaque worker ouvre la même matrice document-terme en cache
+en mmap (rien n'est picklé vers les workers). Perplexité sur des
+paragraphes tenus à l'écart, cohérences UMass et NPMI, et un rapport TSV unique
+
+Usage :
+    python lda_sweep.py --topics 5 10 15 20 25 30 --workers 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from threadpoolctl import threadpool_limits
+
+from coherence import top_word_ids, topic_coherence
+from corpus_cache import DEFAULT_SOURCE, dtm_cache_dir, load_dtm, row_slice
+from hashing_vectorize import hashed_dtm_cache_dir
+
+
+def split_documents(X, holdout=0.1):
+    """(entraînement, tenus à l'écart) : les premières lignes et les `holdout` dernières
+
+    Deux blocs contigus, donc des vues sur la matrice en mmap : aucun worker
+    ne recopie le corpus (un tirage aléatoire X[indices] le recopierait).
+    Les paragraphes tenus à l'écart sont ceux de la fin du corpus.
+    """
+    n_train = X.shape[0] - int(X.shape[0] * holdout)
+    return row_slice(X, 0, n_train), row_slice(X, n_train, X.shape[0])
+
+
+def fit_one(cache, n_topics, max_iter=20, holdout=0.1, seed=42, topn=10, n_threads=1):
+    """Entraîne une LDA à `n_topics` topics et la note ; exécuté dans un worker"""
+    from sklearn.decomposition import LatentDirichletAllocation
+    X, vocab = load_dtm(cache, mmap_mode='r')
+    train, test = split_documents(X, holdout)
+
+    with threadpool_limits(limits=n_threads):
+        start = time.time()
+        lda = LatentDirichletAllocation(n_components=n_topics, random_state=seed, max_iter=max_iter)
+        lda.fit(train)
+        fit_seconds = time.time() - start
+        heldout_perplexity = lda.perplexity(test) if test.shape[0] else float('nan')
+        top_ids = top_word_ids(lda.components_, topn)
+        coherence = topic_coherence(X, top_ids)
+
+    return {
+        'n_topics': n_topics,
+        'fit_seconds': fit_seconds,
+        'perplexity_heldout': float(heldout_perplexity),
+        'coherence_umass': float(np.mean(coherence['umass'])),
+        'coherence_umass_min': float(np.min(coherence['umass'])),
+        'coherence_npmi': float(np.mean(coherence['npmi'])),
+        'topics': [[vocab[i] for i in words] for words in top_ids],
+        'topic_coherence': [(float(u), float(n)) for u, n in zip(coherence['umass'], coherence['npmi'])],
+    }
+
+
+def select(results):
+    """Meilleur run : NPMI moyenne la plus haute, puis perplexité la plus basse"""
+    return max(results, key=lambda r: (round(r['coherence_npmi'], 4), -r['perplexity_heldout']))
+
+
+def write_report(results, best, path, meta):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("Metric\tValue\n")
+        f.write("Method\tLDA_sweep\n")
+        for key, value in meta.items():
+            f.write(f"{key}\t{value}\n")
+        f.write(f"Selected_Nb_Topics\t{best['n_topics']}\n")
+        f.write("\n")
+
+        f.write("Nb_Topics\tFit_Time_Sec\tPerplexity_Heldout\tCoherence_UMass\tCoherence_UMass_Min\t"
+                "Coherence_NPMI\n")
+        for r in results:
+            f.write(f"{r['n_topics']}\t{r['fit_seconds']:.2f}\t{r['perplexity_heldout']:.2f}\t"
+                    f"{r['coherence_umass']:.4f}\t{r['coherence_umass_min']:.4f}\t{r['coherence_npmi']:.4f}\n")
+        f.write("\n")
+
+        f.write("Topic_ID\tCoherence_UMass\tCoherence_NPMI\tTop_Words\n")
+        for topic_id, (words, (umass, npmi)) in enumerate(zip(best['topics'], best['topic_coherence']), 1):
+            f.write(f"{topic_id}\t{umass:.4f}\t{npmi:.4f}\t{' | '.join(words)}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Balayage de n_topics pour la LDA sklearn")
+    parser.add_argument("--source", nargs="+", default=[DEFAULT_SOURCE], help="Fichiers JSON de discours")
+    parser.add_argument("--topics", nargs="+", type=int, default=[5, 10, 15, 20, 25, 30])
+    parser.add_argument("--max-iter", type=int, default=20, help="Itérations EM (comme analyse_lda_15topics.py)")
+    parser.add_argument("--holdout", type=float, default=0.1,
+                        help="Part des paragraphes (les derniers du corpus) réservée à la perplexité")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Processus parallèles (0 = un par cœur, au plus un par valeur)")
+    parser.add_argument("--output", default="lda_sweep_results.tsv")
+    parser.add_argument("--hashing", action="store_true",
+                        help="Vectorisation parallèle par hachage (voir hashing_vectorize.py)")
+    args = parser.parse_args()
+
+    cache = hashed_dtm_cache_dir(args.source) if args.hashing else dtm_cache_dir(args.source)
+    X, _ = load_dtm(cache, mmap_mode='r')
+    print(f"Matrice document-terme : {X.shape[0]} paragraphes x {X.shape[1]} mots ({cache})")
+
+    topics = sorted(set(args.topics))
+    workers = max(1, min(args.workers or os.cpu_count() or 1, len(topics)))
+    n_threads = max(1, (os.cpu_count() or 1) // workers)
+    print(f"{len(topics)} modèles, {workers} processus x {n_threads} thread(s)\n")
+
+    start = time.time()
+    results = []
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        # Les plus gros modèles d'abord : ce sont les plus longs à entraîner
+        futures = [pool.submit(fit_one, cache, n_topics, args.max_iter, args.holdout, 42, 10, n_threads)
+                   for n_topics in sorted(topics, reverse=True)]
+        for future in as_completed(futures):
+            r = future.result()
+            print(f"  k={r['n_topics']:3d} : {r['fit_seconds']:7.2f}s | "
+                  f"perplexité {r['perplexity_heldout']:9.2f} | UMass {r['coherence_umass']:.3f} | "
+                  f"NPMI {r['coherence_npmi']:.3f}")
+            results.append(r)
+    wall = time.time() - start
+
+    results.sort(key=lambda r: r['n_topics'])
+    best = select(results)
+    meta = {
+        'Nb_Paragraphs': X.shape[0],
+        'Vocabulary_Size': X.shape[1],
+        'Holdout': args.holdout,
+        'Max_Iter': args.max_iter,
+        'Wall_Time_Sec': f"{wall:.2f}",
+    }
+    write_report(results, best, args.output, meta)
+    print(f"\n✓ Nombre de topics retenu : {best['n_topics']} (NPMI {best['coherence_npmi']:.3f})")
+    print(f"✓ Rapport sauvegardé dans {args.output} ({wall:.1f}s, "
+          f"somme séquentielle {sum(r['fit_seconds'] for r in results):.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
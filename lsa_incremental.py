@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+LSA incrémentale sur un modèle sauvegardé (topic_artifacts.py)
+Les nouveaux paragraphes sont projetés (fold-in) dans la base SVD stockée
+et affectés au centroïde k-means le plus proche, en O(nouveaux documents).
+La dérive est mesurée par la part de l'énergie TF-IDF des nouveaux
+paragraphes hors du sous-espace ; au-delà d'un seuil, --update met à jour
+la SVD à partir de [S Vt ; A_nouveaux] et les centroïdes, et enregistre une
+nouvelle version du modèle. Le vocabulaire et l'idf restent ceux du modèle
+d'origine (les mots nouveaux sont ignorés)
+
+Usage :
+    python lsa_incremental.py lsa_cpu_15topics president_texts_Yun_Bo_Seon.json
+    python lsa_incremental.py lsa_cpu_15topics nouveaux_discours.json --update --drift-threshold 0.05
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from cluster_summary import indicator_matrix
+from topic_artifacts import ARTIFACT_DIR, load_artifact, save_artifact
+
+
+def fold_in(X, components):
+    """Coordonnées X Vt^T des lignes TF-IDF dans la base SVD"""
+    return np.asarray(X @ np.asarray(components).T)
+
+
+def residuals(X, projected):
+    """Part de l'énergie de chaque ligne hors du sous-espace (NaN pour une ligne vide)"""
+    energy = np.asarray(X.multiply(X).sum(axis=1)).ravel()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(energy > 0, 1 - np.square(projected).sum(axis=1) / energy, np.nan)
+
+
+def baseline_residual(singular_values, n_docs):
+    """Résidu moyen du corpus d'entraînement : lignes de norme 1, énergie captée = somme des S²"""
+    return 1 - float(np.square(singular_values).sum()) / n_docs
+
+
+def normalize_rows(embedding):
+    norms = np.linalg.norm(embedding, axis=1, keepdims=True)
+    return embedding / np.where(norms > 0, norms, 1)
+
+
+def nearest_centroid(embedding, centroids):
+    distances = (np.square(embedding).sum(axis=1)[:, np.newaxis]
+                 - 2 * embedding @ centroids.T + np.square(centroids).sum(axis=1))
+    labels = distances.argmin(axis=1)
+    return labels, np.sqrt(np.maximum(distances[np.arange(len(labels)), labels], 0))
+
+
+def svd_update(components, singular_values, X_new, chunk_size=2000):
+    """Base SVD de rang k mise à jour avec de nouvelles lignes
+
+    SVD de la petite matrice empilée [diag(S) Vt ; A_nouveaux], par tranches
+    de `chunk_size` lignes, tronquée au rang k après chaque tranche.
+    Les signes des nouvelles composantes sont alignés sur les anciennes.
+    """
+    k = len(singular_values)
+    Vt, S = np.asarray(components), np.asarray(singular_values)
+    old_Vt = Vt
+    for start in range(0, X_new.shape[0], chunk_size):
+        stacked = np.vstack([S[:, np.newaxis] * Vt, X_new[start:start + chunk_size].toarray()])
+        _, S, Vt = np.linalg.svd(stacked, full_matrices=False)
+        S, Vt = S[:k], Vt[:k]
+    signs = np.sign(np.einsum('ij,ij->i', Vt, old_Vt))
+    return Vt * np.where(signs == 0, 1, signs)[:, np.newaxis], S
+
+
+def update_centroids(centroids, sizes, embedding, labels):
+    """Moyennes courantes : chaque centroïde absorbe les nouveaux paragraphes qui lui sont affectés"""
+    n_clusters = len(centroids)
+    new_sizes = np.bincount(labels, minlength=n_clusters)
+    sums = indicator_matrix(labels, n_clusters) @ embedding
+    total = sizes + new_sizes
+    updated = (centroids * sizes[:, np.newaxis] + sums) / np.maximum(total, 1)[:, np.newaxis]
+    return np.where(total[:, np.newaxis] > 0, updated, centroids), total
+
+
+def stored_cluster_sizes(artifact):
+    """Paragraphes par cluster du modèle
+
+    Les modèles sauvegardés sans `cluster_sizes` répartissent nb_paragraphs
+    également entre les clusters non vides de l'entraînement (ceux du
+    manifeste) ; None si nb_paragraphs est inconnu.
+    """
+    sizes = artifact.arrays.get('cluster_sizes')
+    if sizes is not None:
+        return np.asarray(sizes, dtype=np.float64)
+    n_train = artifact.manifest['params'].get('nb_paragraphs')
+    trained = [topic['topic_id'] - 1 for topic in artifact.topics]
+    if not n_train or not trained:
+        return None
+    sizes = np.zeros(len(artifact.arrays['centroids']))
+    sizes[trained] = n_train / len(trained)
+    return sizes
+
+
+def load_new_paragraphs(paths):
+    rows = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for speech in json.load(f):
+                for idx, paragraph in enumerate(speech["paragraphs"]):
+                    rows.append((speech, idx, paragraph))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Projection de nouveaux discours dans un modèle LSA")
+    parser.add_argument("model", help="Modèle LSA sauvegardé (ex. lsa_cpu_15topics)")
+    parser.add_argument("speeches", nargs="+", help="Fichiers JSON de nouveaux discours")
+    parser.add_argument("--root", default=ARTIFACT_DIR, help="Répertoire des modèles")
+    parser.add_argument("--version", type=int, help="Version du modèle (défaut : la plus récente)")
+    parser.add_argument("--drift-threshold", type=float, default=0.05,
+                        help="Écart de résidu moyen au corpus d'entraînement déclenchant la mise à jour")
+    parser.add_argument("--update", action="store_true",
+                        help="Mettre à jour SVD et centroïdes si la dérive dépasse le seuil")
+    parser.add_argument("--force", action="store_true", help="Mettre à jour quelle que soit la dérive")
+    parser.add_argument("--output", help="Fichier JSON des affectations")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    artifact = load_artifact(args.model, args.version, args.root)
+    if artifact.kind != 'lsa':
+        parser.error(f"{args.model} n'est pas un modèle LSA ({artifact.kind})")
+    rows = load_new_paragraphs(args.speeches)
+
+    X = artifact.tfidf([paragraph for _, _, paragraph in rows])
+    components = np.asarray(artifact.arrays['components'])
+    centroids = np.asarray(artifact.arrays['centroids'])
+    projected = fold_in(X, components)
+    labels, distances = nearest_centroid(normalize_rows(projected), centroids)
+    elapsed = time.perf_counter() - start
+
+    n_train = artifact.manifest['params'].get('nb_paragraphs')
+    residual = float(np.nanmean(residuals(X, projected))) if len(rows) else float('nan')
+    baseline = baseline_residual(artifact.arrays['singular_values'], n_train) if n_train else 0.0
+    drift = residual - baseline
+    print(f"✓ {len(rows)} paragraphes projetés sur {artifact.manifest['name']} "
+          f"v{artifact.manifest['version']} en {elapsed * 1000:.1f} ms")
+    print(f"Résidu moyen hors sous-espace : {residual:.3f} (entraînement : {baseline:.3f}, "
+          f"dérive : {drift:+.3f}, seuil : {args.drift_threshold})")
+    sizes = np.bincount(labels, minlength=len(centroids))
+    for cluster_id in np.flatnonzero(sizes):
+        print(f"  Thème {cluster_id + 1} : {sizes[cluster_id]} paragraphes")
+
+    old_sizes = stored_cluster_sizes(artifact)
+    if (args.update or args.force) and old_sizes is None:
+        parser.error(f"{args.model} v{artifact.manifest['version']} : ni cluster_sizes ni nb_paragraphs, "
+                     "mise à jour des centroïdes impossible (réentraîner avec analyse_lsa_*.py)")
+    if args.force or (args.update and drift > args.drift_threshold):
+        if 'cluster_sizes' not in artifact.arrays:
+            print("⚠️  Modèle sans cluster_sizes : nb_paragraphs réparti également entre les clusters")
+        print("\nMise à jour de la base SVD et des centroïdes...")
+        new_components, new_singular_values = svd_update(components, artifact.arrays['singular_values'], X)
+        # Centroïdes exprimés dans la nouvelle base, puis ré-affectation des nouveaux paragraphes
+        rotation = components @ new_components.T
+        new_centroids = centroids @ rotation
+        embedding = normalize_rows(fold_in(X, new_components))
+        labels, distances = nearest_centroid(embedding, new_centroids)
+        new_centroids, new_sizes = update_centroids(new_centroids, old_sizes, embedding, labels)
+
+        params = {**artifact.manifest['params'],
+                  'nb_paragraphs': (n_train or 0) + len(rows),
+                  'updated_from': artifact.manifest['version'],
+                  'update_sources': args.speeches,
+                  'drift': drift}
+        arrays = {key: np.asarray(value) for key, value in artifact.arrays.items()}
+        arrays.update({'components': new_components, 'singular_values': new_singular_values,
+                       'centroids': new_centroids, 'cluster_sizes': new_sizes})
+        directory = save_artifact(artifact.manifest['name'], 'lsa', artifact.vocabulary, arrays,
+                                  artifact.topics, params, args.root)
+        print(f"✓ Nouvelle version sauvegardée dans {directory} "
+              f"(alignement avec l'ancienne base : {np.abs(np.diag(rotation)).mean():.3f})")
+    elif args.update:
+        print("Dérive sous le seuil : modèle inchangé")
+
+    if args.output:
+        results = [{'url': speech.get('url'), 'title': speech.get('title'), 'date': speech.get('date'),
+                    'paragraph': idx, 'topic_id': int(label) + 1, 'distance': float(distance)}
+                   for (speech, idx, _), label, distance in zip(rows, labels, distances)]
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"✓ Affectations sauvegardées dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
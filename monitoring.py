@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Monitoring des ressources en arrière-plan
+CPU, mémoire (RSS), utilisation par cœur et GPU/puissance (nvidia-smi)
+échantillonnés à intervalle fixe par un thread dédié, par phase nommée,
+et mesures par étape (temps, temps CPU, pic mémoire, threads) des benchmarks
+"""
+
+import json
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import psutil
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def get_gpu_stats():
+    """Récupère les stats GPU via nvidia-smi"""
+    try:
+        result = subprocess.run(
+            ['nvidia-smi', '--query-gpu=utilization.gpu,memory.used,power.draw',
+             '--format=csv,noheader,nounits'],
+            capture_output=True, text=True, timeout=2
+        )
+        if result.returncode == 0:
+            gpu_util, mem_used, power = result.stdout.strip().split('\n')[0].split(',')
+            return {
+                'gpu_utilization': float(gpu_util),
+                'memory_used_mb': float(mem_used),
+                'power_watts': float(power)
+            }
+    except (OSError, ValueError, subprocess.SubprocessError):
+        pass
+    return {'gpu_utilization': 0, 'memory_used_mb': 0, 'power_watts': 0}
+
+
+class ResourceSampler(threading.Thread):
+    """Thread d'échantillonnage : la boucle mesurée n'a qu'à déclarer sa phase
+
+    Usage :
+        with ResourceSampler(interval=0.5) as sampler:
+            with sampler.phase('Lee_Seung_Man/Komoran'):
+                ...  # travail mesuré
+            stats = sampler.summary('Lee_Seung_Man/Komoran')
+    """
+
+    def __init__(self, interval=0.5, gpu=True):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.process = psutil.Process()
+        self.gpu = gpu and shutil.which('nvidia-smi') is not None
+        self.samples = []
+        self.current_phase = None
+        self._stop_event = threading.Event()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def run(self):
+        # Premier appel non bloquant : sert de référence aux mesures suivantes
+        self.process.cpu_percent(None)
+        psutil.cpu_percent(None, percpu=True)
+        while not self._stop_event.wait(self.interval):
+            self.samples.append(self._sample())
+
+    def _sample(self):
+        sample = {
+            'time': time.time(),
+            'phase': self.current_phase,
+            'cpu_percent': self.process.cpu_percent(None),
+            'rss_mb': self.process.memory_info().rss / 1024**2,
+            'num_threads': self.process.num_threads(),
+            'per_core_percent': psutil.cpu_percent(None, percpu=True),
+        }
+        if self.gpu:
+            sample.update(get_gpu_stats())
+        return sample
+
+    def stop(self):
+        self._stop_event.set()
+        if self.is_alive():
+            self.join()
+
+    @contextmanager
+    def phase(self, name):
+        """Rattache les échantillons pris pendant le bloc à la phase `name`"""
+        previous = self.current_phase
+        self.current_phase = name
+        try:
+            yield
+        finally:
+            self.current_phase = previous
+
+    def phase_samples(self, name):
+        return [s for s in self.samples if s['phase'] == name]
+
+    def summary(self, name):
+        """Moyennes et pics des échantillons d'une phase (zéros si la phase était trop courte)"""
+        samples = self.phase_samples(name)
+        n = len(samples)
+
+        def mean(key):
+            return sum(s.get(key, 0) for s in samples) / n if n else 0
+
+        n_cores = len(samples[0]['per_core_percent']) if samples else 0
+        return {
+            'n_samples': n,
+            'avg_cpu_percent': mean('cpu_percent'),
+            'peak_rss_mb': max((s['rss_mb'] for s in samples), default=0),
+            'max_threads': max((s['num_threads'] for s in samples), default=0),
+            'avg_per_core_percent': [
+                sum(s['per_core_percent'][i] for s in samples) / n for i in range(n_cores)
+            ],
+            'avg_gpu_percent': mean('gpu_utilization'),
+            'avg_power_watts': mean('power_watts'),
+        }
+
+    def save(self, path):
+        """Sauvegarde la série temporelle complète en JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'interval_seconds': self.interval, 'samples': self.samples},
+                      f, ensure_ascii=False, indent=2)
+
+
+def max_rss_mb():
+    """Pic de RSS du processus depuis son démarrage (getrusage), en Mo"""
+    if resource is None:
+        return psutil.Process().memory_info().rss / 1024**2
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss est en octets sous macOS, en kilo-octets sous Linux
+    return max_rss / 1024**2 if sys.platform == 'darwin' else max_rss / 1024
+
+
+class StageMetrics:
+    """Mesures par étape (load, vectorize, fit, report...) d'un script de benchmark
+
+    Pour chaque étape : temps réel, temps CPU du processus (user+sys, tous
+    threads), pic de RSS et nombre maximal de threads. Les pics sont lus par
+    un ResourceSampler d'arrière-plan, complétés par getrusage et, si
+    `trace_python_memory` est activé, par tracemalloc (coûteux : ralentit
+    les allocations Python, donc désactivé par défaut).
+
+    Usage :
+        metrics = StageMetrics()
+        metrics.begin('load')
+        ...
+        metrics.begin('vectorize')   # termine 'load'
+        ...
+        metrics.stop()
+        metrics.write_tsv(f)
+    """
+
+    def __init__(self, sample_interval=0.1, trace_python_memory=False):
+        self.process = psutil.Process()
+        self.sampler = ResourceSampler(interval=sample_interval)
+        self.trace_python_memory = trace_python_memory
+        self.stages = {}
+        self._current = None
+        self._phase = None
+
+    def begin(self, name):
+        """Termine l'étape en cours et démarre l'étape `name`"""
+        self.end()
+        if not self.sampler.is_alive():
+            self.sampler.start()
+        if self.trace_python_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        cpu = self.process.cpu_times()
+        self._current = {
+            'name': name,
+            'wall_start': time.perf_counter(),
+            'cpu_start': cpu.user + cpu.system,
+            'threads_start': self.process.num_threads(),
+        }
+        self._phase = self.sampler.phase(name)
+        self._phase.__enter__()
+
+    def end(self):
+        """Termine l'étape en cours (sans effet s'il n'y en a pas)"""
+        if self._current is None:
+            return
+        wall = time.perf_counter() - self._current['wall_start']
+        cpu = self.process.cpu_times()
+        cpu_seconds = cpu.user + cpu.system - self._current['cpu_start']
+        self._phase.__exit__(None, None, None)
+        summary = self.sampler.summary(self._current['name'])
+        rss_mb = self.process.memory_info().rss / 1024**2
+        stage = {
+            'wall_seconds': wall,
+            'cpu_seconds': cpu_seconds,
+            'cpu_percent': 100 * cpu_seconds / wall if wall > 0 else 0,
+            'peak_rss_mb': max(summary['peak_rss_mb'], rss_mb),
+            'max_threads': max(summary['max_threads'], self._current['threads_start'],
+                               self.process.num_threads()),
+            'avg_gpu_percent': summary['avg_gpu_percent'],
+            'avg_power_watts': summary['avg_power_watts'],
+        }
+        if self.trace_python_memory:
+            stage['python_peak_mb'] = tracemalloc.get_traced_memory()[1] / 1024**2
+        self.stages[self._current['name']] = stage
+        self._current = None
+
+    def stop(self):
+        """Termine l'étape en cours et arrête l'échantillonnage"""
+        self.end()
+        self.sampler.stop()
+
+    def totals(self):
+        """Agrégats sur toutes les étapes"""
+        wall = sum(s['wall_seconds'] for s in self.stages.values())
+        cpu_seconds = sum(s['cpu_seconds'] for s in self.stages.values())
+        samples = [s for s in self.sampler.samples if s['phase'] in self.stages]
+        n = len(samples)
+        return {
+            'wall_seconds': wall,
+            'cpu_seconds': cpu_seconds,
+            'cpu_percent': 100 * cpu_seconds / wall if wall > 0 else 0,
+            'peak_rss_mb': max_rss_mb(),
+            'memory_peak_percent': 100 * max_rss_mb() * 1024**2 / psutil.virtual_memory().total,
+            'max_threads': max((s['max_threads'] for s in self.stages.values()), default=0),
+            'avg_gpu_percent': sum(s.get('gpu_utilization', 0) for s in samples) / n if n else 0,
+            'avg_power_watts': sum(s.get('power_watts', 0) for s in samples) / n if n else 0,
+        }
+
+    def write_tsv(self, f):
+        """Écrit les métriques globales et par étape dans le bloc Metric/Value d'un TSV"""
+        totals = self.totals()
+        f.write(f"Execution_Time_Sec\t{totals['wall_seconds']:.2f}\n")
+        f.write(f"CPU_Time_Sec\t{totals['cpu_seconds']:.2f}\n")
+        f.write(f"CPU_Usage_Percent\t{totals['cpu_percent']:.2f}\n")
+        f.write(f"Memory_Usage_Percent\t{totals['memory_peak_percent']:.2f}\n")
+        f.write(f"Peak_RSS_MB\t{totals['peak_rss_mb']:.1f}\n")
+        f.write(f"Max_Threads\t{totals['max_threads']}\n")
+        f.write(f"GPU_Usage_Percent\t{totals['avg_gpu_percent']:.2f}\n")
+        f.write(f"GPU_Power_Watts\t{totals['avg_power_watts']:.2f}\n")
+        for name, stage in self.stages.items():
+            prefix = f"Stage_{name}"
+            f.write(f"{prefix}_Wall_Sec\t{stage['wall_seconds']:.2f}\n")
+            f.write(f"{prefix}_CPU_Sec\t{stage['cpu_seconds']:.2f}\n")
+            f.write(f"{prefix}_Peak_RSS_MB\t{stage['peak_rss_mb']:.1f}\n")
+            f.write(f"{prefix}_Threads\t{stage['max_threads']}\n")
+            if 'python_peak_mb' in stage:
+                f.write(f"{prefix}_Python_Peak_MB\t{stage['python_peak_mb']:.1f}\n")
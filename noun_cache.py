@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Cache des noms extraits par discours (par analyseur et par président)
+Chaque discours est identifié par son url (ou, à défaut, par le hash de
+son texte) et accompagné du hash de son contenu : une nouvelle analyse ne
+traite que les discours nouveaux ou modifiés et réutilise les autres
+"""
+
+import hashlib
+import os
+import shutil
+
+import numpy as np
+
+from vocabulary import Vocabulary, first_seen_order
+
+NOUN_CACHE_DIR = os.path.join(".cache", "nouns")
+CHECKPOINT_DIR = os.path.join(".cache", "checkpoints")
+
+
+def speech_text(speech):
+    return " ".join(speech["paragraphs"])
+
+
+def content_hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def speech_key(speech, digest):
+    """Identifiant stable d'un discours : url, sinon hash du contenu"""
+    return speech.get("url") or digest
+
+
+def noun_cache_path(analyzer, president_id, root=NOUN_CACHE_DIR):
+    return os.path.join(root, analyzer, f"{president_id}.npz")
+
+
+def checkpoint_dir(analyzer, president_id, root=CHECKPOINT_DIR):
+    """Répertoire des checkpoints par chunk d'un couple (analyseur, président)"""
+    return os.path.join(root, analyzer, president_id)
+
+
+def chunk_path(directory, index):
+    return os.path.join(directory, f"chunk_{index:05d}.npz")
+
+
+def clear_checkpoints(directory):
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+class NounCache:
+    """Noms bruts (avant stop words) de chaque discours, encodés en ids locaux
+
+    Le fichier est autonome : `tokens` est le vocabulaire local, `ids` et
+    `offsets` donnent les noms de chaque discours (vocabulaire dans l'ordre
+    de première apparition, pour que la relecture réattribue les ids globaux
+    dans le même ordre qu'une analyse directe), `keys`/`hashes` servent
+    à détecter les discours nouveaux ou modifiés. `analysis_seconds` cumule
+    le temps d'analyse de toutes les exécutions.
+    """
+
+    def __init__(self, keys=(), hashes=(), tokens=(), ids=None, offsets=None,
+                 analysis_seconds=0.0):
+        self.keys = np.asarray(keys, dtype=str)
+        self.hashes = np.asarray(hashes, dtype=str)
+        self.tokens = np.asarray(tokens, dtype=str)
+        self.ids = np.zeros(0, dtype=np.int32) if ids is None else ids
+        self.offsets = np.zeros(1, dtype=np.int64) if offsets is None else offsets
+        self.analysis_seconds = float(analysis_seconds)
+        self._index = {key: i for i, key in enumerate(self.keys.tolist())}
+        self._mapping = (None, None)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def words(self, key, digest):
+        """Noms du discours, ou None s'il est absent ou modifié"""
+        i = self._index.get(key)
+        if i is None or self.hashes[i] != digest:
+            return None
+        return self.tokens[self.ids[self.offsets[i]:self.offsets[i + 1]]].tolist()
+
+    def encoded(self, key, digest, vocab):
+        """Ids dans `vocab` des noms du discours, ou None s'il est absent ou modifié
+
+        Les mots du cache sont ajoutés à `vocab` une seule fois, sans passer
+        par une liste de chaînes par discours.
+        """
+        i = self._index.get(key)
+        if i is None or self.hashes[i] != digest:
+            return None
+        if self._mapping[0] is not vocab:
+            self._mapping = (vocab, vocab.encode(self.tokens.tolist()))
+        return self._mapping[1][self.ids[self.offsets[i]:self.offsets[i + 1]]]
+
+    @classmethod
+    def from_ids(cls, keys, hashes, documents, tokens, analysis_seconds=0.0):
+        """Cache depuis les ids de chaque discours dans le vocabulaire `tokens`
+
+        Seuls les mots présents sont gardés, renumérotés par première apparition.
+        """
+        offsets = np.zeros(len(documents) + 1, dtype=np.int64)
+        np.cumsum([len(ids) for ids in documents], out=offsets[1:])
+        ids = np.concatenate(documents) if documents else np.zeros(0, dtype=np.int32)
+        order = first_seen_order(ids)
+        remap = np.zeros(len(tokens), dtype=np.int32)
+        remap[order] = np.arange(len(order), dtype=np.int32)
+        return cls(keys, hashes, [tokens[i] for i in order], remap[ids], offsets, analysis_seconds)
+
+    @classmethod
+    def from_words(cls, keys, hashes, documents, analysis_seconds=0.0):
+        """Cache depuis les listes de noms de chaque discours"""
+        vocab = Vocabulary()
+        encoded = [vocab.encode(words) for words in documents]
+        return cls.from_ids(keys, hashes, encoded, vocab.tokens, analysis_seconds)
+
+    def save(self, path):
+        """Écriture atomique (fichier temporaire puis renommage)"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, keys=self.keys, hashes=self.hashes, tokens=self.tokens,
+                                ids=self.ids, offsets=self.offsets,
+                                analysis_seconds=np.float64(self.analysis_seconds))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Charge un cache ; cache vide si le fichier n'existe pas"""
+        if not os.path.exists(path):
+            return cls()
+        with np.load(path) as data:
+            return cls(data["keys"], data["hashes"], data["tokens"], data["ids"],
+                       data["offsets"], data["analysis_seconds"])
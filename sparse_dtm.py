@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Matrices document-terme creuses construites sans re-tokenisation
+Sélection des colonnes équivalente à min_df / max_df / max_features de
+CountVectorizer, appliquée à une matrice CSR de comptes déjà construite
+(par exemple TokenStream.to_csr)
+"""
+
+import numpy as np
+
+
+def document_frequency(X):
+    """Nombre de documents contenant chaque mot (matrice CSR sans zéros explicites)"""
+    return np.bincount(X.indices, minlength=X.shape[1])
+
+
+def select_features(X, tokens, min_df=1, max_df=1.0, max_features=None):
+    """Filtre les colonnes de X comme CountVectorizer ; renvoie (X filtrée, mots gardés)
+
+    min_df / max_df : nombre de documents (int) ou proportion (float).
+    max_features : garde les mots de plus grande fréquence totale.
+    Les colonnes gardées sont triées par ordre alphabétique, comme le
+    vocabulaire de CountVectorizer.
+    """
+    n_docs = X.shape[0]
+    min_count = min_df if isinstance(min_df, int) else min_df * n_docs
+    max_count = max_df if isinstance(max_df, int) else max_df * n_docs
+    dfs = document_frequency(X)
+    keep = np.flatnonzero((dfs > 0) & (dfs >= min_count) & (dfs <= max_count))
+    # Ordre alphabétique d'abord : les ex aequo de max_features sont alors
+    # départagés comme dans CountVectorizer._limit_features
+    keep = np.array(sorted(keep, key=lambda i: tokens[i]), dtype=np.int64)
+    if max_features is not None and len(keep) > max_features:
+        term_freq = np.asarray(X.sum(axis=0)).ravel()
+        keep = keep[np.sort((-term_freq[keep]).argsort()[:max_features])]
+    return X[:, keep], [tokens[i] for i in keep]
@@ -1,250 +1,277 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 """
-Analyse Textométrique Complète - Lee Seung Man
-TF-IDF, LDA Topic Modeling, et Visualisations
+Analyse Textométrique Complète - Tous les présidents
+TF-IDF, LDA Topic Modeling, et Visualisations, un processus par président
+(graphiques rendus en arrière-plan depuis les JSON, voir textometry_plots.py)
 """
 
+import argparse
 import json
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('Agg')  # Backend non-interactif
-import seaborn as sns
-from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from sklearn.feature_extraction.text import TfidfTransformer
 from sklearn.decomposition import LatentDirichletAllocation, TruncatedSVD
-from konlpy.tag import Komoran
+from threadpoolctl import threadpool_limits
+from korean_analyzers import ANALYZERS, get_analyzer
+from korean_stopwords import get_filter
+from noun_cache import (NOUN_CACHE_DIR, NounCache, content_hash, noun_cache_path,
+                        speech_key, speech_text)
+from sparse_dtm import select_features
+from textometry_plots import plot_pool, submit_plots
+from vocabulary import TokenStream, Vocabulary
 import numpy as np
-import pandas as pd
-from collections import Counter
-
-# Configuration matplotlib pour le coréen
-plt.rcParams['font.family'] = 'DejaVu Sans'
-plt.rcParams['axes.unicode_minus'] = False
-
-# Stop words
-KOREAN_STOPWORDS = {
-    '이', '가', '을', '를', '은', '는', '에', '에서', '의', '와', '과', '로', '으로',
-    '도', '만', '부터', '까지', '에게', '한테', '께', '보다', '처럼', '같이',
-    '나', '너', '저', '우리', '그', '이', '저', '여기', '거기', '저기',
-    '이것', '그것', '저것', '누구', '무엇', '어디', '언제', '어떻게',
-    '하다', '되다', '있다', '없다', '이다', '아니다',
-    '지금', '오늘', '어제', '내일', '여기', '거기', '저기',
-    '그리고', '그러나', '하지만', '또', '또한', '및',
-    '일', '이', '삼', '사', '오', '육', '칠', '팔', '구', '십',
-    '등', '것', '수', '때', '년', '월', '일', '중', '간', '말', '점', '바',
-    '담화', '박사', '대통령이승만', '공보처', '공보실', '편', '집'
+
+PRESIDENT_NAMES = {
+    'Choi_Kyu_Hah': 'Choi Kyu Hah (최규하)',
+    'Chun_Doo_Hwan': 'Chun Doo Hwan (전두환)',
+    'Kim_Dae_Jung': 'Kim Dae Jung (김대중)',
+    'Kim_Young_Sam': 'Kim Young Sam (김영삼)',
+    'Lee_Myung_Bak': 'Lee Myung Bak (이명박)',
+    'Lee_Seung_Man': 'Lee Seung Man (이승만)',
+    'Moon_Jae_In': 'Moon Jae In (문재인)',
+    'Park_Chung_Hee': 'Park Chung Hee (박정희)',
+    'Park_Geun_Hye': 'Park Geun Hye (박근혜)',
+    'Roh_Moo_Hyun': 'Roh Moo Hyun (노무현)',
+    'Roh_Tae_Woo': 'Roh Tae Woo (노태우)',
+    'Yun_Bo_Seon': 'Yun Bo Seon (윤보선)',
 }
 
-print("="*80)
-print("📊 ANALYSE TEXTOMÉTRIQUE - LEE SEUNG MAN")
-print("="*80)
-
-# Charger les discours
-print("\n📂 Chargement des discours...")
-with open("president_texts_Lee_Seung_Man.json", "r", encoding="utf-8") as f:
-    speeches = json.load(f)
-
-print(f"   ✓ {len(speeches)} discours chargés\n")
-
-# Préparer les textes
-print("🔧 Préparation des textes avec Komoran...")
-komoran = Komoran()
-documents = []
-titles = []
-
-for idx, speech in enumerate(speeches, 1):  # Tous les discours
-    if idx % 100 == 0:
-        print(f"   Traitement: {idx}/{len(speeches)} discours")
-    
-    text = " ".join(speech["paragraphs"])
-    nouns = komoran.nouns(text)
-    nouns_filtered = [w for w in nouns if w not in KOREAN_STOPWORDS 
-                     and len(w) > 1 and not w.isdigit()]
-    
-    documents.append(" ".join(nouns_filtered))
-    titles.append(speech["title"][:50])
-
-print(f"   ✓ {len(documents)} documents préparés\n")
-
-# ========== 1. TF-IDF ANALYSIS ==========
-print("="*80)
-print("📈 1. ANALYSE TF-IDF")
-print("="*80)
-
-tfidf_vectorizer = TfidfVectorizer(max_features=50, min_df=2)
-tfidf_matrix = tfidf_vectorizer.fit_transform(documents)
-feature_names = tfidf_vectorizer.get_feature_names_out()
-
-# Top mots TF-IDF globaux
-tfidf_scores = np.asarray(tfidf_matrix.mean(axis=0)).flatten()
-top_indices = tfidf_scores.argsort()[-20:][::-1]
-
-print("\n🏆 TOP 20 MOTS PAR TF-IDF (Importance globale):")
-tfidf_results = []
-for idx in top_indices:
-    word = feature_names[idx]
-    score = tfidf_scores[idx]
-    print(f"  {word:15s} : {score:.4f}")
-    tfidf_results.append({'word': word, 'tfidf_score': score})
-
-# Visualisation TF-IDF
-plt.figure(figsize=(12, 6))
-words = [feature_names[i] for i in top_indices[:15]]
-scores = [tfidf_scores[i] for i in top_indices[:15]]
-plt.barh(range(len(words)), scores)
-plt.yticks(range(len(words)), words)
-plt.xlabel('TF-IDF Score')
-plt.title('Top 15 Mots par TF-IDF - Lee Seung Man')
-plt.tight_layout()
-plt.savefig('tfidf_analysis.png', dpi=150, bbox_inches='tight')
-print("\n💾 Graphique sauvegardé: tfidf_analysis.png")
-
-# ========== 2. LDA TOPIC MODELING ==========
-print("\n" + "="*80)
-print("🎯 2. LDA TOPIC MODELING")
-print("="*80)
-
-n_topics = 5
-print(f"\nNombre de topics: {n_topics}")
-
-count_vectorizer = CountVectorizer(max_features=100, min_df=2)
-count_matrix = count_vectorizer.fit_transform(documents)
-count_features = count_vectorizer.get_feature_names_out()
-
-lda_model = LatentDirichletAllocation(
-    n_components=n_topics,
-    random_state=42,
-    max_iter=20,
-    learning_method='online'
-)
-
-print("🔄 Entraînement du modèle LDA...")
-lda_model.fit(count_matrix)
-
-# Afficher les topics
-print("\n📋 TOPICS IDENTIFIÉS:\n")
-lda_topics = []
-for topic_idx, topic in enumerate(lda_model.components_):
-    top_indices = topic.argsort()[-10:][::-1]
-    top_words = [count_features[i] for i in top_indices]
-    top_scores = [topic[i] for i in top_indices]
-    
-    print(f"Topic {topic_idx + 1}:")
-    print(f"  Mots clés: {', '.join(top_words[:7])}")
-    
-    lda_topics.append({
-        'topic_id': topic_idx + 1,
-        'top_words': top_words,
-        'scores': [float(s) for s in top_scores]
-    })
-
-# Distribution des topics par document
-doc_topic_dist = lda_model.transform(count_matrix)
-
-# Visualisation des topics
-fig, axes = plt.subplots(2, 3, figsize=(15, 10))
-axes = axes.flatten()
-
-for topic_idx in range(n_topics):
-    top_indices = lda_model.components_[topic_idx].argsort()[-10:][::-1]
-    top_words = [count_features[i] for i in top_indices]
-    top_scores = [lda_model.components_[topic_idx][i] for i in top_indices]
-    
-    axes[topic_idx].barh(range(len(top_words)), top_scores)
-    axes[topic_idx].set_yticks(range(len(top_words)))
-    axes[topic_idx].set_yticklabels(top_words)
-    axes[topic_idx].set_xlabel('Importance')
-    axes[topic_idx].set_title(f'Topic {topic_idx + 1}')
-    axes[topic_idx].invert_yaxis()
-
-# Supprimer le dernier subplot vide
-fig.delaxes(axes[5])
-
-plt.tight_layout()
-plt.savefig('lda_topics.png', dpi=150, bbox_inches='tight')
-print("\n💾 Graphique sauvegardé: lda_topics.png")
-
-# ========== 3. LSA (Latent Semantic Analysis) ==========
-print("\n" + "="*80)
-print("🔬 3. LSA (LATENT SEMANTIC ANALYSIS)")
-print("="*80)
-
-n_components = 5
-lsa_model = TruncatedSVD(n_components=n_components, random_state=42)
-
-print(f"\nNombre de composantes: {n_components}")
-print("🔄 Entraînement du modèle LSA...")
-
-lsa_matrix = lsa_model.fit_transform(tfidf_matrix)
-
-# Afficher les composantes
-print("\n📋 COMPOSANTES SÉMANTIQUES:\n")
-lsa_components = []
-for idx, component in enumerate(lsa_model.components_):
-    top_indices = np.abs(component).argsort()[-10:][::-1]
-    top_words = [feature_names[i] for i in top_indices]
-    top_scores = [component[i] for i in top_indices]
-    
-    print(f"Composante {idx + 1}:")
-    print(f"  Concepts: {', '.join(top_words[:7])}")
-    
-    lsa_components.append({
-        'component_id': idx + 1,
-        'top_words': top_words,
-        'scores': [float(s) for s in top_scores]
-    })
-
-# Variance expliquée
-explained_variance = lsa_model.explained_variance_ratio_
-print(f"\n📊 Variance expliquée: {explained_variance.sum():.2%}")
-
-# Visualisation LSA
-fig, axes = plt.subplots(2, 3, figsize=(15, 10))
-axes = axes.flatten()
-
-for comp_idx in range(n_components):
-    top_indices = np.abs(lsa_model.components_[comp_idx]).argsort()[-10:][::-1]
-    top_words = [feature_names[i] for i in top_indices]
-    top_scores = [lsa_model.components_[comp_idx][i] for i in top_indices]
-    
-    axes[comp_idx].barh(range(len(top_words)), top_scores)
-    axes[comp_idx].set_yticks(range(len(top_words)))
-    axes[comp_idx].set_yticklabels(top_words)
-    axes[comp_idx].set_xlabel('Poids')
-    axes[comp_idx].set_title(f'Composante LSA {comp_idx + 1}')
-    axes[comp_idx].invert_yaxis()
-
-fig.delaxes(axes[5])
-plt.tight_layout()
-plt.savefig('lsa_components.png', dpi=150, bbox_inches='tight')
-print("\n💾 Graphique sauvegardé: lsa_components.png")
-
-# ========== SAUVEGARDER LES RÉSULTATS ==========
-results = {
-    'president': 'Lee Seung Man (이승만)',
-    'total_speeches_analyzed': len(documents),
-    'tfidf_analysis': {
-        'top_20_words': tfidf_results
-    },
-    'lda_topics': {
-        'n_topics': n_topics,
-        'topics': lda_topics
-    },
-    'lsa_analysis': {
-        'n_components': n_components,
-        'explained_variance': float(explained_variance.sum()),
-        'components': lsa_components
+
+def load_documents(president_id, speeches, analyzer_name, cache_dir, log):
+    """Noms de chaque discours : relus depuis le cache partagé, les absents sont analysés"""
+    texts = [speech_text(speech) for speech in speeches]
+    hashes = [content_hash(text) for text in texts]
+    keys = [speech_key(speech, digest) for speech, digest in zip(speeches, hashes)]
+
+    cache_path = noun_cache_path(analyzer_name, president_id, cache_dir)
+    cache = NounCache.load(cache_path)
+    documents = [cache.words(key, digest) for key, digest in zip(keys, hashes)]
+    todo = [i for i, words in enumerate(documents) if words is None]
+    log(f"   {len(speeches) - len(todo)} discours repris du cache, {len(todo)} à analyser")
+
+    if todo:
+        analyzer = get_analyzer(analyzer_name)
+        start_time = time.time()
+        for idx, (i, nouns) in enumerate(zip(todo, analyzer.iter_nouns([texts[i] for i in todo])), 1):
+            if idx % 100 == 0:
+                log(f"   Traitement: {idx}/{len(todo)} discours")
+            documents[i] = nouns
+        NounCache.from_words(keys, hashes, documents,
+                             cache.analysis_seconds + time.time() - start_time).save(cache_path)
+    return documents
+
+
+def run_textometry(president_id, analyzer_name, cache_dir=NOUN_CACHE_DIR, output_dir=".",
+                   n_threads=None):
+    """TF-IDF, LDA et LSA pour un président ; écrit textometry_<id>.json
+
+    `n_threads` limite les threads BLAS/OpenMP du processus (un par worker).
+    """
+    with threadpool_limits(limits=n_threads):
+        return _run_textometry(president_id, analyzer_name, cache_dir, output_dir)
+
+
+def _run_textometry(president_id, analyzer_name, cache_dir, output_dir):
+    start = time.time()
+    president_name = PRESIDENT_NAMES.get(president_id, president_id.replace('_', ' '))
+
+    def log(message):
+        print(f"[{president_id}] {message}", flush=True)
+
+    def output(filename):
+        return os.path.join(output_dir, filename)
+
+    # Charger les discours
+    with open(f"president_texts_{president_id}.json", "r", encoding="utf-8") as f:
+        speeches = json.load(f)
+    log(f"✓ {len(speeches)} discours chargés")
+
+    # Préparer les textes avec l'analyseur (cache de tokenisation partagé)
+    stop_filter = get_filter(president_id)
+    documents = load_documents(president_id, speeches, analyzer_name, cache_dir, log)
+
+    # Flux d'ids filtré (stop words) -> matrice de comptes CSR, sans join/re-tokenisation
+    vocab = Vocabulary()
+    stream = TokenStream()
+    for words in documents:
+        stream.append(vocab.encode(words))
+    stream = stream.filtered(stop_filter.mask(vocab.tokens))
+    counts = stream.to_csr(len(vocab))
+    log(f"✓ {len(documents)} documents préparés")
+
+    # ========== 1. TF-IDF ANALYSIS ==========
+    tfidf_counts, feature_names = select_features(counts, vocab.tokens, min_df=2, max_features=50)
+    tfidf_matrix = TfidfTransformer().fit_transform(tfidf_counts)
+
+    # Top mots TF-IDF globaux
+    tfidf_scores = np.asarray(tfidf_matrix.mean(axis=0)).flatten()
+    top_indices = tfidf_scores.argsort()[-20:][::-1]
+
+    tfidf_results = []
+    for idx in top_indices:
+        tfidf_results.append({'word': feature_names[idx], 'tfidf_score': float(tfidf_scores[idx])})
+    log("🏆 TF-IDF : " + ", ".join(r['word'] for r in tfidf_results[:10]))
+
+    # ========== 2. LDA TOPIC MODELING ==========
+    n_topics = 5
+    count_matrix, count_features = select_features(counts, vocab.tokens, min_df=2, max_features=100)
+
+    lda_model = LatentDirichletAllocation(
+        n_components=n_topics,
+        random_state=42,
+        max_iter=20,
+        learning_method='online'
+    )
+    lda_model.fit(count_matrix)
+
+    lda_topics = []
+    for topic_idx, topic in enumerate(lda_model.components_):
+        top_indices = topic.argsort()[-10:][::-1]
+        top_words = [count_features[i] for i in top_indices]
+        top_scores = [topic[i] for i in top_indices]
+        log(f"Topic {topic_idx + 1}: {', '.join(top_words[:7])}")
+        lda_topics.append({
+            'topic_id': topic_idx + 1,
+            'top_words': top_words,
+            'scores': [float(s) for s in top_scores]
+        })
+
+    # ========== 3. LSA (Latent Semantic Analysis) ==========
+    n_components = 5
+    lsa_model = TruncatedSVD(n_components=n_components, random_state=42)
+    lsa_model.fit_transform(tfidf_matrix)
+
+    lsa_components = []
+    for idx, component in enumerate(lsa_model.components_):
+        top_indices = np.abs(component).argsort()[-10:][::-1]
+        top_words = [feature_names[i] for i in top_indices]
+        top_scores = [component[i] for i in top_indices]
+        lsa_components.append({
+            'component_id': idx + 1,
+            'top_words': top_words,
+            'scores': [float(s) for s in top_scores]
+        })
+
+    # Variance expliquée
+    explained_variance = lsa_model.explained_variance_ratio_
+    log(f"📊 Variance expliquée (LSA): {explained_variance.sum():.2%}")
+
+    # ========== SAUVEGARDER LES RÉSULTATS ==========
+    results = {
+        'president': president_name,
+        'analyzer': analyzer_name,
+        'total_speeches_analyzed': len(documents),
+        'tfidf_analysis': {
+            'top_20_words': tfidf_results
+        },
+        'lda_topics': {
+            'n_topics': n_topics,
+            'topics': lda_topics
+        },
+        'lsa_analysis': {
+            'n_components': n_components,
+            'explained_variance': float(explained_variance.sum()),
+            'components': lsa_components
+        }
     }
-}
 
-with open('textometry_Lee_Seung_Man.json', 'w', encoding='utf-8') as f:
-    json.dump(results, f, ensure_ascii=False, indent=2)
-
-print("\n" + "="*80)
-print("✅ ANALYSE TEXTOMÉTRIQUE TERMINÉE")
-print("="*80)
-print("\nFichiers créés:")
-print("  📊 tfidf_analysis.png - Visualisation TF-IDF")
-print("  🎯 lda_topics.png - Topics LDA")
-print("  🔬 lsa_components.png - Composantes LSA")
-print("  📁 textometry_Lee_Seung_Man.json - Résultats complets")
+    json_file = output(f'textometry_{president_id}.json')
+    with open(json_file, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+
+    elapsed = time.time() - start
+    log(f"✅ Terminé en {elapsed:.1f}s -> {json_file}")
+    return president_id, json_file, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyse textométrique de tous les présidents")
+    parser.add_argument("--analyzer", default="Komoran", choices=sorted(ANALYZERS),
+                        help="Analyseur morphologique pour l'extraction des noms")
+    parser.add_argument("--presidents", nargs="+",
+                        help="Identifiants des présidents (défaut : liste de config.json)")
+    parser.add_argument("--config", default="config.json", help="Fichier de configuration")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Processus parallèles (0 = un par cœur, au plus un par président)")
+    parser.add_argument("--noun-cache", default=NOUN_CACHE_DIR,
+                        help="Cache des noms par discours partagé avec analyze_all_presidents.py")
+    parser.add_argument("--output-dir", default=".", help="Répertoire des résultats")
+    parser.add_argument("--no-plots", action="store_true",
+                        help="Ne pas générer les graphiques (textometry_plots.py peut les rendre plus tard)")
+    args = parser.parse_args()
+
+    presidents = args.presidents
+    if not presidents:
+        with open(args.config, "r", encoding="utf-8") as f:
+            presidents = json.load(f)["presidents"]
+
+    available = []
+    for president_id in presidents:
+        if os.path.exists(f"president_texts_{president_id}.json"):
+            available.append(president_id)
+        else:
+            print(f"⚠️  Fichier non trouvé: president_texts_{president_id}.json")
+    # Les plus gros corpus d'abord : le temps total reste proche du président le plus long
+    available.sort(key=lambda p: os.path.getsize(f"president_texts_{p}.json"), reverse=True)
+
+    workers = args.workers or min(len(available), os.cpu_count() or 1)
+    workers = max(1, min(workers, len(available)))
+    n_threads = max(1, (os.cpu_count() or 1) // workers)
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    print("="*80)
+    print("📊 ANALYSE TEXTOMÉTRIQUE - TOUS LES PRÉSIDENTS")
+    print("="*80)
+    print(f"\n{len(available)} présidents, analyseur {args.analyzer}, "
+          f"{workers} processus x {n_threads} thread(s)\n")
+
+    start = time.time()
+    durations = {}
+    plot_futures = []
+    # Graphiques rendus en arrière-plan dès qu'un JSON est écrit (hors chemin critique)
+    plots = None if args.no_plots else plot_pool()
+    # 'spawn' : chaque worker démarre sa propre JVM / ses propres threads BLAS
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = {pool.submit(run_textometry, president_id, args.analyzer, args.noun_cache,
+                               args.output_dir, n_threads): president_id
+                   for president_id in available}
+        for future in as_completed(futures):
+            try:
+                president_id, json_file, elapsed = future.result()
+                durations[president_id] = elapsed
+                if plots is not None:
+                    plot_futures.extend(submit_plots(plots, json_file, args.output_dir))
+            except Exception as e:
+                print(f"❌ Erreur pour {futures[future]}: {e}")
+    wall = time.time() - start
+
+    if plots is not None:
+        for future in as_completed(plot_futures):
+            try:
+                future.result()
+            except Exception as e:
+                print(f"⚠️  Graphique non généré: {e}")
+        plots.shutdown()
+        print(f"\n💾 {len(plot_futures)} graphiques générés "
+              f"(+{time.time() - start - wall:.1f}s après l'analyse)")
+
+    print("\n" + "="*80)
+    print("✅ ANALYSE TEXTOMÉTRIQUE TERMINÉE")
+    print("="*80)
+    for president_id, elapsed in sorted(durations.items(), key=lambda item: -item[1]):
+        print(f"  {president_id:15s} : {elapsed:7.1f}s")
+    print(f"\nTemps total: {wall:.1f}s (somme séquentielle: {sum(durations.values()):.1f}s)")
+    print("\nFichiers créés (par président):")
+    if not args.no_plots:
+        print("  📊 tfidf_analysis_<president>.png - Visualisation TF-IDF")
+        print("  🎯 lda_topics_<president>.png - Topics LDA")
+        print("  🔬 lsa_components_<president>.png - Composantes LSA")
+    print("  📁 textometry_<president>.json - Résultats complets")
+
+
+if __name__ == "__main__":
+    main()
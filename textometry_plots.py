@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Graphiques de l'analyse textométrique
+Rendu des PNG (TF-IDF, topics LDA, composantes LSA) depuis les fichiers
+textometry_<president>.json, une figure par tâche dans un pool de processus ;
+matplotlib n'est importé que dans les workers de rendu
+
+Usage :
+    python textometry_plots.py textometry_Lee_Seung_Man.json textometry_Park_Chung_Hee.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+def _pyplot():
+    import matplotlib
+    matplotlib.use('Agg')  # Backend non-interactif
+    import matplotlib.pyplot as plt
+    # Configuration matplotlib pour le coréen
+    plt.rcParams['font.family'] = 'DejaVu Sans'
+    plt.rcParams['axes.unicode_minus'] = False
+    return plt
+
+
+def president_id(json_path):
+    """textometry_<id>.json -> <id>"""
+    return os.path.splitext(os.path.basename(json_path))[0].replace('textometry_', '', 1)
+
+
+def plot_tfidf(results, short_name, output_path):
+    plt = _pyplot()
+    top = results['tfidf_analysis']['top_20_words'][:15]
+    words = [item['word'] for item in top]
+    scores = [item['tfidf_score'] for item in top]
+    plt.figure(figsize=(12, 6))
+    plt.barh(range(len(words)), scores)
+    plt.yticks(range(len(words)), words)
+    plt.xlabel('TF-IDF Score')
+    plt.title(f'Top 15 Mots par TF-IDF - {short_name}')
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=150, bbox_inches='tight')
+    plt.close()
+
+
+def _plot_grid(items, title, xlabel, output_path):
+    """Une barre horizontale par mot, un sous-graphique par topic/composante (grille 2x3)"""
+    plt = _pyplot()
+    fig, axes = plt.subplots(2, 3, figsize=(15, 10))
+    axes = axes.flatten()
+    for ax, (number, words, scores) in zip(axes, items):
+        ax.barh(range(len(words)), scores)
+        ax.set_yticks(range(len(words)))
+        ax.set_yticklabels(words)
+        ax.set_xlabel(xlabel)
+        ax.set_title(title.format(number))
+        ax.invert_yaxis()
+    # Supprimer les subplots vides
+    for ax in axes[len(items):]:
+        fig.delaxes(ax)
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=150, bbox_inches='tight')
+    plt.close(fig)
+
+
+def plot_lda(results, short_name, output_path):
+    items = [(t['topic_id'], t['top_words'], t['scores']) for t in results['lda_topics']['topics']]
+    _plot_grid(items, 'Topic {}', 'Importance', output_path)
+
+
+def plot_lsa(results, short_name, output_path):
+    items = [(c['component_id'], c['top_words'], c['scores'])
+             for c in results['lsa_analysis']['components']]
+    _plot_grid(items, 'Composante LSA {}', 'Poids', output_path)
+
+
+PLOTS = {
+    'tfidf_analysis': plot_tfidf,
+    'lda_topics': plot_lda,
+    'lsa_components': plot_lsa,
+}
+
+
+def render_figure(kind, json_path, output_dir):
+    """Rend une figure depuis un fichier de résultats ; renvoie le chemin du PNG"""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        results = json.load(f)
+    pid = president_id(json_path)
+    output_path = os.path.join(output_dir, f"{kind}_{pid}.png")
+    PLOTS[kind](results, pid.replace('_', ' '), output_path)
+    return output_path
+
+
+def plot_pool(workers=None):
+    """Pool de rendu ('spawn' : les workers n'héritent pas de l'état du processus d'analyse)"""
+    return ProcessPoolExecutor(max_workers=workers or len(PLOTS),
+                               mp_context=multiprocessing.get_context('spawn'))
+
+
+def submit_plots(pool, json_path, output_dir="."):
+    """Soumet une tâche par figure pour un fichier de résultats ; renvoie les futures"""
+    return [pool.submit(render_figure, kind, json_path, output_dir) for kind in PLOTS]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Graphiques des résultats textométriques")
+    parser.add_argument("results", nargs="+", help="Fichiers textometry_<president>.json")
+    parser.add_argument("--output-dir", default=".", help="Répertoire des PNG")
+    parser.add_argument("--workers", type=int, default=0, help="Processus de rendu (0 = un par figure)")
+    args = parser.parse_args()
+
+    with plot_pool(args.workers) as pool:
+        futures = [future for path in args.results
+                   for future in submit_plots(pool, path, args.output_dir)]
+        for future in as_completed(futures):
+            print(f"💾 Graphique sauvegardé: {future.result()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Modèles de topics persistés et scoring de nouveaux discours
+Chaque entraînement (LDA sklearn, LSA + k-means CPU/GPU) est sauvegardé
+dans models/<nom>/v<N>/ : vocabulaire et manifeste JSON, tableaux NumPy
+.npy rechargés en mmap. Les nouveaux discours sont vectorisés et affectés
+à un topic / cluster sans réentraînement ni import de sklearn
+
+Usage :
+    python topic_artifacts.py list
+    python topic_artifacts.py score lda_15topics nouveaux_discours.json
+    python topic_artifacts.py score lsa_cpu_15topics nouveaux_discours.json --paragraphs --output scores.json
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from datetime import datetime
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.special import psi
+
+ARTIFACT_DIR = "models"
+# Tokenisation par défaut de CountVectorizer / TfidfVectorizer
+TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+
+_VERSION = re.compile(r"^v(\d+)$")
+_EPS = np.finfo(np.float64).eps
+
+
+def list_versions(name, root=ARTIFACT_DIR):
+    """Versions complètes d'un modèle, croissantes"""
+    directory = os.path.join(root, name)
+    if not os.path.isdir(directory):
+        return []
+    versions = []
+    for entry in os.listdir(directory):
+        match = _VERSION.match(entry)
+        if match and os.path.exists(os.path.join(directory, entry, "manifest.json")):
+            versions.append(int(match.group(1)))
+    return sorted(versions)
+
+
+def list_artifacts(root=ARTIFACT_DIR):
+    """{nom: [versions]} pour tous les modèles sauvegardés"""
+    if not os.path.isdir(root):
+        return {}
+    return {name: list_versions(name, root) for name in sorted(os.listdir(root))
+            if list_versions(name, root)}
+
+
+def save_artifact(name, kind, vocabulary, arrays, topics, params=None, root=ARTIFACT_DIR):
+    """Écrit une nouvelle version du modèle `name` ; renvoie son répertoire
+
+    Les fichiers sont écrits dans un répertoire temporaire renommé à la fin :
+    une version visible est toujours complète.
+    """
+    versions = list_versions(name, root)
+    version = versions[-1] + 1 if versions else 1
+    directory = os.path.join(root, name, f"v{version}")
+    tmp_dir = os.path.join(root, name, f".v{version}.tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+
+    for key, array in arrays.items():
+        np.save(os.path.join(tmp_dir, f"{key}.npy"), np.ascontiguousarray(array, dtype=np.float64))
+    with open(os.path.join(tmp_dir, "vocab.json"), "w", encoding="utf-8") as f:
+        json.dump([str(token) for token in vocabulary], f, ensure_ascii=False)
+    manifest = {
+        'name': name,
+        'kind': kind,
+        'version': version,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'n_topics': len(topics),
+        'vocabulary_size': len(vocabulary),
+        'token_pattern': TOKEN_PATTERN,
+        'lowercase': True,
+        'arrays': sorted(arrays),
+        'params': params or {},
+        'topics': topics,
+    }
+    with open(os.path.join(tmp_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.rename(tmp_dir, directory)
+    return directory
+
+
+def _top_words(weights, vocabulary, topn=10):
+    return [str(vocabulary[i]) for i in np.argsort(-weights)[:topn]]
+
+
+def save_lda(name, vectorizer, lda, params=None, root=ARTIFACT_DIR, topn=10):
+    """Sauvegarde un CountVectorizer + LatentDirichletAllocation (sklearn) entraînés"""
+    vocabulary = vectorizer.get_feature_names_out()
+    topics = [{'topic_id': idx + 1, 'top_words': _top_words(topic, vocabulary, topn)}
+              for idx, topic in enumerate(lda.components_)]
+    arrays = {
+        'components': lda.components_,
+        # exp(E[log beta]) précalculé : le scoring ne refait que l'E-step
+        'exp_topic_word': lda.exp_dirichlet_component_,
+        'doc_topic_prior': np.array([lda.doc_topic_prior_]),
+    }
+    params = {'max_doc_update_iter': lda.max_doc_update_iter,
+              'mean_change_tol': lda.mean_change_tol, **(params or {})}
+    return save_artifact(name, 'lda', vocabulary, arrays, topics, params, root)
+
+
+def save_lsa(name, vectorizer, components, singular_values, centroids, topics,
+             params=None, root=ARTIFACT_DIR, cluster_sizes=None):
+    """Sauvegarde TfidfVectorizer + base SVD (lignes de Vt) + centroïdes k-means
+
+    `topics` : [{'topic_id', 'top_words'}] des clusters, tels que rapportés
+    dans le TSV du script ; `cluster_sizes` : paragraphes par cluster (pour
+    la mise à jour incrémentale des centroïdes, voir lsa_incremental.py).
+    """
+    arrays = {
+        'idf': vectorizer.idf_,
+        'components': components,
+        'singular_values': singular_values,
+        'centroids': centroids,
+    }
+    if cluster_sizes is not None:
+        arrays['cluster_sizes'] = cluster_sizes
+    return save_artifact(name, 'lsa', vectorizer.get_feature_names_out(), arrays, topics,
+                         params, root)
+
+
+def _dirichlet_expectation(alpha):
+    """E[log X] pour X ~ Dir(alpha), ligne par ligne"""
+    return psi(alpha) - psi(alpha.sum(axis=1))[:, np.newaxis]
+
+
+def lda_doc_topics(X, exp_topic_word, doc_topic_prior, max_iter=100, tol=1e-3):
+    """E-step de LatentDirichletAllocation.transform, vectorisé sur tous les documents
+
+    Même mise à jour que sklearn (initialisation à 1, arrêt par document
+    quand la variation moyenne passe sous `tol`), mais calculée pour toutes
+    les lignes de X à la fois sur les seules entrées non nulles.
+    """
+    X = csr_matrix(X, dtype=np.float64)
+    n_docs, n_topics = X.shape[0], exp_topic_word.shape[0]
+    rows = np.repeat(np.arange(n_docs), np.diff(X.indptr))
+    topic_word = np.asarray(exp_topic_word)[:, X.indices].T  # (nnz, K)
+
+    doc_topic = np.ones((n_docs, n_topics))
+    exp_doc_topic = np.exp(_dirichlet_expectation(doc_topic))
+    active = np.arange(n_docs)
+    for _ in range(max_iter):
+        norm_phi = np.einsum('ij,ij->i', exp_doc_topic[rows], topic_word) + _EPS
+        weighted = csr_matrix((X.data / norm_phi, X.indices, X.indptr), shape=X.shape)
+        update = exp_doc_topic * (weighted @ np.asarray(exp_topic_word).T) + doc_topic_prior
+        change = np.abs(update[active] - doc_topic[active]).mean(axis=1)
+        doc_topic[active] = update[active]
+        exp_doc_topic[active] = np.exp(_dirichlet_expectation(update[active]))
+        active = active[change >= tol]
+        if not len(active):
+            break
+    return doc_topic / doc_topic.sum(axis=1, keepdims=True)
+
+
+class TopicArtifact:
+    """Modèle chargé une fois ; `assign` affecte des textes à un topic / cluster"""
+
+    def __init__(self, directory, mmap_mode='r'):
+        self.directory = directory
+        with open(os.path.join(directory, "manifest.json"), "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        with open(os.path.join(directory, "vocab.json"), "r", encoding="utf-8") as f:
+            self.vocabulary = json.load(f)
+        self.token_to_id = {token: i for i, token in enumerate(self.vocabulary)}
+        self.arrays = {key: np.load(os.path.join(directory, f"{key}.npy"), mmap_mode=mmap_mode)
+                       for key in self.manifest['arrays']}
+        self._token_pattern = re.compile(self.manifest['token_pattern'])
+
+    @property
+    def kind(self):
+        return self.manifest['kind']
+
+    @property
+    def topics(self):
+        return self.manifest['topics']
+
+    def counts(self, texts):
+        """Matrice de comptes CSR (textes x vocabulaire), mots hors vocabulaire ignorés"""
+        indices, indptr = [], [0]
+        for text in texts:
+            if self.manifest['lowercase']:
+                text = text.lower()
+            ids = [self.token_to_id[token] for token in self._token_pattern.findall(text)
+                   if token in self.token_to_id]
+            indices.extend(ids)
+            indptr.append(len(indices))
+        X = csr_matrix((np.ones(len(indices)), np.array(indices, dtype=np.int64), indptr),
+                       shape=(len(texts), len(self.vocabulary)))
+        X.sum_duplicates()
+        return X
+
+    def tfidf(self, texts):
+        """Lignes TF-IDF (tf brut x idf, norme l2) comme TfidfVectorizer (modèles LSA)"""
+        X = self.counts(texts).multiply(self.arrays['idf'][np.newaxis, :]).tocsr()
+        norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1))).ravel()
+        return csr_matrix(X.multiply(1 / np.where(norms > 0, norms, 1)[:, np.newaxis]))
+
+    def transform(self, texts):
+        """Distribution des topics (LDA) ou coordonnées LSA normalisées de chaque texte"""
+        if self.kind == 'lda':
+            return lda_doc_topics(self.counts(texts), self.arrays['exp_topic_word'],
+                                  float(self.arrays['doc_topic_prior'][0]),
+                                  self.manifest['params'].get('max_doc_update_iter', 100),
+                                  self.manifest['params'].get('mean_change_tol', 1e-3))
+        # Projection X Vt^T sur la base SVD
+        projected = np.asarray(self.tfidf(texts) @ np.asarray(self.arrays['components']).T)
+        norms = np.linalg.norm(projected, axis=1, keepdims=True)
+        return projected / np.where(norms > 0, norms, 1)
+
+    def assign(self, texts):
+        """(topic_id 1..K, score) par texte
+
+        LDA : topic dominant et sa probabilité ; LSA : centroïde le plus
+        proche (comme KMeans.predict) et la distance euclidienne.
+        """
+        theta = self.transform(texts)
+        if self.kind == 'lda':
+            labels = theta.argmax(axis=1)
+            scores = theta[np.arange(len(labels)), labels]
+        else:
+            centroids = np.asarray(self.arrays['centroids'])
+            distances = (np.square(theta).sum(axis=1)[:, np.newaxis]
+                         - 2 * theta @ centroids.T + np.square(centroids).sum(axis=1))
+            labels = distances.argmin(axis=1)
+            scores = np.sqrt(np.maximum(distances[np.arange(len(labels)), labels], 0))
+        return labels + 1, scores
+
+
+def load_artifact(name, version=None, root=ARTIFACT_DIR, mmap_mode='r'):
+    """Charge une version d'un modèle (la plus récente par défaut)"""
+    versions = list_versions(name, root)
+    if not versions:
+        raise FileNotFoundError(f"Aucun modèle sauvegardé pour '{name}' dans {root}")
+    version = version or versions[-1]
+    if version not in versions:
+        raise FileNotFoundError(f"Version v{version} de '{name}' introuvable (versions : {versions})")
+    return TopicArtifact(os.path.join(root, name, f"v{version}"), mmap_mode=mmap_mode)
+
+
+def score_speeches(artifact, speeches, paragraphs=False):
+    """Une ligne de résultat par discours (ou par paragraphe avec `paragraphs`)"""
+    if paragraphs:
+        items = [(speech, idx, p) for speech in speeches for idx, p in enumerate(speech["paragraphs"])]
+    else:
+        items = [(speech, None, "\n".join(speech["paragraphs"])) for speech in speeches]
+    labels, scores = artifact.assign([text for _, _, text in items])
+    top_words = {topic['topic_id']: topic['top_words'] for topic in artifact.topics}
+
+    results = []
+    for (speech, idx, _), label, score in zip(items, labels, scores):
+        row = {'url': speech.get('url'), 'title': speech.get('title'), 'date': speech.get('date')}
+        if idx is not None:
+            row['paragraph'] = idx
+        row.update({'topic_id': int(label), 'score': float(score),
+                    'top_words': top_words.get(int(label), [])[:5]})
+        results.append(row)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Modèles de topics sauvegardés")
+    parser.add_argument("--root", default=ARTIFACT_DIR, help="Répertoire des modèles")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="Modèles et versions disponibles")
+    score = commands.add_parser("score", help="Affecte des discours aux topics d'un modèle")
+    score.add_argument("model", help="Nom du modèle (ex. lda_15topics, lsa_cpu_15topics)")
+    score.add_argument("speeches", nargs="+", help="Fichiers JSON de discours")
+    score.add_argument("--version", type=int, help="Version (défaut : la plus récente)")
+    score.add_argument("--paragraphs", action="store_true", help="Un score par paragraphe")
+    score.add_argument("--output", help="Fichier JSON des affectations")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for name, versions in list_artifacts(args.root).items():
+            manifest_path = os.path.join(args.root, name, f"v{versions[-1]}", "manifest.json")
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            print(f"{name:25s} {manifest['kind']:4s} {manifest['n_topics']:3d} topics  "
+                  f"versions : {', '.join(f'v{v}' for v in versions)} ({manifest['created']})")
+        return
+
+    start = time.perf_counter()
+    artifact = load_artifact(args.model, args.version, args.root)
+    loaded = time.perf_counter()
+    speeches = []
+    for path in args.speeches:
+        with open(path, "r", encoding="utf-8") as f:
+            speeches.extend(json.load(f))
+    read = time.perf_counter()
+    results = score_speeches(artifact, speeches, args.paragraphs)
+    scored = time.perf_counter()
+
+    for row in results[:20]:
+        where = f"§{row['paragraph']}" if 'paragraph' in row else ""
+        print(f"{row['date'] or '':10s} {where:5s} Thème {row['topic_id']:2d} ({row['score']:.3f})  "
+              f"{(row['title'] or '')[:40]} : {' | '.join(row['top_words'])}")
+    if len(results) > 20:
+        print(f"... ({len(results) - 20} autres)")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n✓ Affectations sauvegardées dans {args.output}")
+    print(f"✓ {artifact.manifest['name']} v{artifact.manifest['version']} : chargement "
+          f"{(loaded - start) * 1000:.1f} ms, scoring de {len(results)} textes "
+          f"{(scored - read) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
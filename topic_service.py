@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Service local d'affectation de topics (HTTP)
+Les modèles sauvegardés par topic_artifacts.py sont chargés une seule fois ;
+les requêtes concurrentes sont regroupées en micro-lots (une seule
+vectorisation creuse + un seul transform par lot) et les latences /
+débits sont exposés sur /metrics
+
+Usage :
+    python topic_service.py --models lda_15topics lsa_cpu_15topics --port 8765
+    curl -X POST localhost:8765/score/lda_15topics -d '{"paragraphs": ["..."]}'
+    curl localhost:8765/metrics
+"""
+
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from topic_artifacts import ARTIFACT_DIR, load_artifact
+
+DEFAULT_MODELS = ["lda_15topics", "lsa_cpu_15topics"]
+
+
+class ServiceMetrics:
+    """Compteurs et latences récentes (fenêtre glissante), protégés par un verrou"""
+
+    def __init__(self, window=2000):
+        self.started = time.time()
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.paragraphs = 0
+        self.batches = 0
+        self.latencies = deque(maxlen=window)
+        self.batch_sizes = deque(maxlen=window)
+        self.batch_seconds = deque(maxlen=window)
+
+    def record_request(self, n_paragraphs, seconds, error=False):
+        with self.lock:
+            self.requests += 1
+            self.errors += int(error)
+            self.paragraphs += n_paragraphs
+            self.latencies.append(seconds)
+
+    def record_batch(self, n_paragraphs, seconds):
+        with self.lock:
+            self.batches += 1
+            self.batch_sizes.append(n_paragraphs)
+            self.batch_seconds.append(seconds)
+
+    def snapshot(self):
+        with self.lock:
+            uptime = time.time() - self.started
+            latencies = np.array(self.latencies) * 1000
+            summary = {
+                'uptime_seconds': round(uptime, 1),
+                'requests': self.requests,
+                'errors': self.errors,
+                'paragraphs': self.paragraphs,
+                'batches': self.batches,
+                'paragraphs_per_second': round(self.paragraphs / uptime, 1) if uptime else 0.0,
+                'mean_batch_size': round(float(np.mean(self.batch_sizes)), 1) if self.batch_sizes else 0.0,
+                'mean_batch_ms': round(float(np.mean(self.batch_seconds)) * 1000, 2) if self.batch_seconds else 0.0,
+            }
+        if len(latencies):
+            for q in (50, 95, 99):
+                summary[f'latency_p{q}_ms'] = round(float(np.percentile(latencies, q)), 2)
+        return summary
+
+
+class MicroBatcher(threading.Thread):
+    """Regroupe les requêtes d'un modèle : un lot part dès `max_batch` paragraphes
+    ou après `max_wait` secondes d'attente du premier"""
+
+    def __init__(self, artifact, metrics, max_batch=512, max_wait=0.005):
+        super().__init__(daemon=True)
+        self.artifact = artifact
+        self.metrics = metrics
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.requests = queue.Queue()
+
+    def submit(self, paragraphs):
+        future = Future()
+        self.requests.put((paragraphs, future))
+        return future
+
+    def run(self):
+        while True:
+            pending = [self.requests.get()]
+            size = len(pending[0][0])
+            deadline = time.perf_counter() + self.max_wait
+            while size < self.max_batch:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self.requests.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                pending.append(item)
+                size += len(item[0])
+            self._score(pending, size)
+
+    def _score(self, pending, size):
+        start = time.perf_counter()
+        try:
+            labels, scores = self.artifact.assign([p for paragraphs, _ in pending for p in paragraphs])
+        except Exception as e:
+            for _, future in pending:
+                future.set_exception(e)
+            return
+        self.metrics.record_batch(size, time.perf_counter() - start)
+        offset = 0
+        for paragraphs, future in pending:
+            stop = offset + len(paragraphs)
+            future.set_result((labels[offset:stop], scores[offset:stop]))
+            offset = stop
+
+
+class TopicService:
+    def __init__(self, models, root=ARTIFACT_DIR, max_batch=512, max_wait=0.005):
+        self.metrics = ServiceMetrics()
+        self.batchers = {}
+        for name in models:
+            artifact = load_artifact(name, root=root)
+            batcher = MicroBatcher(artifact, self.metrics, max_batch, max_wait)
+            batcher.start()
+            self.batchers[name] = batcher
+
+    def models(self):
+        return {name: {key: batcher.artifact.manifest[key]
+                       for key in ('kind', 'version', 'created', 'n_topics', 'vocabulary_size')}
+                for name, batcher in self.batchers.items()}
+
+    def score(self, name, paragraphs, timeout=30):
+        labels, scores = self.batchers[name].submit(paragraphs).result(timeout=timeout)
+        return {'model': name,
+                'version': self.batchers[name].artifact.manifest['version'],
+                'topic_ids': [int(label) for label in labels],
+                'scores': [float(score) for score in scores]}
+
+
+class Handler(BaseHTTPRequestHandler):
+    service = None
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            self._send(200, self.service.metrics.snapshot())
+        elif self.path == "/models":
+            self._send(200, self.service.models())
+        elif self.path == "/health":
+            self._send(200, {'status': 'ok'})
+        else:
+            self._send(404, {'error': f"Chemin inconnu: {self.path}"})
+
+    def do_POST(self):
+        start = time.perf_counter()
+        name = self.path[len("/score/"):] if self.path.startswith("/score/") else None
+        if name not in self.service.batchers:
+            self._send(404, {'error': f"Modèle inconnu: {name}",
+                             'models': sorted(self.service.batchers)})
+            return
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            paragraphs = payload["paragraphs"]
+            if isinstance(paragraphs, str) or not all(isinstance(p, str) for p in paragraphs):
+                raise ValueError("'paragraphs' doit être une liste de chaînes")
+        except (ValueError, KeyError, TypeError) as e:
+            self.service.metrics.record_request(0, time.perf_counter() - start, error=True)
+            self._send(400, {'error': str(e)})
+            return
+        if not paragraphs:
+            self._send(200, {'model': name, 'topic_ids': [], 'scores': []})
+            return
+        try:
+            result = self.service.score(name, paragraphs)
+        except Exception as e:
+            self.service.metrics.record_request(len(paragraphs), time.perf_counter() - start, error=True)
+            self._send(500, {'error': str(e)})
+            return
+        self.service.metrics.record_request(len(paragraphs), time.perf_counter() - start)
+        self._send(200, result)
+
+    def log_message(self, format, *args):
+        pass  # pas de ligne par requête ; voir /metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Service HTTP d'affectation de topics")
+    parser.add_argument("--models", nargs="+", default=DEFAULT_MODELS, help="Modèles à charger")
+    parser.add_argument("--root", default=ARTIFACT_DIR, help="Répertoire des modèles")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch", type=int, default=512, help="Paragraphes max par micro-lot")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0,
+                        help="Attente max avant de lancer un lot incomplet")
+    args = parser.parse_args()
+
+    Handler.service = TopicService(args.models, args.root, args.max_batch, args.max_wait_ms / 1000)
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    for name, info in Handler.service.models().items():
+        print(f"✓ {name} v{info['version']} ({info['kind']}, {info['n_topics']} topics)")
+    print(f"🚀 Service en écoute sur http://{args.host}:{args.port} (/score/<modèle>, /metrics)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
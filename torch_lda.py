@@ -0,0 +1,70 @@
+"""PyTorch EM topic model (GPU when available), shared by analyse2_pytorch.py and the benchmarks"""
+
+import torch
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+class PyTorchLDA:
+    def __init__(self, n_topics=5, n_iter=100, random_state=42):
+        self.n_topics = n_topics
+        self.n_iter = n_iter
+        self.random_state = random_state
+        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        
+    def fit(self, X):
+        """Fit LDA model using PyTorch on GPU"""
+        # Convert sparse matrix to dense numpy array
+        if hasattr(X, 'toarray'):
+            X_dense = X.toarray()
+        else:
+            X_dense = X
+            
+        n_docs, n_words = X_dense.shape
+        
+        # Initialize topic-word and doc-topic distributions on GPU
+        torch.manual_seed(self.random_state)
+        self.components_ = torch.rand(self.n_topics, n_words, device=self.device)
+        self.components_ = self.components_ / self.components_.sum(dim=1, keepdim=True)
+        
+        doc_topic = torch.rand(n_docs, self.n_topics, device=self.device)
+        doc_topic = doc_topic / doc_topic.sum(dim=1, keepdim=True)
+        
+        # Convert data to PyTorch tensor on GPU
+        X_tensor = torch.tensor(X_dense, dtype=torch.float32, device=self.device)
+        
+        # EM algorithm
+        for iteration in range(self.n_iter):
+            # E-step: Update doc-topic distributions
+            topic_word_t = self.components_.t()
+            doc_topic = X_tensor @ topic_word_t
+            doc_topic = doc_topic / (doc_topic.sum(dim=1, keepdim=True) + 1e-10)
+            
+            # M-step: Update topic-word distributions
+            self.components_ = doc_topic.t() @ X_tensor
+            self.components_ = self.components_ / (self.components_.sum(dim=1, keepdim=True) + 1e-10)
+            
+            if iteration % 20 == 0:
+                print(f"  Iteration {iteration}/{self.n_iter}")
+        
+        # Convert back to numpy for compatibility
+        self.components_ = self.components_.cpu().numpy()
+        self.doc_topic_ = doc_topic.cpu().numpy()
+        
+        return self
+    
+    def transform(self, X):
+        """Transform documents to topic distributions"""
+        return self.doc_topic_
+
+    def perplexity(self, X, chunk_size=1000000):
+        """Perplexity of the training matrix X (only nonzero counts contribute)"""
+        X = csr_matrix(X)
+        rows = np.repeat(np.arange(X.shape[0]), np.diff(X.indptr))
+        log_likelihood = 0.0
+        for start in range(0, X.nnz, chunk_size):
+            stop = start + chunk_size
+            word_probs = np.einsum('ij,ij->i', self.doc_topic_[rows[start:stop]],
+                                   self.components_[:, X.indices[start:stop]].T)
+            log_likelihood += (X.data[start:stop] * np.log(word_probs + 1e-10)).sum()
+        return float(np.exp(-log_likelihood / X.data.sum()))
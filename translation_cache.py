@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Glossaire coréen -> français persistant pour l'annotation des mots-clés
+Le glossaire JSON est consulté en premier ; seuls les mots absents sont
+envoyés au traducteur, en un appel groupé. En mode hors ligne
+(--offline ou TRANSLATION_OFFLINE=1) les TSV sont annotés uniquement
+depuis le glossaire
+
+Usage :
+    python translation_cache.py --seed *_translated.tsv
+    python translation_cache.py --annotate lda_analysis_results.tsv lda_analysis_results_translated.tsv
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import re
+
+GLOSSARY_PATH = "glossary_ko_fr.json"
+UNKNOWN = "?"
+
+_ENTRY = re.compile(r"^(.+?) \((.*)\)$")
+
+
+class Glossary:
+    """Dictionnaire ko -> fr sauvegardé en JSON (trié, pour des diffs lisibles)"""
+
+    def __init__(self, path=GLOSSARY_PATH):
+        self.path = path
+        self.entries = {}
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        self._dirty = False
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, word):
+        return word in self.entries
+
+    def get(self, word):
+        return self.entries.get(word)
+
+    def update(self, translations):
+        for word, translation in translations.items():
+            if translation and self.entries.get(word) != translation:
+                self.entries[word] = translation
+                self._dirty = True
+
+    def missing(self, words):
+        """Mots distincts absents du glossaire, dans l'ordre de première apparition"""
+        return [w for w in dict.fromkeys(words) if w not in self.entries]
+
+    def save(self):
+        if not self._dirty or not self.path:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(dict(sorted(self.entries.items())), f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+
+class GoogleTranslator:
+    """googletrans, un appel par lot de mots (importé seulement s'il y a des mots à traduire)"""
+
+    def __init__(self, src="ko", dest="fr"):
+        self.src = src
+        self.dest = dest
+        self._translator = None
+
+    def translate_batch(self, words):
+        if self._translator is None:
+            from googletrans import Translator
+            self._translator = Translator()
+        result = self._translator.translate(list(words), src=self.src, dest=self.dest)
+        if inspect.isawaitable(result):  # googletrans >= 4.0.2 est asynchrone
+            result = asyncio.run(result)
+        return {word: t.text for word, t in zip(words, result)}
+
+
+class LocalTranslator:
+    """Traducteur hors ligne à partir d'une table fixe (tests, mode sans réseau)"""
+
+    def __init__(self, table=None):
+        self.table = dict(table or {})
+        self.calls = []
+
+    def translate_batch(self, words):
+        self.calls.append(list(words))
+        return {word: self.table[word] for word in words if word in self.table}
+
+
+def make_translator(offline=None):
+    """Traducteur en ligne, ou None en mode hors ligne (TRANSLATION_OFFLINE=1 par défaut)"""
+    if offline is None:
+        offline = os.environ.get("TRANSLATION_OFFLINE", "") not in ("", "0")
+    return None if offline else GoogleTranslator()
+
+
+def translate_words(words, glossary, translator=None, batch_size=200):
+    """Complète le glossaire pour `words` : seuls les mots absents sont traduits, par lots"""
+    misses = glossary.missing(words)
+    if not misses or translator is None:
+        return len(misses)
+    for start in range(0, len(misses), batch_size):
+        batch = misses[start:start + batch_size]
+        try:
+            glossary.update(translator.translate_batch(batch))
+        except Exception as e:
+            print(f"Error translating {len(batch)} words: {e}")
+    glossary.save()
+    return len(glossary.missing(words))
+
+
+def annotate(text, glossary, known=None):
+    """'mot1 | mot2' -> 'mot1 (trad1) | mot2 (trad2)' ('?' si inconnu)
+
+    Les traductions de `known` (celles du fichier déjà annoté) passent
+    avant le glossaire.
+    """
+    known = known or {}
+    return ' | '.join(f"{word} ({known.get(word) or glossary.get(word) or UNKNOWN})"
+                      for word in text.split(' | '))
+
+
+def read_translations(path):
+    """{mot: traduction} d'un TSV déjà traduit ('mot (traduction)'), sans les '?'"""
+    translations = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        in_topics = False
+        for line in f:
+            if line.strip().startswith('Topic_ID'):
+                in_topics = True
+                continue
+            parts = line.rstrip('\n').split('\t')
+            if not in_topics or len(parts) != 3:
+                continue
+            for item in parts[2].split(' | '):
+                match = _ENTRY.match(item)
+                if match and match.group(2) not in ("", UNKNOWN):
+                    translations.setdefault(match.group(1), match.group(2))
+    return translations
+
+
+def annotate_tsv(input_file, output_file, glossary=None, translator=None):
+    """Ajoute les traductions aux mots de la section Topic_ID d'un TSV de résultats
+
+    Si `output_file` existe déjà, ses traductions sont gardées en priorité :
+    une ré-annotation hors ligne redonne le même fichier, même quand le
+    glossaire partagé traduit un mot autrement. Les autres mots sont traduits
+    en un seul passage groupé avant l'écriture. Renvoie le nombre de mots
+    restés sans traduction.
+    """
+    glossary = glossary if glossary is not None else Glossary()
+    known = read_translations(output_file) if os.path.exists(output_file) else {}
+    with open(input_file, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+
+    rows = {}
+    in_topics = False
+    for i, line in enumerate(lines):
+        if line.strip().startswith('Topic_ID'):
+            in_topics = True
+        elif in_topics and '\t' in line:
+            parts = line.strip().split('\t')
+            if len(parts) == 3:
+                rows[i] = parts
+
+    words = [word for _, _, top_words in rows.values() for word in top_words.split(' | ')
+             if word not in known]
+    unresolved = translate_words(words, glossary, translator)
+
+    output_lines = list(lines)
+    for i, (topic_id, nb_para, top_words) in rows.items():
+        output_lines[i] = f"{topic_id}\t{nb_para}\t{annotate(top_words, glossary, known)}\n"
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.writelines(output_lines)
+    return unresolved
+
+
+def seed_from_tsv(paths, glossary):
+    """Remplit le glossaire depuis des TSV déjà traduits ('mot (traduction)')
+
+    Les mots déjà dans le glossaire sont gardés ; sinon la traduction du
+    premier fichier de `paths` qui contient le mot l'emporte.
+    """
+    seeded = {}
+    for path in paths:
+        for word, translation in read_translations(path).items():
+            seeded.setdefault(word, translation)
+    glossary.update({w: t for w, t in seeded.items() if w not in glossary})
+    glossary.save()
+    return len(seeded)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Glossaire ko -> fr des mots-clés de topics")
+    parser.add_argument("--glossary", default=GLOSSARY_PATH)
+    parser.add_argument("--seed", nargs="+", metavar="TSV", help="TSV traduits servant à remplir le glossaire")
+    parser.add_argument("--annotate", nargs=2, metavar=("ENTREE", "SORTIE"), help="TSV à annoter")
+    parser.add_argument("--offline", action="store_true", help="Glossaire seulement, sans réseau")
+    args = parser.parse_args()
+
+    glossary = Glossary(args.glossary)
+    if args.seed:
+        n = seed_from_tsv(args.seed, glossary)
+        print(f"✓ {n} entrées lues, glossaire : {len(glossary)} mots ({args.glossary})")
+    if args.annotate:
+        translator = make_translator(args.offline or None)
+        unresolved = annotate_tsv(*args.annotate, glossary=glossary, translator=translator)
+        print(f"✓ Traductions sauvegardées dans {args.annotate[1]} ({unresolved} mots sans traduction)")
+
+
+if __name__ == "__main__":
+    main()
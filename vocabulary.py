@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Vocabulaire global et flux de tokens encodés en entiers
+Les noms extraits sont stockés en ids int32 (un tableau + offsets par
+corpus) au lieu de listes de chaînes ; les fréquences se calculent avec
+np.bincount et les vectoriseurs consomment directement les ids
+"""
+
+import json
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+class Vocabulary:
+    """Correspondance mot <-> id (int32), les ids étant attribués par ordre d'apparition"""
+
+    def __init__(self, tokens=()):
+        self.tokens = []
+        self.token_to_id = {}
+        for token in tokens:
+            self._add(token)
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def __getitem__(self, token_id):
+        return self.tokens[token_id]
+
+    def _add(self, token):
+        token_id = self.token_to_id.get(token)
+        if token_id is None:
+            token_id = len(self.tokens)
+            self.token_to_id[token] = token_id
+            self.tokens.append(token)
+        return token_id
+
+    def encode(self, words):
+        """Ids int32 des mots (les mots nouveaux sont ajoutés au vocabulaire)"""
+        return np.fromiter((self._add(w) for w in words), dtype=np.int32, count=len(words))
+
+    def decode(self, ids):
+        return [self.tokens[i] for i in ids]
+
+    def translate(self, ids, tokens):
+        """Ids dans ce vocabulaire d'un flux `ids` exprimé dans un autre vocabulaire `tokens`
+
+        Les mots nouveaux sont ajoutés dans l'ordre de leur première apparition
+        dans le flux : mêmes ids que `encode` sur les mots décodés.
+        """
+        order = first_seen_order(ids)
+        mapping = np.zeros(len(tokens), dtype=np.int32)
+        mapping[order] = self.encode([tokens[i] for i in order])
+        return mapping[ids]
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.tokens, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+
+class TokenStream:
+    """Tokens d'un corpus : un tableau int32 d'ids et un tableau d'offsets par document
+
+    Les ids du document i sont ids[offsets[i]:offsets[i + 1]].
+    """
+
+    def __init__(self, ids=None, offsets=None):
+        self._chunks = []
+        self._ids = np.zeros(0, dtype=np.int32) if ids is None else ids
+        self._lengths = [] if offsets is None else np.diff(offsets).tolist()
+
+    def append(self, ids):
+        """Ajoute un document (tableau d'ids)"""
+        self._chunks.append(ids)
+        self._lengths.append(len(ids))
+
+    def __len__(self):
+        return len(self._lengths)
+
+    @property
+    def ids(self):
+        if self._chunks:
+            self._ids = np.concatenate([self._ids] + self._chunks).astype(np.int32, copy=False)
+            self._chunks = []
+        return self._ids
+
+    @property
+    def offsets(self):
+        offsets = np.zeros(len(self._lengths) + 1, dtype=np.int64)
+        np.cumsum(self._lengths, out=offsets[1:])
+        return offsets
+
+    def document(self, i):
+        offsets = self.offsets
+        return self.ids[offsets[i]:offsets[i + 1]]
+
+    def counts(self, minlength=0):
+        """Fréquence de chaque id (np.bincount)"""
+        return np.bincount(self.ids, minlength=minlength)
+
+    def filtered(self, mask):
+        """Nouveau flux ne gardant que les ids où mask[id] est vrai (documents conservés)"""
+        ids = self.ids
+        keep = mask[ids]
+        doc_index = np.repeat(np.arange(len(self)), self._lengths)
+        lengths = np.bincount(doc_index[keep], minlength=len(self))
+        offsets = np.zeros(len(self) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return TokenStream(ids[keep], offsets)
+
+    def to_csr(self, n_features):
+        """Matrice document-terme (comptes) construite directement depuis les ids"""
+        ids = self.ids
+        matrix = csr_matrix((np.ones(len(ids), dtype=np.int64), ids, self.offsets),
+                            shape=(len(self), n_features))
+        matrix.sum_duplicates()
+        return matrix
+
+    def save(self, path):
+        np.savez_compressed(path, ids=self.ids, offsets=self.offsets)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        return cls(data["ids"], data["offsets"])
+
+
+def first_seen_order(ids):
+    """Ids distincts de `ids` dans l'ordre de leur première apparition"""
+    present, positions = np.unique(ids, return_index=True)
+    return present[np.argsort(positions)]
+
+
+def first_occurrence(ids, size):
+    """Position de la première occurrence de chaque id dans `ids` (len(ids) si absent)"""
+    first = np.full(size, len(ids), dtype=np.int64)
+    present, positions = np.unique(ids, return_index=True)
+    first[present] = positions
+    return first
+
+
+def most_common(counts, vocab, n, ids=None):
+    """Équivalent de Counter.most_common(n) sur un tableau de comptes indexé par id
+
+    Avec `ids` (le flux compté), les ex-aequo sont départagés par première
+    apparition dans ce flux, comme un Counter construit sur ce seul run ;
+    sinon par id (avec un vocabulaire partagé, l'ordre d'apparition global).
+    """
+    if ids is None:
+        order = np.argsort(-counts, kind="stable")[:n]
+    else:
+        order = np.lexsort((first_occurrence(ids, len(counts)), -counts))[:n]
+    return [(vocab[i], int(counts[i])) for i in order if counts[i] > 0]